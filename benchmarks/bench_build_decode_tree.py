@@ -0,0 +1,51 @@
+"""Measure how the decode tree builders scale with the number of patterns.
+
+The patterns form a synthetic instruction set: every pattern has a 16 bit opcode in
+its most significant bits, followed by a random number of further fixed bits. Most
+opcodes are unique, so the root of the tree gets a child for nearly every pattern. The
+script prints the build time of each builder for growing pattern counts.
+
+Usage:
+    python benchmarks/bench_build_decode_tree.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import random
+import time
+
+from decoder_forge.bit_pattern import BitPattern
+from decoder_forge.pattern_algorithms import DECODE_TREE_BUILDERS
+
+WIDTH = 32
+
+
+def synthetic_patterns(count: int, seed: int = 0) -> list[tuple[BitPattern, str]]:
+    rnd = random.Random(seed)
+    pats = []
+    for idx in range(count):
+        fixedmask = 0xFFFF << (WIDTH - 16)
+        for _ in range(rnd.randint(0, 8)):
+            fixedmask |= 1 << rnd.randrange(WIDTH - 16)
+        fixedbits = rnd.getrandbits(WIDTH) & fixedmask
+        pats.append((BitPattern(fixedmask, fixedbits, WIDTH), f"P{idx}"))
+    return pats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000,20000")
+    parser.add_argument("--builders", default="fixed_bits")
+    args = parser.parse_args()
+
+    for name in args.builders.split(","):
+        builder = DECODE_TREE_BUILDERS[name]
+        for count in (int(i) for i in args.sizes.split(",")):
+            pats = synthetic_patterns(count)
+            start = time.perf_counter()
+            builder(pats, WIDTH)
+            elapsed = time.perf_counter() - start
+            print(f"{name:20} {count:8} patterns {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure the wall time of short CLI invocations.
+
+Every command is run --runs times as separate process, the script prints the
+minimum and the median. generate-code is measured with an empty cache directory
+for every run (templates are parsed and compiled) and with a shared one (compiled
+templates are loaded from the bytecode cache).
+
+Usage:
+    python benchmarks/bench_startup.py [--format tests/data/formats/test-format.yaml]
+        [--decoder_width 8] [--runs 20]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def measure(args: list[str], runs: int, fresh_cache: bool) -> list[float]:
+    times = []
+    with tempfile.TemporaryDirectory() as shared_dir:
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as fresh_dir:
+                cache_dir = fresh_dir if fresh_cache else shared_dir
+                cmd = [
+                    sys.executable,
+                    "-m",
+                    "decoder_forge.main",
+                    *[i.replace("{cache_dir}", cache_dir) for i in args],
+                ]
+                start = time.perf_counter()
+                subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+                times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", default="tests/data/formats/test-format.yaml")
+    parser.add_argument("--decoder_width", default="8")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    width = ["--decoder_width", args.decoder_width]
+    generate = ["generate-code", args.format, *width, "--cache_dir", "{cache_dir}"]
+    commands = [
+        ("python -c pass", None, False),
+        ("--help", ["--help"], False),
+        ("show-tree", ["show-tree", args.format, *width], False),
+        ("generate-code, empty cache", generate, True),
+        ("generate-code, bytecode cache", generate, False),
+    ]
+
+    for name, cmd, fresh_cache in commands:
+        if cmd is None:
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, "-c", "pass"], check=True)
+                times.append(time.perf_counter() - start)
+        else:
+            times = measure(cmd, args.runs, fresh_cache)
+
+        print(
+            f"{name:32} min {min(times) * 1e3:7.1f} ms   "
+            + f"median {statistics.median(times) * 1e3:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Measure construction cost and memory of the generated structs for every style.
+
+For every struct style a decoder is generated from a format description and used to
+decode a binary image. The script prints for each style:
+
+- the time to construct one instance of the struct with the most members,
+- the time to decode the image,
+- the memory held by the decoded instructions, per instruction. It is measured for
+  the first instructions of the image.
+
+Usage:
+    python benchmarks/bench_struct_styles.py firmware.bin
+        [--format formats/armv7-m.yaml] [--decoder_width 32] [--memory_sample 10000]
+"""
+
+import argparse
+import gc
+import time
+import timeit
+import tracemalloc
+
+from decoder_forge.decoder_build import CodePrinter
+from decoder_forge.external.template_engine import TemplateEngine
+from decoder_forge.generate_code import generate_code
+from decoder_forge.generate_code import load_format
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.generator_options import STRUCT_STYLES
+from decoder_forge.uc_decode import iter_decode
+
+
+def build_namespace(input_yaml: str, decoder_width: int, style: str) -> dict:
+    printer = CodePrinter()
+    options = GeneratorOptions(struct_style=style)
+    generate_code(input_yaml, decoder_width, TemplateEngine(), printer, options)
+
+    ns: dict = {}
+    exec(compile(printer.to_string(), f"<{style}>", "exec"), ns)
+    return ns
+
+
+def decode_image(ns: dict, data: bytes, memory_sample: int) -> tuple[int, float, float]:
+    """Decode data, return the instruction count, the time and the bytes per result.
+
+    The memory is measured in a second run over the first memory_sample
+    instructions, tracing allocations slows decoding down.
+    """
+
+    start = time.perf_counter()
+    count = sum(1 for _ in iter_decode(ns, data))
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    out = [i for _, _, _, i in iter_decode(ns, data, count=memory_sample)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # the list itself is not part of the struct overhead
+    size -= out.__sizeof__()
+    return count, elapsed, size / max(len(out), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", default="formats/armv7-m.yaml")
+    parser.add_argument("--decoder_width", type=int, default=32)
+    parser.add_argument("image")
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--memory_sample", type=int, default=10000)
+    args = parser.parse_args()
+
+    with open(args.format, "r") as fp:
+        input_yaml = fp.read()
+
+    with open(args.image, "rb") as fp:
+        data = fp.read()
+
+    struct_def = load_format(input_yaml)["struct_def"]
+    name, members = max(
+        ((k, v.get("members", [])) for k, v in struct_def.items()),
+        key=lambda i: len(i[1]),
+    )
+
+    print(f"construction of {name} with {len(members)} members")
+    for style in STRUCT_STYLES:
+        ns = build_namespace(input_yaml, args.decoder_width, style)
+        struct = ns[name]
+        values = list(range(len(members)))
+        construct = min(
+            timeit.repeat(lambda: struct(*values), number=args.number, repeat=5)
+        )
+
+        count, elapsed, per_instr = decode_image(ns, data, args.memory_sample)
+        print(
+            f"{style:16} construct {construct / args.number * 1e9:7.1f} ns   "
+            + f"decode {elapsed:7.3f} s   {per_instr:6.1f} bytes/instruction   "
+            + f"({count} instructions)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1793 @@
+from dataclasses import dataclass
+
+
+@dataclass(eq=True)
+class Context:
+    istate : int = 0
+    apsr : int = 0
+    
+@dataclass(frozen=True, eq=True)
+class AdcImmediate:
+    flags : int
+    d : int
+    n : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class AdcRegister:
+    flags : int
+    d : int
+    n : int
+    m : int
+    shift_t : int
+    shift_n : int
+    
+@dataclass(frozen=True, eq=True)
+class AddImmediate:
+    flags : int
+    d : int
+    n : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class AddPcPlusImmediate:
+    flags : int
+    d : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class AddRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class AddSpPlusImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class AndImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class AndRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class AsrImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class AsrRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class BCond:
+    flags : int
+    cond : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class B:
+    flags : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class Bfi:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class BicImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class BicRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Bkpt:
+    flags : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class Bl:
+    flags : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class Blx:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Bx:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class CbNZ:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Clz:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class CmnImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class CmpImmediate:
+    flags : int
+    n : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class CmpRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Dmb:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class EorImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class EorRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class It:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Ldm:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrImmediate:
+    flags : int
+    t : int
+    n : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrLiteral:
+    flags : int
+    t : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrbImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrbRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrdImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Ldrex:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrhImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrhRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrsbImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LdrshImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LslImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LslRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class LsrImmediate:
+    flags : int
+    d : int
+    m : int
+    shift_n : int
+    
+@dataclass(frozen=True, eq=True)
+class LsrRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Mla:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Mls:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class MovImmediate:
+    flags : int
+    d : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class MovRegister:
+    flags : int
+    d : int
+    m : int
+    
+@dataclass(frozen=True, eq=True)
+class Mrs:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Msr:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Mul:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class MvnImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class MvnRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Nop:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class OrrImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class OrrRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Pop:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Push:
+    flags : int
+    registers : int
+    
+@dataclass(frozen=True, eq=True)
+class Rrx:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class RsbImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class RsbRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class SbcImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class SbcRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Sdiv:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Smull:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Stm:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Stmdb:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class StrImmediate:
+    flags : int
+    t : int
+    n : int
+    imm32 : int
+    
+@dataclass(frozen=True, eq=True)
+class StrRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class StrbImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class StrbRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class StrdImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Strex:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class StrhImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class StrhRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class SubImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class SubRegister:
+    flags : int
+    d : int
+    n : int
+    m : int
+    shift_t : int
+    shift_n : int
+    
+@dataclass(frozen=True, eq=True)
+class SubSpMinusImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Svc:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Sxtb:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Sxth:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class TbbH:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class TeqImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class TeqRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class TstImmediate:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class TstRegister:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Ubfx:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Udiv:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Umlal:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Umull:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Uxtb:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Uxth:
+    flags : int
+    
+@dataclass(frozen=True, eq=True)
+class Unpredictable:
+    instr : int
+    
+@dataclass(frozen=True, eq=True)
+class Undef:
+    code : int
+    
+def get_size_eval_bytes():
+    return 2;
+    
+
+def decode_size(instr: int):
+    if (instr & 0xf000) == 0xf000:  # 1111xxxxxxxxxxxx
+        return 32
+    elif (instr & 0xf000) == 0x4000:  # 0100xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0xe000:  # 1110xxxxxxxxxxxx
+        if (instr & 0x800) == 0x800:  # xxxx1xxxxxxxxxxx
+            return 32
+        elif (instr & 0x800) == 0x0:  # xxxx0xxxxxxxxxxx
+            return 16
+        return 0  # no match
+    elif (instr & 0xf000) == 0x1000:  # 0001xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x3000:  # 0011xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0xa000:  # 1010xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x2000:  # 0010xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x0:  # 0000xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x6000:  # 0110xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x9000:  # 1001xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x5000:  # 0101xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0xb000:  # 1011xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0xd000:  # 1101xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x7000:  # 0111xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0x8000:  # 1000xxxxxxxxxxxx
+        return 16
+    elif (instr & 0xf000) == 0xc000:  # 1100xxxxxxxxxxxx
+        return 16
+    return 0  # no match
+
+
+def get_decoder_eval_bytes():
+    return 4;
+
+
+def decode(instr: int, context: Context):
+    if (instr & 0xf0000000) == 0xf0000000:  # 1111xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0x8000) == 0x0:  # xxxxxxxxxxxxxxxx0xxxxxxxxxxxxxxx
+                if (instr & 0x3ef0000) == 0x6f0000:  # xxxxxx00011x1111xxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "mvn_immediate_t1" / "11110x00011x11110xxxxxxxxxxxxxxx"
+                    return MvnImmediate(flags)
+                elif (instr & 0x7f00020) == 0x3600000:  # xxxxx0110110xxxxxxxxxxxxxx0xxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "bfi_t1" / "111100110110xxxx0xxxxxxxxx0xxxxx"
+                    return Bfi(flags)
+                elif (instr & 0x7f00020) == 0x3c00000:  # xxxxx0111100xxxxxxxxxxxxxx0xxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ubfx_t1" / "111100111100xxxx0xxxxxxxxx0xxxxx"
+                    return Ubfx(flags)
+                elif (instr & 0x3f00000) == 0x2400000:  # xxxxxx100100xxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    d = (instr >> 8) & 0xf
+                    _imm8 = (instr >> 0) & 0xff
+                    _imm3 = (instr >> 12) & 0x7
+                    _imm4 = (instr >> 16) & 0xf
+                    _i = (instr >> 26) & 0x1
+                    imm32 = (_imm4 << 12) | (_i << 11) | (_imm3 << 8) | (_imm8 << 0)
+                    if (d == 13) or (d == 15):
+                        return Unpredictable(instr)
+                    
+                    # Pattern: "mov_immediate_t3" / "11110x100100xxxx0xxxxxxxxxxxxxxx"
+                    return MovImmediate(flags, d, imm32)
+                elif (instr & 0x3e00000) == 0x1400000:  # xxxxxx01010xxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    if (instr >> 20) & 0x1 == 1:
+                        flags = flags | (1 << 0) # flags |= Set
+                    
+                    d = (instr >> 8) & 0xf
+                    n = (instr >> 16) & 0xf
+                    _i = (instr >> 26) & 0x1
+                    _imm3 = (instr >> 12) & 0x7
+                    _imm8 = (instr >> 0) & 0xff
+                    _imm12 = (_i << 11) | (_imm3 << 8) | (_imm8 << 0)
+                    _carry_in = (context.apsr >> 29) & 0x1
+                    if (_imm12 >> 10) & 0x3 == 0b00:
+                        _in8 = (_imm12 >> 0) & 0xff # $in[7:0]
+                        _cond = (_imm12 >> 8) & 0x3 # $imm12[9:8]
+                        if _cond == 0b00:
+                            imm32 = _in8
+                        elif _cond == 0b01:
+                            if _in8 == 0:
+                                return Unpredictable(instr)
+                            
+                            imm32 = (_in8 << 16) | (_in8 << 0)
+                        elif _cond == 0b10:
+                            if _in8 == 0:
+                                return Unpredictable(instr)
+                            
+                            imm32 = (_in8 << 24) | (_in8 << 8)
+                        elif _cond == 0b11:
+                            if _in8 == 0:
+                                return Unpredictable(instr)
+                            
+                            imm32 = (_in8 << 24) | (_in8 << 16) | (_in8 << 8) | (_in8 << 0)
+                        
+                        _carry_out = _carry_in
+                    else:
+                        _unrotated_value = 0x80 | (_imm12 & 0x7F)
+                        _shift = (_imm12 >> 7) & 0x1f # val[11:7]
+                        _n = _shift % 32
+                        _m = 32 - _n
+                        imm32 = (_unrotated_value >> _n) | (_unrotated_value << _m)
+                        _carry_out = (imm32 >> 31) & 0x1
+                    
+                    if (d == 13) or (d == 15) or (n == 13) or (n == 15):
+                        return Unpredictable(instr)
+                    
+                    # Pattern: "adc_immediate_t1" / "11110x01010xxxxx0xxxxxxxxxxxxxxx"
+                    return AdcImmediate(flags, d, n, imm32)
+                elif (instr & 0x3e00000) == 0x1000000:  # xxxxxx01000xxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x100f00) == 0x100f00:  # xxxxxxxxxxx1xxxxxxxx1111xxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "cmn_immediate_t1" / "11110x010001xxxx0xxx1111xxxxxxxx"
+                        return CmnImmediate(flags)
+                    elif (instr & 0xf0000) == 0xd0000:  # xxxxxxxxxxxx1101xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "add_sp_plus_immediate_t3" / "11110x01000x11010xxxxxxxxxxxxxxx"
+                        return AddSpPlusImmediate(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        if (instr >> 20) & 0x1 == 1:
+                            flags = flags | (1 << 0) # flags |= Set
+                        
+                        n = (instr >> 16) & 0xf
+                        d = (instr >> 8) & 0xf
+                        _i = (instr >> 26) & 0x1
+                        _imm3 = (instr >> 12) & 0x7
+                        _imm8 = (instr >> 0) & 0xff
+                        _imm12 = (_i << 11) | (_imm3 << 8) | (_imm8 << 0)
+                        _carry_in = (context.apsr >> 29) & 0x1
+                        if (_imm12 >> 10) & 0x3 == 0b00:
+                            _in8 = (_imm12 >> 0) & 0xff # $in[7:0]
+                            _cond = (_imm12 >> 8) & 0x3 # $imm12[9:8]
+                            if _cond == 0b00:
+                                imm32 = _in8
+                            elif _cond == 0b01:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 16) | (_in8 << 0)
+                            elif _cond == 0b10:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 24) | (_in8 << 8)
+                            elif _cond == 0b11:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 24) | (_in8 << 16) | (_in8 << 8) | (_in8 << 0)
+                            
+                            _carry_out = _carry_in
+                        else:
+                            _unrotated_value = 0x80 | (_imm12 & 0x7F)
+                            _shift = (_imm12 >> 7) & 0x1f # val[11:7]
+                            _n = _shift % 32
+                            _m = 32 - _n
+                            imm32 = (_unrotated_value >> _n) | (_unrotated_value << _m)
+                            _carry_out = (imm32 >> 31) & 0x1
+                        
+                        if (d == 13) or ((d == 15) and (flags & (1 << 0) == 0b0000)) or (n == 15):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "add_immediate_t3" / "11110x01000xxxxx0xxxxxxxxxxxxxxx"
+                        return AddImmediate(flags, d, n, imm32)
+                    return Undef(instr)  # no match
+                elif (instr & 0x3e00000) == 0x2000000:  # xxxxxx10000xxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x1f0000) == 0xd0000:  # xxxxxxxxxxx01101xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "add_sp_plus_immediate_t4" / "11110x10000011010xxxxxxxxxxxxxxx"
+                        return AddSpPlusImmediate(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        n = (instr >> 16) & 0xf
+                        d = (instr >> 8) & 0xf
+                        _imm8 = (instr >> 0) & 0xff
+                        _imm3 = (instr >> 12) & 0x7
+                        _i = (instr >> 26) & 0x1
+                        imm32 = (_i << 11) | (_imm3 << 8) | (_imm8 << 0)
+                        if (d == 13) or (d == 15):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "add_immediate_t4" / "11110x10000xxxxx0xxxxxxxxxxxxxxx"
+                        return AddImmediate(flags, d, n, imm32)
+                    return Undef(instr)  # no match
+                elif (instr & 0x3e00000) == 0x1a00000:  # xxxxxx01101xxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x100f00) == 0x100f00:  # xxxxxxxxxxx1xxxxxxxx1111xxxxxxxx
+                        flags = 0x0 # initial value
+                        n = (instr >> 16) & 0xf
+                        _i = (instr >> 26) & 0x1
+                        _imm3 = (instr >> 12) & 0x7
+                        _imm8 = (instr >> 0) & 0xff
+                        _imm12 = (_i << 11) | (_imm3 << 8) | (_imm8 << 0)
+                        _carry_in = (context.apsr >> 29) & 0x1
+                        if (_imm12 >> 10) & 0x3 == 0b00:
+                            _in8 = (_imm12 >> 0) & 0xff # $in[7:0]
+                            _cond = (_imm12 >> 8) & 0x3 # $imm12[9:8]
+                            if _cond == 0b00:
+                                imm32 = _in8
+                            elif _cond == 0b01:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 16) | (_in8 << 0)
+                            elif _cond == 0b10:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 24) | (_in8 << 8)
+                            elif _cond == 0b11:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 24) | (_in8 << 16) | (_in8 << 8) | (_in8 << 0)
+                            
+                            _carry_out = _carry_in
+                        else:
+                            _unrotated_value = 0x80 | (_imm12 & 0x7F)
+                            _shift = (_imm12 >> 7) & 0x1f # val[11:7]
+                            _n = _shift % 32
+                            _m = 32 - _n
+                            imm32 = (_unrotated_value >> _n) | (_unrotated_value << _m)
+                            _carry_out = (imm32 >> 31) & 0x1
+                        
+                        if (n == 15):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "cmp_immediate_t2" / "11110x011011xxxx0xxx1111xxxxxxxx"
+                        return CmpImmediate(flags, n, imm32)
+                    elif (instr & 0xf0000) == 0xd0000:  # xxxxxxxxxxxx1101xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "sub_sp_minus_immediate_t2" / "11110x01101x11010xxxxxxxxxxxxxxx"
+                        return SubSpMinusImmediate(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "sub_immediate_t3" / "11110x01101xxxxx0xxxxxxxxxxxxxxx"
+                        return SubImmediate(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x3e00000) == 0x2a00000:  # xxxxxx10101xxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x100000) == 0x0:  # xxxxxxxxxxx0xxxxxxxxxxxxxxxxxxxx
+                        if (instr & 0xf0000) == 0xd0000:  # xxxxxxxxxxxx1101xxxxxxxxxxxxxxxx
+                            flags = 0x0 # initial value
+                            # Pattern: "sub_sp_minus_immediate_t3" / "11110x10101011010xxxxxxxxxxxxxxx"
+                            return SubSpMinusImmediate(flags)
+                        elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                            flags = 0x0 # initial value
+                            # Pattern: "sub_immediate_t4" / "11110x101010xxxx0xxxxxxxxxxxxxxx"
+                            return SubImmediate(flags)
+                        return Undef(instr)  # no match
+                    return Undef(instr)  # no match
+                elif (instr & 0x3e00000) == 0x400000:  # xxxxxx00010xxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0xf0000) == 0xf0000:  # xxxxxxxxxxxx1111xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        d = (instr >> 8) & 0xf
+                        _i = (instr >> 26) & 0x1
+                        _imm3 = (instr >> 12) & 0x7
+                        _imm8 = (instr >> 0) & 0xff
+                        _imm12 = (_i << 11) | (_imm3 << 8) | (_imm8 << 0)
+                        _carry_in = (context.apsr >> 29) & 0x1
+                        if (_imm12 >> 10) & 0x3 == 0b00:
+                            _in8 = (_imm12 >> 0) & 0xff # $in[7:0]
+                            _cond = (_imm12 >> 8) & 0x3 # $imm12[9:8]
+                            if _cond == 0b00:
+                                imm32 = _in8
+                            elif _cond == 0b01:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 16) | (_in8 << 0)
+                            elif _cond == 0b10:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 24) | (_in8 << 8)
+                            elif _cond == 0b11:
+                                if _in8 == 0:
+                                    return Unpredictable(instr)
+                                
+                                imm32 = (_in8 << 24) | (_in8 << 16) | (_in8 << 8) | (_in8 << 0)
+                            
+                            carry = _carry_in
+                        else:
+                            _unrotated_value = 0x80 | (_imm12 & 0x7F)
+                            _shift = (_imm12 >> 7) & 0x1f # val[11:7]
+                            _n = _shift % 32
+                            _m = 32 - _n
+                            imm32 = (_unrotated_value >> _n) | (_unrotated_value << _m)
+                            carry = (imm32 >> 31) & 0x1
+                        
+                        if carry:
+                            flags = flags | (1 << 2) # flags |= Carry
+                        
+                        if (d == 13) or (d == 15):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "mov_immediate_t2" / "11110x00010x11110xxxxxxxxxxxxxxx"
+                        return MovImmediate(flags, d, imm32)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "orr_immediate_t1" / "11110x00010xxxxx0xxxxxxxxxxxxxxx"
+                        return OrrImmediate(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x3e00000) == 0x1c00000:  # xxxxxx01110xxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "rsb_immediate_t2" / "11110x01110xxxxx0xxxxxxxxxxxxxxx"
+                    return RsbImmediate(flags)
+                elif (instr & 0x3e00000) == 0x0:  # xxxxxx00000xxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x100f00) == 0x100f00:  # xxxxxxxxxxx1xxxxxxxx1111xxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "tst_immediate_t1" / "11110x000001xxxx0xxx1111xxxxxxxx"
+                        return TstImmediate(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "and_immediate_t1" / "11110x00000xxxxx0xxxxxxxxxxxxxxx"
+                        return AndImmediate(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x3e00000) == 0x200000:  # xxxxxx00001xxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "bic_immediate_t1" / "11110x00001xxxxx0xxxxxxxxxxxxxxx"
+                    return BicImmediate(flags)
+                elif (instr & 0x3e00000) == 0x800000:  # xxxxxx00100xxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x100f00) == 0x100f00:  # xxxxxxxxxxx1xxxxxxxx1111xxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "teq_immediate_t1" / "11110x001001xxxx0xxx1111xxxxxxxx"
+                        return TeqImmediate(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "eor_immediate_t1" / "11110x00100xxxxx0xxxxxxxxxxxxxxx"
+                        return EorImmediate(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x3e00000) == 0x1600000:  # xxxxxx01011xxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "sbc_immediate_t1" / "11110x01011xxxxx0xxxxxxxxxxxxxxx"
+                    return SbcImmediate(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x8000) == 0x8000:  # xxxxxxxxxxxxxxxx1xxxxxxxxxxxxxxx
+                if (instr & 0x5000) == 0x0:  # xxxxxxxxxxxxxxxxx0x0xxxxxxxxxxxx
+                    if (instr & 0x7ff2fff) == 0x3af0000:  # xxxxx01110101111xx0x000000000000
+                        flags = 0x0 # initial value
+                        # Pattern: "nop_t2" / "11110011101011111000000000000000"
+                        return Nop(flags)
+                    elif (instr & 0x7ff2ff0) == 0x3bf0f50:  # xxxxx01110111111xx0x11110101xxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "dmb_t1" / "1111001110111111100011110101xxxx"
+                        return Dmb(flags)
+                    elif (instr & 0x7ff2000) == 0x3ef0000:  # xxxxx01111101111xx0xxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "mrs_t1" / "11110011111011111000xxxxxxxxxxxx"
+                        return Mrs(flags)
+                    elif (instr & 0x7f02300) == 0x3800000:  # xxxxx0111000xxxxxx0xxx00xxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "msr_t1" / "111100111000xxxx1000xx00xxxxxxxx"
+                        return Msr(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        _s = (instr >> 26) & 0x1
+                        _imm6 = (instr >> 16) & 0x3f
+                        _j1 = (instr >> 13) & 0x1
+                        _j2 = (instr >> 11) & 0x1
+                        _imm11 = (instr >> 0) & 0x7ff
+                        _imm20_us = (_s << 20) | (_j2 << 19) | (_j1 << 18) | (_imm6 << 12) | (_imm11 << 1)
+                        imm32 = (_imm20_us ^ (1 << 20)) - (1 << 20)
+                        cond = (instr >> 22) & 0xf
+                        if ((context.istate & 0b1111 != 0b0000)):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "b_t3" / "11110xxxxxxxxxxx10x0xxxxxxxxxxxx"
+                        return BCond(flags, cond, imm32)
+                    return Undef(instr)  # no match
+                elif (instr & 0x5000) == 0x1000:  # xxxxxxxxxxxxxxxxx0x1xxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    _s = (instr >> 26) & 0x1
+                    _imm10 = (instr >> 16) & 0x3ff
+                    _j1 = (instr >> 13) & 0x1
+                    _j2 = (instr >> 11) & 0x1
+                    _imm11 = (instr >> 0) & 0x7ff
+                    _i1 = 0x1 & (~(_j1 ^ _s))
+                    _i2 = 0x1 & (~(_j2 ^ _s))
+                    _imm24_us = (_s << 24) | (_i1 << 23) | (_i2 << 22) | (_imm10 << 12) | (_imm11 << 1)
+                    imm32 = (_imm24_us ^ (1 << 24)) - (1 << 24)
+                    if ((context.istate & 0b1111 != 0b0000) and not (context.istate & 0b1111 == 0b1000)):
+                        return Unpredictable(instr)
+                    
+                    # Pattern: "b_t4" / "11110xxxxxxxxxxx10x1xxxxxxxxxxxx"
+                    return B(flags, imm32)
+                elif (instr & 0x5000) == 0x5000:  # xxxxxxxxxxxxxxxxx1x1xxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    _s = (instr >> 26) & 0x1
+                    _imm10 = (instr >> 16) & 0x3ff
+                    _j1 = (instr >> 13) & 0x1
+                    _j2 = (instr >> 11) & 0x1
+                    _imm11 = (instr >> 0) & 0x7ff
+                    _i1 = 0x1 & (~(_j1 ^ _s))
+                    _i2 = 0x1 & (~(_j2 ^ _s))
+                    _imm24_us = (_s << 24) | (_i1 << 23) | (_i2 << 22) | (_imm10 << 12) | (_imm11 << 1)
+                    imm32 = (_imm24_us ^ (1 << 24)) - (1 << 24)
+                    if ((context.istate & 0b1111 != 0b0000) and not (context.istate & 0b1111 == 0b1000)):
+                        return Unpredictable(instr)
+                    
+                    # Pattern: "bl_t1" / "11110xxxxxxxxxxx11x1xxxxxxxxxxxx"
+                    return Bl(flags, imm32)
+                return Undef(instr)  # no match
+            return Undef(instr)  # no match
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0x7f000f0) == 0x3e00000:  # xxxxx0111110xxxxxxxxxxxx0000xxxx
+                flags = 0x0 # initial value
+                # Pattern: "umlal_t1" / "111110111110xxxxxxxxxxxx0000xxxx"
+                return Umlal(flags)
+            elif (instr & 0x7600000) == 0x400000:  # xxxxx000x10xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x100000) == 0x100000:  # xxxxxxxxxxx1xxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x8f0fff) == 0xd0b04:  # xxxxxxxx0xxx1101xxxx101100000100
+                        flags = 0x0 # initial value
+                        # Pattern: "pop_t3" / "1111100001011101xxxx101100000100"
+                        return Pop(flags)
+                    elif (instr & 0x800fc0) == 0x0:  # xxxxxxxx0xxxxxxxxxxx000000xxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "ldr_register_t2" / "111110000101xxxxxxxx000000xxxxxx"
+                        return LdrRegister(flags)
+                    elif (instr & 0xf0000) == 0xf0000:  # xxxxxxxxxxxx1111xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        if (instr >> 23) & 0x1:
+                            flags = flags | (1 << 1) # flags |= Add
+                        
+                        t = (instr >> 12) & 0xf
+                        imm32 = (instr >> 0) & 0xfff
+                        if ((t == 15) and ((context.istate & 0b1111 != 0b0000) and not (context.istate & 0b1111 == 0b1000))):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "ldr_literal_t2" / "11111000x1011111xxxxxxxxxxxxxxxx"
+                        return LdrLiteral(flags, t, imm32)
+                    elif (instr & 0x800800) == 0x800:  # xxxxxxxx0xxxxxxxxxxx1xxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        t = (instr >> 12) & 0xf
+                        n = (instr >> 16) & 0xf
+                        imm32 = (instr >> 0) & 0xff
+                        if (instr >> 10) & 0x1 == 1:
+                            flags = flags | (1 << 3) # flags |= Index
+                        
+                        if (instr >> 9) & 0x1 == 1:
+                            flags = flags | (1 << 1) # flags |= Add
+                        
+                        if (instr >> 8) & 0x1 == 1:
+                            flags = flags | (1 << 4) # flags |= Wback
+                        
+                        if (flags & (1 << 4) != 0b0000 and n == t) or ((t == 15) and ((context.istate & 0b1111 != 0b0000) and not (context.istate & 0b1111 == 0b1000))):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "ldr_immediate_t4" / "111110000101xxxxxxxx1xxxxxxxxxxx"
+                        return LdrImmediate(flags, t, n, imm32)
+                    elif (instr & 0x800000) == 0x800000:  # xxxxxxxx1xxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        t = (instr >> 12) & 0xf
+                        n = (instr >> 16) & 0xf
+                        imm32 = (instr >> 0) & 0xfff
+                        flags = flags | (1 << 3) # flags |= Index
+                        flags = flags | (1 << 1) # flags |= Add
+                        if ((t == 15) and ((context.istate & 0b1111 != 0b0000) and not (context.istate & 0b1111 == 0b1000))):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "ldr_immediate_t3" / "111110001101xxxxxxxxxxxxxxxxxxxx"
+                        return LdrImmediate(flags, t, n, imm32)
+                    return Undef(instr)  # no match
+                elif (instr & 0x100000) == 0x0:  # xxxxxxxxxxx0xxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x800000) == 0x800000:  # xxxxxxxx1xxxxxxxxxxxxxxxxxxxxxxx
+                        if (instr & 0xf0000) == 0xf0000:  # xxxxxxxxxxxx1111xxxxxxxxxxxxxxxx
+                            # Pattern: "str_immediate_t3_undef" / "1111100011001111xxxxxxxxxxxxxxxx"
+                            return Undef(instr)
+                        elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                            flags = 0x0 # initial value
+                            t = (instr >> 12) & 0xf
+                            n = (instr >> 16) & 0xf
+                            imm32 = (instr >> 0) & 0xfff
+                            flags = flags | (1 << 3) # flags |= Index
+                            flags = flags | (1 << 1) # flags |= Add
+                            if (t == 15):
+                                return Unpredictable(instr)
+                            
+                            # Pattern: "str_immediate_t3" / "111110001100xxxxxxxxxxxxxxxxxxxx"
+                            return StrImmediate(flags, t, n, imm32)
+                        return Undef(instr)  # no match
+                    elif (instr & 0x800000) == 0x0:  # xxxxxxxx0xxxxxxxxxxxxxxxxxxxxxxx
+                        if (instr & 0xfc0) == 0x0:  # xxxxxxxxxxxxxxxxxxxx000000xxxxxx
+                            flags = 0x0 # initial value
+                            # Pattern: "str_register_t2" / "111110000100xxxxxxxx000000xxxxxx"
+                            return StrRegister(flags)
+                        elif (instr & 0x800) == 0x800:  # xxxxxxxxxxxxxxxxxxxx1xxxxxxxxxxx
+                            if (instr & 0xf07ff) == 0xd0504:  # xxxxxxxxxxxx1101xxxxx10100000100
+                                flags = 0x0 # initial value
+                                # Pattern: "push_t3" / "1111100001001101xxxx110100000100"
+                                return Push(flags, registers)
+                            elif (instr & 0xf0500) == 0xf0000:  # xxxxxxxxxxxx1111xxxxx0x0xxxxxxxx
+                                # Pattern: "str_immediate_t4_undef" / "1111100001001111xxxx10x0xxxxxxxx"
+                                return StrImmediate(flags, t, n, imm32)
+                            elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                                flags = 0x0 # initial value
+                                t = (instr >> 12) & 0xf
+                                n = (instr >> 16) & 0xf
+                                imm32 = (instr >> 0) & 0xff
+                                if (instr >> 10) & 0x1 == 1:
+                                    flags = flags | (1 << 3) # flags |= Index
+                                
+                                if (instr >> 9) & 0x1 == 1:
+                                    flags = flags | (1 << 1) # flags |= Add
+                                
+                                if (instr >> 8) & 0x1 == 1:
+                                    flags = flags | (1 << 4) # flags |= Wback
+                                
+                                if (flags & (1 << 4) != 0b0000 and n == t) or (t == 15):
+                                    return Unpredictable(instr)
+                                
+                                # Pattern: "str_immediate_t4" / "111110000100xxxxxxxx1xxxxxxxxxxx"
+                                return StrImmediate(flags, t, n, imm32)
+                            return Undef(instr)  # no match
+                        return Undef(instr)  # no match
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x2000000:  # xxxxx010x00xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x80f0f0) == 0xf000:  # xxxxxxxx0xxxxxxx1111xxxx0000xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "lsl_register_t2" / "11111010000xxxxx1111xxxx0000xxxx"
+                    return LslRegister(flags)
+                elif (instr & 0x80f0c0) == 0xf080:  # xxxxxxxx0xxxxxxx1111xxxx10xxxxxx
+                    if (instr & 0x1f0000) == 0xf0000:  # xxxxxxxxxxx01111xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "sxth_t2" / "11111010000011111111xxxx10xxxxxx"
+                        return Sxth(flags)
+                    elif (instr & 0x1f0000) == 0x1f0000:  # xxxxxxxxxxx11111xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "uxth_t2" / "11111010000111111111xxxx10xxxxxx"
+                        return Uxth(flags)
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x2200000:  # xxxxx010x01xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x90f0f0) == 0x90f080:  # xxxxxxxx1xx1xxxx1111xxxx1000xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "clz_t1" / "111110101011xxxx1111xxxx1000xxxx"
+                    return Clz(flags)
+                elif (instr & 0x80f0f0) == 0xf000:  # xxxxxxxx0xxxxxxx1111xxxx0000xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "lsr_register_t2" / "11111010001xxxxx1111xxxx0000xxxx"
+                    return LsrRegister(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x2400000:  # xxxxx010x10xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x80f0f0) == 0xf000:  # xxxxxxxx0xxxxxxx1111xxxx0000xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "asr_register_t2" / "11111010010xxxxx1111xxxx0000xxxx"
+                    return AsrRegister(flags)
+                elif (instr & 0x80f0c0) == 0xf080:  # xxxxxxxx0xxxxxxx1111xxxx10xxxxxx
+                    if (instr & 0x1f0000) == 0xf0000:  # xxxxxxxxxxx01111xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "sxtb_t2" / "11111010010011111111xxxx10xxxxxx"
+                        return Sxtb(flags)
+                    elif (instr & 0x1f0000) == 0x1f0000:  # xxxxxxxxxxx11111xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "uxtb_t2" / "11111010010111111111xxxx10xxxxxx"
+                        return Uxtb(flags)
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x0:  # xxxxx000x00xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x900800) == 0x100800:  # xxxxxxxx0xx1xxxxxxxx1xxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ldrb_immediate_t3" / "111110000001xxxxxxxx1xxxxxxxxxxx"
+                    return LdrbImmediate(flags)
+                elif (instr & 0x900000) == 0x800000:  # xxxxxxxx1xx0xxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "strb_immediate_t2" / "111110001000xxxxxxxxxxxxxxxxxxxx"
+                    return StrbImmediate(flags)
+                elif (instr & 0x900000) == 0x0:  # xxxxxxxx0xx0xxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0xfc0) == 0x0:  # xxxxxxxxxxxxxxxxxxxx000000xxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "strb_register_t2" / "111110000000xxxxxxxx000000xxxxxx"
+                        return StrbRegister(flags)
+                    elif (instr & 0x800) == 0x800:  # xxxxxxxxxxxxxxxxxxxx1xxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "strb_immediate_t3" / "111110000000xxxxxxxx1xxxxxxxxxxx"
+                        return StrbImmediate(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x900000) == 0x900000:  # xxxxxxxx1xx1xxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ldrb_immediate_t2" / "111110001001xxxxxxxxxxxxxxxxxxxx"
+                    return LdrbImmediate(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x200000:  # xxxxx000x01xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x900000) == 0x800000:  # xxxxxxxx1xx0xxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "strh_immediate_t2" / "111110001010xxxxxxxxxxxxxxxxxxxx"
+                    return StrhImmediate(flags)
+                elif (instr & 0x900000) == 0x0:  # xxxxxxxx0xx0xxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0xfc0) == 0x0:  # xxxxxxxxxxxxxxxxxxxx000000xxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "strh_register_t2" / "111110000010xxxxxxxx000000xxxxxx"
+                        return StrhRegister(flags)
+                    elif (instr & 0x800) == 0x800:  # xxxxxxxxxxxxxxxxxxxx1xxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "strh_immediate_t3" / "111110000010xxxxxxxx1xxxxxxxxxxx"
+                        return StrhImmediate(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x900000) == 0x900000:  # xxxxxxxx1xx1xxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ldrh_immediate_t2" / "111110001011xxxxxxxxxxxxxxxxxxxx"
+                    return LdrhImmediate(flags)
+                elif (instr & 0x900000) == 0x100000:  # xxxxxxxx0xx1xxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0xfc0) == 0x0:  # xxxxxxxxxxxxxxxxxxxx000000xxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "ldrh_register_t2" / "111110000011xxxxxxxx000000xxxxxx"
+                        return LdrhRegister(flags)
+                    elif (instr & 0x800) == 0x800:  # xxxxxxxxxxxxxxxxxxxx1xxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "ldrh_immediate_t3" / "111110000011xxxxxxxx1xxxxxxxxxxx"
+                        return LdrhImmediate(flags)
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x1000000:  # xxxxx001x00xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x900800) == 0x100800:  # xxxxxxxx0xx1xxxxxxxx1xxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ldrsb_immediate_t2" / "111110010001xxxxxxxx1xxxxxxxxxxx"
+                    return LdrsbImmediate(flags)
+                elif (instr & 0x900000) == 0x900000:  # xxxxxxxx1xx1xxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ldrsb_immediate_t1" / "111110011001xxxxxxxxxxxxxxxxxxxx"
+                    return LdrsbImmediate(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x1200000:  # xxxxx001x01xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x900800) == 0x100800:  # xxxxxxxx0xx1xxxxxxxx1xxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ldrsh_immediate_t2" / "111110010011xxxxxxxx1xxxxxxxxxxx"
+                    return LdrshImmediate(flags)
+                elif (instr & 0x900000) == 0x900000:  # xxxxxxxx1xx1xxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "ldrsh_immediate_t1" / "111110011011xxxxxxxxxxxxxxxxxxxx"
+                    return LdrshImmediate(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x3000000:  # xxxxx011x00xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x90f0f0) == 0x90f0f0:  # xxxxxxxx1xx1xxxx1111xxxx1111xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "sdiv_t1" / "111110111001xxxx1111xxxx1111xxxx"
+                    return Sdiv(flags)
+                elif (instr & 0x9000f0) == 0x0:  # xxxxxxxx0xx0xxxxxxxxxxxx0000xxxx
+                    if (instr & 0xf000) == 0xf000:  # xxxxxxxxxxxxxxxx1111xxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "mul_t2" / "111110110000xxxx1111xxxx0000xxxx"
+                        return Mul(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "mla_t1" / "111110110000xxxxxxxxxxxx0000xxxx"
+                        return Mla(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x9000f0) == 0x10:  # xxxxxxxx0xx0xxxxxxxxxxxx0001xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "mls_t1" / "111110110000xxxxxxxxxxxx0001xxxx"
+                    return Mls(flags)
+                elif (instr & 0x9000f0) == 0x800000:  # xxxxxxxx1xx0xxxxxxxxxxxx0000xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "smull_t1" / "111110111000xxxxxxxxxxxx0000xxxx"
+                    return Smull(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7600000) == 0x3200000:  # xxxxx011x01xxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x90f0f0) == 0x90f0f0:  # xxxxxxxx1xx1xxxx1111xxxx1111xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "udiv_t1" / "111110111011xxxx1111xxxx1111xxxx"
+                    return Udiv(flags)
+                elif (instr & 0x9000f0) == 0x800000:  # xxxxxxxx1xx0xxxxxxxxxxxx0000xxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "umull_t1" / "111110111010xxxxxxxxxxxx0000xxxx"
+                    return Umull(flags)
+                return Undef(instr)  # no match
+            return Undef(instr)  # no match
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x40000000:  # 0100xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0x7000000) == 0x1000000:  # xxxxx001xxxxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0xc00000) == 0x400000:  # xxxxxxxx01xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    m = (instr >> 19) & 0x7
+                    n = (instr >> 16) & 0x7
+                    d = n
+                    if not context.istate & 0b1111 != 0b0000:
+                        flags = flags | (1 << 0) # flags |= Set
+                    
+                    shift_t = 0b001 # SRType_LSL
+                    shift_n = 0b0
+                    # Pattern: "adc_register_t1" / "0100000101xxxxxx"
+                    return AdcRegister(flags, d, n, m, shift_t, shift_n)
+                elif (instr & 0xc00000) == 0x0:  # xxxxxxxx00xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "asr_register_t1" / "0100000100xxxxxx"
+                    return AsrRegister(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7000000) == 0x4000000:  # xxxxx100xxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                # Pattern: "add_register_t2" / "01000100xxxxxxxx"
+                return AddRegister(flags)
+            elif (instr & 0x7000000) == 0x2000000:  # xxxxx010xxxxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0xc00000) == 0x800000:  # xxxxxxxx10xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "cmp_register_t1" / "0100001010xxxxxx"
+                    return CmpRegister(flags)
+                elif (instr & 0xc00000) == 0x0:  # xxxxxxxx00xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "tst_register_t1" / "0100001000xxxxxx"
+                    return TstRegister(flags)
+                elif (instr & 0xc00000) == 0x400000:  # xxxxxxxx01xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "rsb_immediate_t1" / "0100001001xxxxxx"
+                    return RsbImmediate(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7000000) == 0x5000000:  # xxxxx101xxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                # Pattern: "cmp_register_t2" / "01000101xxxxxxxx"
+                return CmpRegister(flags)
+            elif (instr & 0x7000000) == 0x6000000:  # xxxxx110xxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                d = (((instr >> 23) & 0x1) << 2) | ((instr >> 16) & 0x7) # (instr[7:7] <<3) | instr[2:0]
+                m = (instr >> 19) & 0xf
+                if ((d == 15) and ((context.istate & 0b1111 != 0b0000) and not (context.istate & 0b1111 == 0b1000))):
+                    return Unpredictable(instr)
+                
+                # Pattern: "mov_register_t1" / "01000110xxxxxxxx"
+                return MovRegister(flags, d, m)
+            elif (instr & 0x7000000) == 0x0:  # xxxxx000xxxxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0xc00000) == 0x0:  # xxxxxxxx00xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "and_register_t1" / "0100000000xxxxxx"
+                    return AndRegister(flags)
+                elif (instr & 0xc00000) == 0x400000:  # xxxxxxxx01xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "eor_register_t1" / "0100000001xxxxxx"
+                    return EorRegister(flags)
+                elif (instr & 0xc00000) == 0x800000:  # xxxxxxxx10xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "lsl_register_t1" / "0100000010xxxxxx"
+                    return LslRegister(flags)
+                elif (instr & 0xc00000) == 0xc00000:  # xxxxxxxx11xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "lsr_register_t1" / "0100000011xxxxxx"
+                    return LsrRegister(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7000000) == 0x3000000:  # xxxxx011xxxxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0xc00000) == 0x0:  # xxxxxxxx00xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "orr_register_t1" / "0100001100xxxxxx"
+                    return OrrRegister(flags)
+                elif (instr & 0xc00000) == 0x800000:  # xxxxxxxx10xxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "bic_register_t1" / "0100001110xxxxxx"
+                    return BicRegister(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x7000000) == 0x7000000:  # xxxxx111xxxxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x800000) == 0x0:  # xxxxxxxx0xxxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "bx_t1" / "010001110xxxxxxx"
+                    return Bx(flags)
+                elif (instr & 0x800000) == 0x800000:  # xxxxxxxx1xxxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "blx_t1" / "010001111xxxxxxx"
+                    return Blx(flags)
+                return Undef(instr)  # no match
+            return Undef(instr)  # no match
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            flags = flags | (1 << 1) # flags |= Add
+            t = (instr >> 24) & 0x7
+            imm32 = ((instr >> 16) & 0xff) << 2
+            # Pattern: "ldr_literal_t1" / "01001xxxxxxxxxxx"
+            return LdrLiteral(flags, t, imm32)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0xe0000000:  # 1110xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0x6400000) == 0x2400000:  # xxxxx01xx1xxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x1af8000) == 0x2f0000:  # xxxxxxx00x1x11110xxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "mvn_register_t2" / "11101010011x11110xxxxxxxxxxxxxxx"
+                    return MvnRegister(flags)
+                elif (instr & 0x1a08000) == 0x1000000:  # xxxxxxx10x0xxxxx0xxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    if (instr >> 20) & 0x1 == 1:
+                        flags = flags | (1 << 0) # flags |= Set
+                    
+                    n = (instr >> 16) & 0xf
+                    d = (instr >> 8) & 0xf
+                    m = (instr >> 0) & 0xf
+                    _imm2 = (instr >> 6) & 0x3
+                    _imm3 = (instr >> 12) & 0x7
+                    _type = (instr >> 4) & 0x3
+                    imm5 = (_imm2 << 0) | (_imm3 << 2)
+                    if _type == 0b00:
+                        shift_t = 0b001 # SRType_LSL
+                        shift_n = imm5
+                    elif _type == 0b01:
+                        shift_t = 0b010 # SRType_LSR
+                        if imm5 == 0x0:
+                            shift_n = 32
+                        else:
+                            shift_n = imm5
+                        
+                    elif _type == 0b10:
+                        shift_t = 0b011 # SRType_ASR
+                        if imm5 == 0x0:
+                            shift_n = 32
+                        else:
+                            shift_n = imm5
+                        
+                    elif _type == 0b11:
+                        if imm5 == 0x0:
+                            shift_t = 0b101 # SRType_RRX
+                            shift_n = 1
+                        else:
+                            shift_t = 0b100 # SRType_ROR
+                            shift_n = imm5
+                        
+                    
+                    if (n == 13) or (n == 15) or (m == 13) or (m == 15) or (d == 13) or (d == 15):
+                        return Unpredictable(instr)
+                    
+                    # Pattern: "adc_register_t2" / "11101011010xxxxx0xxxxxxxxxxxxxxx"
+                    return AdcRegister(flags, d, n, m, shift_t, shift_n)
+                elif (instr & 0x1a08000) == 0x0:  # xxxxxxx00x0xxxxx0xxxxxxxxxxxxxxx
+                    if (instr & 0xf70f0) == 0xf0000:  # xxxxxxxxxxxx1111x000xxxx0000xxxx
+                        flags = 0x0 # initial value
+                        d = (instr >> 8) & 0xf
+                        m = (instr >> 0) & 0xf
+                        if (instr >> 20) & 0x1 == 1:
+                            flags = flags | (1 << 0) # flags |= Set
+                        
+                        if (flags & (1 << 0) != 0b0000) and ((d == 13) or (d == 15) or (m == 13) or (m == 15)):
+                            return Unpredictable(instr)
+                        
+                        if (flags & (1 << 0) == 0b0000) and ((d == 15) or (m == 15) or ((d == 13) and (m == 13))):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "mov_register_t3" / "11101010010x11110000xxxx0000xxxx"
+                        return MovRegister(flags, d, m)
+                    elif (instr & 0xf70f0) == 0xf0030:  # xxxxxxxxxxxx1111x000xxxx0011xxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "rrx_t1" / "11101010010x11110000xxxx0011xxxx"
+                        return Rrx(flags)
+                    elif (instr & 0xf0030) == 0xf0000:  # xxxxxxxxxxxx1111xxxxxxxxxx00xxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "lsl_immediate_t2" / "11101010010x11110xxxxxxxxx00xxxx"
+                        return LslImmediate(flags)
+                    elif (instr & 0xf0030) == 0xf0010:  # xxxxxxxxxxxx1111xxxxxxxxxx01xxxx
+                        flags = 0x0 # initial value
+                        d = (instr >> 8) & 0xf
+                        m = (instr >> 0) & 0xf
+                        _imm2 = (instr >> 6) & 0x3
+                        _imm3 = (instr >> 12) & 0x7
+                        _type = 0b01
+                        imm5 = (_imm2 << 0) | (_imm3 << 2)
+                        if _type == 0b00:
+                            _shift_t = 0b001 # SRType_LSL
+                            shift_n = imm5
+                        elif _type == 0b01:
+                            _shift_t = 0b010 # SRType_LSR
+                            if imm5 == 0x0:
+                                shift_n = 32
+                            else:
+                                shift_n = imm5
+                            
+                        elif _type == 0b10:
+                            _shift_t = 0b011 # SRType_ASR
+                            if imm5 == 0x0:
+                                shift_n = 32
+                            else:
+                                shift_n = imm5
+                            
+                        elif _type == 0b11:
+                            if imm5 == 0x0:
+                                _shift_t = 0b101 # SRType_RRX
+                                shift_n = 1
+                            else:
+                                _shift_t = 0b100 # SRType_ROR
+                                shift_n = imm5
+                            
+                        
+                        if (instr >> 20) & 0x1 == 1:
+                            flags = flags | (1 << 0) # flags |= Set
+                        
+                        # Pattern: "lsr_immediate_t2" / "11101010010x11110xxxxxxxxx01xxxx"
+                        return LsrImmediate(flags, d, m, shift_n)
+                    elif (instr & 0xf0030) == 0xf0020:  # xxxxxxxxxxxx1111xxxxxxxxxx10xxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "asr_immediate_t2" / "11101010010x11110xxxxxxxxx10xxxx"
+                        return AsrImmediate(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "orr_register_t2" / "11101010010xxxxx0xxxxxxxxxxxxxxx"
+                        return OrrRegister(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x1a08000) == 0x1200000:  # xxxxxxx10x1xxxxx0xxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "sbc_register_t2" / "11101011011xxxxx0xxxxxxxxxxxxxxx"
+                    return SbcRegister(flags)
+                elif (instr & 0x1a08000) == 0x1800000:  # xxxxxxx11x0xxxxx0xxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "rsb_register_t1" / "11101011110xxxxx0xxxxxxxxxxxxxxx"
+                    return RsbRegister(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x6400000) == 0x2000000:  # xxxxx01xx0xxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x1a08000) == 0x1000000:  # xxxxxxx10x0xxxxx0xxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "add_register_t3" / "11101011000xxxxx0xxxxxxxxxxxxxxx"
+                    return AddRegister(flags)
+                elif (instr & 0x1a08000) == 0x1a00000:  # xxxxxxx11x1xxxxx0xxxxxxxxxxxxxxx
+                    if (instr & 0x100f00) == 0x100f00:  # xxxxxxxxxxx1xxxxxxxx1111xxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "cmp_register_t3" / "111010111011xxxx0xxx1111xxxxxxxx"
+                        return CmpRegister(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        n = (instr >> 16) & 0xf
+                        d = (instr >> 8) & 0xf
+                        m = (instr >> 0) & 0xf
+                        if (instr >> 20) & 0x1 == 1:
+                            flags = flags | (1 << 0) # flags |= Set
+                        
+                        _imm2 = (instr >> 6) & 0x3
+                        _imm3 = (instr >> 12) & 0x7
+                        _type = (instr >> 4) & 0x3
+                        imm5 = (_imm2 << 0) | (_imm3 << 2)
+                        if _type == 0b00:
+                            shift_t = 0b001 # SRType_LSL
+                            shift_n = imm5
+                        elif _type == 0b01:
+                            shift_t = 0b010 # SRType_LSR
+                            if imm5 == 0x0:
+                                shift_n = 32
+                            else:
+                                shift_n = imm5
+                            
+                        elif _type == 0b10:
+                            shift_t = 0b011 # SRType_ASR
+                            if imm5 == 0x0:
+                                shift_n = 32
+                            else:
+                                shift_n = imm5
+                            
+                        elif _type == 0b11:
+                            if imm5 == 0x0:
+                                shift_t = 0b101 # SRType_RRX
+                                shift_n = 1
+                            else:
+                                shift_t = 0b100 # SRType_ROR
+                                shift_n = imm5
+                            
+                        
+                        if (d == 13) or ((d == 15) and (flags & (1 << 0) == 0b0000)) or (n == 15) or (m == 13) or (m == 15):
+                            return Unpredictable(instr)
+                        
+                        # Pattern: "sub_register_t2" / "11101011101xxxxx0xxxxxxxxxxxxxxx"
+                        return SubRegister(flags, d, n, m, shift_t, shift_n)
+                    return Undef(instr)  # no match
+                elif (instr & 0x1a08000) == 0x0:  # xxxxxxx00x0xxxxx0xxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "and_register_t2" / "11101010000xxxxx0xxxxxxxxxxxxxxx"
+                    return AndRegister(flags)
+                elif (instr & 0x1a08000) == 0x800000:  # xxxxxxx01x0xxxxx0xxxxxxxxxxxxxxx
+                    if (instr & 0x100f00) == 0x100f00:  # xxxxxxxxxxx1xxxxxxxx1111xxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "teq_register_t1" / "111010101001xxxx0xxx1111xxxxxxxx"
+                        return TeqRegister(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "eor_register_t2" / "11101010100xxxxx0xxxxxxxxxxxxxxx"
+                        return EorRegister(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x1a08000) == 0x200000:  # xxxxxxx00x1xxxxx0xxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "bic_register_t2" / "11101010001xxxxx0xxxxxxxxxxxxxxx"
+                    return BicRegister(flags)
+                return Undef(instr)  # no match
+            elif (instr & 0x6400000) == 0x0:  # xxxxx00xx0xxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x190a000) == 0x800000:  # xxxxxxx01xx0xxxx0x0xxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "stm_t2" / "1110100010x0xxxx0x0xxxxxxxxxxxxx"
+                    return Stm(flags)
+                elif (instr & 0x1902000) == 0x1000000:  # xxxxxxx10xx0xxxxxx0xxxxxxxxxxxxx
+                    if (instr & 0x8000) == 0x0:  # xxxxxxxxxxxxxxxx0xxxxxxxxxxxxxxx
+                        if (instr & 0x2f0000) == 0x2d0000:  # xxxxxxxxxx1x1101xxxxxxxxxxxxxxxx
+                            flags = 0x0 # initial value
+                            # Pattern: "push_t2" / "11101001001011010x0xxxxxxxxxxxxx"
+                            return Push(flags, registers)
+                        elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                            flags = 0x0 # initial value
+                            # Pattern: "stmdb_t1" / "1110100100x0xxxx0x0xxxxxxxxxxxxx"
+                            return Stmdb(flags)
+                        return Undef(instr)  # no match
+                    return Undef(instr)  # no match
+                elif (instr & 0x1902000) == 0x900000:  # xxxxxxx01xx1xxxxxx0xxxxxxxxxxxxx
+                    if (instr & 0x2f0000) == 0x2d0000:  # xxxxxxxxxx1x1101xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "pop_t2" / "1110100010111101xx0xxxxxxxxxxxxx"
+                        return Pop(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "ldm_t2" / "1110100010x1xxxxxx0xxxxxxxxxxxxx"
+                        return Ldm(flags)
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            elif (instr & 0x6400000) == 0x400000:  # xxxxx00xx1xxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x100000) == 0x0:  # xxxxxxxxxxx0xxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x1a00000) == 0x0:  # xxxxxxx00x0xxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "strex_t1" / "111010000100xxxxxxxxxxxxxxxxxxxx"
+                        return Strex(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "strd_immediate_t1" / "1110100xx1x0xxxxxxxxxxxxxxxxxxxx"
+                        return StrdImmediate(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0x100000) == 0x100000:  # xxxxxxxxxxx1xxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x1a0ffe0) == 0x80f000:  # xxxxxxx01x0xxxxx11110000000xxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "tbb_h_t1" / "111010001101xxxx11110000000xxxxx"
+                        return TbbH(flags)
+                    elif (instr & 0x1a00f00) == 0xf00:  # xxxxxxx00x0xxxxxxxxx1111xxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "ldrex_t1" / "111010000101xxxxxxxx1111xxxxxxxx"
+                        return Ldrex(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "ldrd_immediate_t1" / "1110100xx1x1xxxxxxxxxxxxxxxxxxxx"
+                        return LdrdImmediate(flags)
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            return Undef(instr)  # no match
+        elif (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            _imm9_us = ((instr >> 16) & 0x7ff) << 1
+            imm32 = (_imm9_us ^ (1 << 11)) - (1 << 11)
+            if ((context.istate & 0b1111 != 0b0000) and not (context.istate & 0b1111 == 0b1000)):
+                return Unpredictable(instr)
+            
+            # Pattern: "b_t2" / "11100xxxxxxxxxxx"
+            return B(flags, imm32)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x10000000:  # 0001xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0x6000000) == 0x0:  # xxxxx00xxxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                # Pattern: "add_register_t1" / "0001100xxxxxxxxx"
+                return AddRegister(flags)
+            elif (instr & 0x6000000) == 0x4000000:  # xxxxx10xxxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                n = (instr >> 19) & 0x7
+                d = (instr >> 16) & 0x7
+                imm32 = (instr >> 22) & 0x7
+                if not context.istate & 0b1111 != 0b0000:
+                    flags = flags | (1 << 0) # flags |= Set
+                
+                # Pattern: "add_immediate_t1" / "0001110xxxxxxxxx"
+                return AddImmediate(flags, d, n, imm32)
+            elif (instr & 0x6000000) == 0x2000000:  # xxxxx01xxxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                m = (instr >> 22) & 0x7
+                n = (instr >> 19) & 0x7
+                d = (instr >> 16) & 0x7
+                shift_t = 0b001 # SRType_LSL
+                shift_n = 0b0
+                if not context.istate & 0b1111 != 0b0000:
+                    flags = flags | (1 << 0) # flags |= Set
+                
+                # Pattern: "sub_register_t1" / "0001101xxxxxxxxx"
+                return SubRegister(flags, d, n, m, shift_t, shift_n)
+            elif (instr & 0x6000000) == 0x6000000:  # xxxxx11xxxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                # Pattern: "sub_immediate_t1" / "0001111xxxxxxxxx"
+                return SubImmediate(flags)
+            return Undef(instr)  # no match
+        elif (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "asr_immediate_t1" / "00010xxxxxxxxxxx"
+            return AsrImmediate(flags)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x30000000:  # 0011xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            n = (instr >> 16) & 0xf
+            d = n
+            imm32 = (instr >> 16) & 0xff
+            if not context.istate & 0b1111 != 0b0000:
+                flags = flags | (1 << 0) # flags |= Set
+            
+            # Pattern: "add_immediate_t2" / "00110xxxxxxxxxxx"
+            return AddImmediate(flags, d, n, imm32)
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "sub_immediate_t2" / "00111xxxxxxxxxxx"
+            return SubImmediate(flags)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0xa0000000:  # 1010xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            flags = flags | (1 << 1) # flags |= Add
+            d = (instr >> 24) & 0x7
+            imm32 = ((instr >> 16) & 0xff) << 2
+            # Pattern: "add_pc_plus_immediate_t1" / "10100xxxxxxxxxxx"
+            return AddPcPlusImmediate(flags, d, imm32)
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "add_sp_plus_immediate_t1" / "10101xxxxxxxxxxx"
+            return AddSpPlusImmediate(flags)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x20000000:  # 0010xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            n = (instr >> 24) & 0x7
+            imm32 = (instr >> 16) & 0xff
+            # Pattern: "cmp_immediate_t1" / "00101xxxxxxxxxxx"
+            return CmpImmediate(flags, n, imm32)
+        elif (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            if not context.istate & 0b1111 != 0b0000:
+                flags = flags | (1 << 0) # flags |= Set
+            
+            if (context.apsr >> 29) & 0x1 != 0:
+                flags = flags | (1 << 2) # flags |= Carry
+            
+            d = (instr >> 24) & 0x7
+            imm32 = (instr >> 16) & 0xff
+            # Pattern: "mov_immediate_t1" / "00100xxxxxxxxxxx"
+            return MovImmediate(flags, d, imm32)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x0:  # 0000xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0x7c00000) == 0x0:  # xxxxx00000xxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                m = (instr >> 19) & 0x7
+                d = (instr >> 16) & 0x7
+                flags = flags | (1 << 0) # flags |= Set
+                # Pattern: "mov_register_t2" / "0000000000xxxxxx"
+                return MovRegister(flags, d, m)
+            elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                # Pattern: "lsl_immediate_t1" / "00000xxxxxxxxxxx"
+                return LslImmediate(flags)
+            return Undef(instr)  # no match
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            if not context.istate & 0b1111 != 0b0000:
+                flags = flags | (1 << 0) # flags |= Set
+            
+            d = (instr >> 16) & 0x7
+            m = (instr >> 19) & 0x7
+            imm5 = (instr >> 22) & 0x1f
+            _type = 0b01
+            if _type == 0b00:
+                _type = 0b001 # SRType_LSL
+                shift_n = imm5
+            elif _type == 0b01:
+                _type = 0b010 # SRType_LSR
+                if imm5 == 0x0:
+                    shift_n = 32
+                else:
+                    shift_n = imm5
+                
+            elif _type == 0b10:
+                _type = 0b011 # SRType_ASR
+                if imm5 == 0x0:
+                    shift_n = 32
+                else:
+                    shift_n = imm5
+                
+            elif _type == 0b11:
+                if imm5 == 0x0:
+                    _type = 0b101 # SRType_RRX
+                    shift_n = 1
+                else:
+                    _type = 0b100 # SRType_ROR
+                    shift_n = imm5
+                
+            
+            # Pattern: "lsr_immediate_t1" / "00001xxxxxxxxxxx"
+            return LsrImmediate(flags, d, m, shift_n)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x60000000:  # 0110xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            flags = flags | (1 << 3) # flags |= Index
+            flags = flags | (1 << 1) # flags |= Add
+            n = (instr >> 19) & 0x7
+            t = (instr >> 16) & 0x7
+            imm32 = ((instr >> 22) & 0x1f) << 2
+            # Pattern: "ldr_immediate_t1" / "01101xxxxxxxxxxx"
+            return LdrImmediate(flags, t, n, imm32)
+        elif (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            flags = flags | (1 << 3) # flags |= Index
+            flags = flags | (1 << 1) # flags |= Add
+            n = (instr >> 19) & 0x7
+            t = (instr >> 16) & 0x7
+            imm32 = ((instr >> 22) & 0x1f) << 2
+            # Pattern: "str_immediate_t1" / "01100xxxxxxxxxxx"
+            return StrImmediate(flags, t, n, imm32)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x90000000:  # 1001xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            flags = flags | (1 << 3) # flags |= Index
+            flags = flags | (1 << 1) # flags |= Add
+            n = 13
+            t = (instr >> 24) & 0x7
+            imm32 = ((instr >> 16) & 0xff) << 2
+            # Pattern: "ldr_immediate_t2" / "10011xxxxxxxxxxx"
+            return LdrImmediate(flags, t, n, imm32)
+        elif (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            flags = flags | (1 << 3) # flags |= Index
+            flags = flags | (1 << 1) # flags |= Add
+            n = 13
+            t = (instr >> 24) & 0x7
+            imm32 = ((instr >> 16) & 0xff) << 2
+            # Pattern: "str_immediate_t2" / "10010xxxxxxxxxxx"
+            return StrImmediate(flags, t, n, imm32)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x50000000:  # 0101xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0xe000000) == 0x0:  # xxxx000xxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "str_register_t1" / "0101000xxxxxxxxx"
+            return StrRegister(flags)
+        elif (instr & 0xe000000) == 0x4000000:  # xxxx010xxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "strb_register_t1" / "0101010xxxxxxxxx"
+            return StrbRegister(flags)
+        elif (instr & 0xe000000) == 0x8000000:  # xxxx100xxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "ldr_register_t1" / "0101100xxxxxxxxx"
+            return LdrRegister(flags)
+        elif (instr & 0xe000000) == 0xc000000:  # xxxx110xxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "ldrb_register_t1" / "0101110xxxxxxxxx"
+            return LdrbRegister(flags)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0xb0000000:  # 1011xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x4000000) == 0x0:  # xxxxx0xxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0x1000000) == 0x0:  # xxxxxxx0xxxxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0xa800000) == 0x0:  # xxxx0x0x0xxxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "add_sp_plus_immediate_t2" / "101100000xxxxxxx"
+                    return AddSpPlusImmediate(flags)
+                elif (instr & 0xa800000) == 0x800000:  # xxxx0x0x1xxxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    # Pattern: "sub_sp_minus_immediate_t1" / "101100001xxxxxxx"
+                    return SubSpMinusImmediate(flags)
+                elif (instr & 0xa800000) == 0x2000000:  # xxxx0x1x0xxxxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x400000) == 0x0:  # xxxxxxxxx0xxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "sxth_t1" / "1011001000xxxxxx"
+                        return Sxth(flags)
+                    elif (instr & 0x400000) == 0x400000:  # xxxxxxxxx1xxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "sxtb_t1" / "1011001001xxxxxx"
+                        return Sxtb(flags)
+                    return Undef(instr)  # no match
+                elif (instr & 0xa800000) == 0x2800000:  # xxxx0x1x1xxxxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0x400000) == 0x0:  # xxxxxxxxx0xxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "uxth_t1" / "1011001010xxxxxx"
+                        return Uxth(flags)
+                    elif (instr & 0x400000) == 0x400000:  # xxxxxxxxx1xxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "uxtb_t1" / "1011001011xxxxxx"
+                        return Uxtb(flags)
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            elif (instr & 0x1000000) == 0x1000000:  # xxxxxxx1xxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                # Pattern: "cb_n_z_t1" / "1011x0x1xxxxxxxx"
+                return CbNZ(flags)
+            return Undef(instr)  # no match
+        elif (instr & 0x4000000) == 0x4000000:  # xxxxx1xxxxxxxxxxxxxxxxxxxxxxxxxx
+            if (instr & 0xa000000) == 0x0:  # xxxx0x0xxxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                _register_list = (instr >> 16) & 0xff
+                _M = (instr >> 24) & 0x1
+                registers = (_M << 14) | (_register_list << 0)
+                _v = registers - ((registers >> 1) & 0x55555555)
+                _v = (_v & 0x33333333) + ((_v >> 2) & 0x33333333)
+                bc = ((_v + (_v >> 4) & 0xF0F0F0F) * 0x1010101) >> 24
+                if bc < 1:
+                    return Unpredictable(instr)
+                
+                # Pattern: "push_t1" / "1011010xxxxxxxxx"
+                return Push(flags, registers)
+            elif (instr & 0xa000000) == 0x8000000:  # xxxx1x0xxxxxxxxxxxxxxxxxxxxxxxxx
+                flags = 0x0 # initial value
+                # Pattern: "pop_t1" / "1011110xxxxxxxxx"
+                return Pop(flags)
+            elif (instr & 0xa000000) == 0xa000000:  # xxxx1x1xxxxxxxxxxxxxxxxxxxxxxxxx
+                if (instr & 0x1000000) == 0x0:  # xxxxxxx0xxxxxxxxxxxxxxxxxxxxxxxx
+                    flags = 0x0 # initial value
+                    imm32 = (instr >> 16) & 0xff
+                    # Pattern: "bkpt_t1" / "10111110xxxxxxxx"
+                    return Bkpt(flags, imm32)
+                elif (instr & 0x1000000) == 0x1000000:  # xxxxxxx1xxxxxxxxxxxxxxxxxxxxxxxx
+                    if (instr & 0xff0000) == 0x0:  # xxxxxxxx00000000xxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "nop_t1" / "1011111100000000"
+                        return Nop(flags)
+                    elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+                        flags = 0x0 # initial value
+                        # Pattern: "it_t1" / "10111111xxxxxxxx"
+                        return It(flags)
+                    return Undef(instr)  # no match
+                return Undef(instr)  # no match
+            return Undef(instr)  # no match
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0xd0000000:  # 1101xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0xf000000) == 0xf000000:  # xxxx1111xxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "svc_t1" / "11011111xxxxxxxx"
+            return Svc(flags)
+        elif (instr & 0x0) == 0x0:  # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            cond = (instr >> 24) & 0xf
+            _imm9_us = ((instr >> 16) & 0xff) << 1
+            imm32 = (_imm9_us ^ (1 << 8)) - (1 << 8)
+            if ((context.istate & 0b1111 != 0b0000)):
+                return Unpredictable(instr)
+            
+            # Pattern: "b_t1" / "1101xxxxxxxxxxxx"
+            return BCond(flags, cond, imm32)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x70000000:  # 0111xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "strb_immediate_t1" / "01110xxxxxxxxxxx"
+            return StrbImmediate(flags)
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "ldrb_immediate_t1" / "01111xxxxxxxxxxx"
+            return LdrbImmediate(flags)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0x80000000:  # 1000xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "strh_immediate_t1" / "10000xxxxxxxxxxx"
+            return StrhImmediate(flags)
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "ldrh_immediate_t1" / "10001xxxxxxxxxxx"
+            return LdrhImmediate(flags)
+        return Undef(instr)  # no match
+    elif (instr & 0xf0000000) == 0xc0000000:  # 1100xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if (instr & 0x8000000) == 0x0:  # xxxx0xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "stm_t1" / "11000xxxxxxxxxxx"
+            return Stm(flags)
+        elif (instr & 0x8000000) == 0x8000000:  # xxxx1xxxxxxxxxxxxxxxxxxxxxxxxxxx
+            flags = 0x0 # initial value
+            # Pattern: "ldm_t1" / "11001xxxxxxxxxxx"
+            return Ldm(flags)
+        return Undef(instr)  # no match
+    return Undef(instr)  # no match
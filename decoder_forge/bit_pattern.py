@@ -1,5 +1,13 @@
 import copy
-from itertools import takewhile
+
+# translation tables of parse_pattern: the fixed mask has a 1 for every 0 or 1 in the
+# pattern string, the fixed bits keep the value of the fixed bits
+_WILDCARDS = "xX.oO"
+_FIXEDMASK_TABLE = str.maketrans("01" + _WILDCARDS, "11" + "0" * len(_WILDCARDS))
+_FIXEDBITS_TABLE = str.maketrans(_WILDCARDS, "0" * len(_WILDCARDS))
+
+# translation table of to_string, a hex digit 2 marks a wildcard bit
+_STR_TABLE = str.maketrans("2", "x")
 
 
 def is_undef_bit(ch: str):
@@ -26,8 +34,14 @@ class BitPattern:
     The class provides utilities to parse a string representation of a bit pattern,
     convert the pattern back into a string, combine two patterns, and separate the
     pattern based on a given mask.
+
+    Instances only have slots for their three attributes, which keeps large numbers
+    of patterns small in memory. Patterns should be treated as immutable, as they are
+    used as dictionary keys.
     """
 
+    __slots__ = ("fixedmask", "fixedbits", "bit_length")
+
     def __init__(self, fixedmask: int = 0x0, fixedbits: int = 0x0, bit_length: int = 1):
         """
         Initialize a BitPattern instance.
@@ -61,6 +75,18 @@ class BitPattern:
         self.fixedbits = fixedbits & self.fixedmask
         self.bit_length = bit_length
 
+    @classmethod
+    def _unchecked(
+        cls, fixedmask: int, fixedbits: int, bit_length: int
+    ) -> "BitPattern":
+        # Internal constructor without any checks. The caller guarantees that the
+        # arguments are valid and that fixedbits is contained in fixedmask.
+        pat = object.__new__(cls)
+        pat.fixedmask = fixedmask
+        pat.fixedbits = fixedbits
+        pat.bit_length = bit_length
+        return pat
+
     @staticmethod
     def parse_pattern(pat_str: str) -> "BitPattern":
         """
@@ -80,7 +106,7 @@ class BitPattern:
                      length derived from the input.
 
         Raises:
-            ValueError: If the input string is empty.
+            ValueError: If the input string is empty or contains other characters.
 
         Example:
             >>> BitPattern.parse_pattern("10x1")
@@ -92,30 +118,22 @@ class BitPattern:
         if bit_length == 0:
             raise ValueError("No empty string allowed")
 
-        # 1 if the bit is 0 or 1. 0 if wildcard
-        def pat_to_fixedmask(i):
-            return "0" if is_wildcard_bit(i) else "1"
+        fixedmask_str = pat_str.translate(_FIXEDMASK_TABLE)
+        if fixedmask_str.count("0") + fixedmask_str.count("1") != bit_length:
+            raise ValueError(f"Invalid character in pattern {pat_str}")
 
-        # 1 if the bit is 1, 0 if the bit is 0. 0 if wildcard
-        def pat_to_fixedbits(i):
-            return "0" if is_wildcard_bit(i) else i
+        fixedmask = int(fixedmask_str, 2)
+        fixedbits = int(pat_str.translate(_FIXEDBITS_TABLE), 2)
 
-        fixedmask_str = "".join(pat_to_fixedmask(i) for i in pat_str)
-        fixedbits_str = "".join(pat_to_fixedbits(i) for i in pat_str)
-
-        pat = BitPattern(
-            fixedmask=int(fixedmask_str, 2),
-            fixedbits=int(fixedbits_str, 2),
-            bit_length=bit_length,
-        )
-        return pat
+        return BitPattern._unchecked(fixedmask, fixedbits & fixedmask, bit_length)
 
     @property
     def trailing_wildcard_count(self):
         """Count the trailing wildcard bits in the BitPattern.
 
         This property computes the number of trailing 'x' characters in the string
-        representation of the pattern. These trailing wildcards indicate the insignificant
+        representation of the pattern, which is the number of trailing zeros of the
+        fixedmask. These trailing wildcards indicate the insignificant
         or "don't care" bits at the end of the bit pattern.
 
         Returns:
@@ -127,10 +145,11 @@ class BitPattern:
         2
         """
 
-        def count_trailing_char(s: str, char: str) -> int:
-            return sum(1 for c in takewhile(lambda x: x == char, reversed(s)))
+        if self.fixedmask == 0:
+            return self.bit_length
 
-        return count_trailing_char(str(self), "x")
+        # index of the least significant fixed bit
+        return (self.fixedmask & -self.fixedmask).bit_length() - 1
 
     @staticmethod
     def to_string(pat: "BitPattern") -> str:
@@ -158,18 +177,12 @@ class BitPattern:
 
         assert isinstance(pat, BitPattern)
 
-        # represent number as binary with self.width digits
-        format_str = f"{{:0{pat.bit_length}b}}"
-
-        fixedmask_str = format_str.format(pat.fixedmask)
-        fixedbits_str = format_str.format(pat.fixedbits)
+        # Reading a binary string as hexadecimal number moves every bit to its own
+        # hex digit. Fixed bits become digits 0 and 1, wildcard bits digits 2.
+        wildcards = ~pat.fixedmask & ((1 << pat.bit_length) - 1)
+        digits = int(f"{pat.fixedbits:b}", 16) + 2 * int(f"{wildcards:b}", 16)
 
-        # Every 0 in the mask is X (dont care). It will be not evalutated
-        pattern_str = [
-            "x" if fm == "0" else fb for (fm, fb) in zip(fixedmask_str, fixedbits_str)
-        ]
-
-        return "".join(pattern_str)
+        return f"{digits:0{pat.bit_length}x}".translate(_STR_TABLE)
 
     def __str__(self) -> str:
         return BitPattern.to_string(self)
@@ -185,16 +198,11 @@ class BitPattern:
 
     def __eq__(self, other) -> bool:
         if isinstance(other, self.__class__):
-            if other.fixedmask != self.fixedmask:
-                return False
-
-            if other.fixedbits != self.fixedbits:
-                return False
-
-            if other.bit_length != self.bit_length:
-                return False
-
-            return True
+            return (
+                other.fixedmask == self.fixedmask
+                and other.fixedbits == self.fixedbits
+                and other.bit_length == self.bit_length
+            )
         else:
             return False
 
@@ -240,11 +248,7 @@ class BitPattern:
         if new_fixedbits & other.fixedmask != other.fixedbits:
             raise ValueError("Conflicting patterns should be combined")
 
-        return BitPattern(
-            fixedmask=new_fixedmask,
-            fixedbits=new_fixedbits,
-            bit_length=self.bit_length,
-        )
+        return BitPattern._unchecked(new_fixedmask, new_fixedbits, self.bit_length)
 
     def split_by_mask(self, mask: int) -> tuple["BitPattern", "BitPattern"]:
         """
@@ -284,16 +288,10 @@ class BitPattern:
                 + "BitPattern's fixedmask"
             )
 
-        pat_1 = BitPattern(
-            fixedmask=mask,
-            fixedbits=self.fixedbits & mask,
-            bit_length=self.bit_length,
-        )
+        pat_1 = BitPattern._unchecked(mask, self.fixedbits & mask, self.bit_length)
 
-        pat_2 = BitPattern(
-            fixedmask=self.fixedmask & ~mask,
-            fixedbits=self.fixedbits & ~mask,
-            bit_length=self.bit_length,
+        pat_2 = BitPattern._unchecked(
+            self.fixedmask & ~mask, self.fixedbits & ~mask, self.bit_length
         )
 
         return pat_1, pat_2
@@ -338,11 +336,7 @@ class BitPattern:
         fixedmask = self.fixedmask >> (-bit_length + self.bit_length)
         fixedbits = self.fixedbits >> (-bit_length + self.bit_length)
 
-        return BitPattern(
-            fixedmask=fixedmask,
-            fixedbits=fixedbits,
-            bit_length=bit_length,
-        )
+        return BitPattern._unchecked(fixedmask, fixedbits, bit_length)
 
     def extend_and_shift_to_msb(self, bit_length: int) -> "BitPattern":
         """Extend the BitPattern to a new higher bit length and shift it so that the
@@ -381,8 +375,4 @@ class BitPattern:
         fixedmask = self.fixedmask << (bit_length - self.bit_length)
         fixedbits = self.fixedbits << (bit_length - self.bit_length)
 
-        return BitPattern(
-            fixedmask=fixedmask,
-            fixedbits=fixedbits,
-            bit_length=bit_length,
-        )
+        return BitPattern._unchecked(fixedmask, fixedbits, bit_length)
@@ -0,0 +1,360 @@
+import numpy as np
+
+from decoder_forge.associated_struct_repo import StructDef
+from decoder_forge.i_c_decoder import ICDecoder
+from decoder_forge.instruction_stream import iter_instructions
+from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+# instructions decoded before their columns are copied into the arrays
+CHUNK_ROWS = 0x10000
+
+
+@dataclass
+class DecodedColumns:
+    """Decoded instructions of a binary image as structure of arrays.
+
+    Row i of every array belongs to the i-th decoded instruction. The members of all
+    structs are merged into one column per member name; rows of instructions whose
+    struct has no such member are masked.
+
+    Attributes:
+        address (np.ndarray): Offset of the instruction in the image (uint64).
+        code (np.ndarray): The instruction as stored in the image (uint64).
+        size (np.ndarray): Size of the instruction in bytes (uint8).
+        pattern (np.ndarray): Index in pattern_names, -1 if no pattern matched
+            (int32).
+        structure (np.ndarray): Index in struct_names (int32).
+        members (dict[str, np.ma.MaskedArray]): Column of every struct member, with
+            the smallest integer type holding its values.
+        pattern_names (list[str]): Names of the patterns.
+        struct_names (list[str]): Names of the structs.
+    """
+
+    address: np.ndarray
+    code: np.ndarray
+    size: np.ndarray
+    pattern: np.ndarray
+    structure: np.ndarray
+    members: dict[str, np.ma.MaskedArray]
+    pattern_names: list[str]
+    struct_names: list[str]
+
+    def __len__(self) -> int:
+        return len(self.address)
+
+    def save(self, path: str | Path):
+        """Save the columns as uncompressed .npz file.
+
+        The arrays of the file can be memory mapped with np.load(path, mmap_mode="r")
+        after unpacking it. Member columns are stored as "member/<name>" with their
+        masks as "mask/<name>".
+
+        Args:
+            path (str | Path): Path of the file.
+        """
+
+        arrays = {
+            "address": self.address,
+            "code": self.code,
+            "size": self.size,
+            "pattern": self.pattern,
+            "structure": self.structure,
+            "pattern_names": np.array(self.pattern_names, dtype=str),
+            "struct_names": np.array(self.struct_names, dtype=str),
+        }
+        for name, column in self.members.items():
+            arrays[f"member/{name}"] = np.ma.getdata(column)
+            arrays[f"mask/{name}"] = np.ma.getmaskarray(column)
+
+        with open(path, "wb") as fp:
+            np.savez(fp, **arrays)
+
+    @staticmethod
+    def load(path: str | Path) -> "DecodedColumns":
+        """Load columns saved with save.
+
+        Args:
+            path (str | Path): Path of the file.
+
+        Returns:
+            DecodedColumns: The loaded columns.
+        """
+
+        with np.load(path) as npz:
+            members = {
+                key.removeprefix("member/"): np.ma.MaskedArray(
+                    npz[key], mask=npz["mask/" + key.removeprefix("member/")]
+                )
+                for key in npz.files
+                if key.startswith("member/")
+            }
+            return DecodedColumns(
+                address=npz["address"],
+                code=npz["code"],
+                size=npz["size"],
+                pattern=npz["pattern"],
+                structure=npz["structure"],
+                members=members,
+                pattern_names=npz["pattern_names"].tolist(),
+                struct_names=npz["struct_names"].tolist(),
+            )
+
+
+class _ColumnWriter:
+    """Collects chunks of decoded instructions in preallocated arrays.
+
+    The arrays grow if more instructions than expected are decoded. The members of
+    each row are kept in a table with one column per member position of the
+    structs, they are sorted into member columns when finishing.
+    """
+
+    def __init__(
+        self,
+        structs: list[StructDef],
+        pattern_names: list[str],
+        capacity: int,
+    ):
+        self._structs = structs
+        self._pattern_names = pattern_names
+        self.fields_width = max((len(i.members) for i in structs), default=0)
+        self._rows = 0
+        self._address = np.empty(capacity, dtype=np.uint64)
+        self._code = np.empty(capacity, dtype=np.uint64)
+        self._size = np.empty(capacity, dtype=np.uint8)
+        self._pattern = np.empty(capacity, dtype=np.int32)
+        self._structure = np.empty(capacity, dtype=np.int32)
+        self._fields = np.zeros((capacity, self.fields_width), dtype=np.int64)
+
+    def _reserve(self, rows: int):
+        capacity = len(self._address)
+        if self._rows + rows <= capacity:
+            return
+
+        capacity = max(self._rows + rows, 2 * capacity)
+        for name in ("_address", "_code", "_size", "_pattern", "_structure"):
+            array = getattr(self, name)
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[: self._rows] = array[: self._rows]
+            setattr(self, name, grown)
+
+        fields = np.zeros((capacity, self.fields_width), dtype=np.int64)
+        fields[: self._rows] = self._fields[: self._rows]
+        self._fields = fields
+
+    def append(self, address, code, size, pattern, structure, fields):
+        """Append a chunk of rows, all arguments are sequences of equal length."""
+
+        rows = len(address)
+        self._reserve(rows)
+        chunk = slice(self._rows, self._rows + rows)
+        self._address[chunk] = address
+        self._code[chunk] = code
+        self._size[chunk] = size
+        self._pattern[chunk] = pattern
+        self._structure[chunk] = structure
+        self._fields[chunk] = fields
+        self._rows += rows
+
+    def finish(self) -> DecodedColumns:
+        rows = self._rows
+        structure = self._structure[:rows].copy()
+        fields = self._fields[:rows]
+
+        members: dict[str, np.ma.MaskedArray] = {}
+        for struct_idx, struct in enumerate(self._structs):
+            sel = structure == struct_idx
+            for pos, name in enumerate(struct.members):
+                if name not in members:
+                    members[name] = np.ma.MaskedArray(
+                        np.zeros(rows, dtype=np.int64), mask=np.ones(rows, dtype=bool)
+                    )
+                members[name][sel] = fields[sel, pos]
+
+        # store every member column with the smallest type holding its values
+        for name, column in members.items():
+            values = np.ma.getdata(column)
+            dtype = np.result_type(
+                np.min_scalar_type(values.min(initial=0)),
+                np.min_scalar_type(values.max(initial=0)),
+            )
+            members[name] = np.ma.MaskedArray(
+                values.astype(dtype), mask=np.ma.getmaskarray(column)
+            )
+
+        return DecodedColumns(
+            address=self._address[:rows].copy(),
+            code=self._code[:rows].copy(),
+            size=self._size[:rows].copy(),
+            pattern=self._pattern[:rows].copy(),
+            structure=structure,
+            members=members,
+            pattern_names=list(self._pattern_names),
+            struct_names=[i.name for i in self._structs],
+        )
+
+
+def _member_getter(members: list[str], width: int) -> Callable[[Any], tuple]:
+    """Return a function reading the members of a struct as tuple of width items."""
+
+    padding = (0,) * (width - len(members))
+    if len(members) == 0:
+        return lambda out: padding
+
+    get = attrgetter(*members)
+    if len(members) == 1:
+        return lambda out: (get(out), *padding)
+
+    return lambda out: get(out) + padding
+
+
+def decode_columns(
+    ns: dict[str, Any],
+    structs: list[StructDef],
+    data: bytes | bytearray | memoryview,
+    start: int = 0,
+    end: Optional[int] = None,
+    count: Optional[int] = None,
+) -> DecodedColumns:
+    """Decode a binary image with a generated decoder into columns.
+
+    The decoder must be generated with the batch decoder, which finds the pattern of
+    every instruction. The structs are decoded one instruction after another like in
+    iter_decode, so decoders using their context are supported.
+
+    Args:
+        ns (dict[str, Any]): Namespace of the generated decoder.
+        structs (list[StructDef]): The structs of the decoder, see
+            AssociatedStructRepo.structs. Their order defines the struct indices.
+        data (bytes | bytearray | memoryview): The binary image.
+        start (int): Offset of the first instruction in data.
+        end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+            end of data.
+        count (Optional[int]): Maximum number of instructions to decode.
+
+    Returns:
+        DecodedColumns: The decoded instructions.
+
+    Raises:
+        ValueError: If the decoder has no batch decoder.
+
+    Example:
+        >>> columns = decode_columns(ns, as_repo.structs, data)
+        >>> np.bincount(columns.pattern[columns.pattern >= 0])
+    """
+
+    if "decode_batch" not in ns:
+        raise ValueError("Columnar decoding requires a decoder with batch decoder")
+
+    decode = ns["decode"]
+    decode_batch = ns["decode_batch"]
+    context = ns["Context"]()
+    size_bytes = ns["get_size_eval_bytes"]()
+    decoder_bytes = ns["get_decoder_eval_bytes"]()
+
+    stop = len(data) if end is None else min(end, len(data))
+    capacity = max(stop - start, 0) // max(size_bytes, 1)
+    if count is not None:
+        capacity = min(capacity, count)
+
+    writer = _ColumnWriter(structs, list(ns["PATTERN_NAMES"]), capacity)
+    width = writer.fields_width
+
+    # struct type -> (index, getter returning the members padded to width)
+    struct_info = {
+        ns[struct.name]: (idx, _member_getter(struct.members, width))
+        for idx, struct in enumerate(structs)
+    }
+
+    instrs = iter_instructions(
+        data, ns["decode_size"], size_bytes, decoder_bytes, start, stop
+    )
+    rows = islice(instrs, count)
+    try:
+        while True:
+            chunk = list(islice(rows, CHUNK_ROWS))
+            if len(chunk) == 0:
+                break
+
+            structure = []
+            fields = []
+            for _, _, instr in chunk:
+                out = decode(instr, context=context)
+                idx, getter = struct_info[type(out)]
+                structure.append(idx)
+                fields.append(getter(out))
+
+            address, size, instr = zip(*chunk)
+            instr_array = np.array(instr, dtype=np.uint64)
+            shift = (decoder_bytes - np.array(size, dtype=np.uint64)) * np.uint64(8)
+            writer.append(
+                address,
+                instr_array >> shift,
+                size,
+                decode_batch(instr_array),
+                structure,
+                np.array(fields, dtype=np.int64).reshape(-1, width),
+            )
+    finally:
+        # releases the buffers of data
+        instrs.close()
+
+    return writer.finish()
+
+
+def decode_columns_c(
+    c_decoder: ICDecoder,
+    data: bytes | bytearray | memoryview,
+    start: int = 0,
+    end: Optional[int] = None,
+    count: Optional[int] = None,
+) -> DecodedColumns:
+    """Decode a binary image with a C decoder into columns.
+
+    The records written by the C decoder are copied chunk by chunk into the columns,
+    no Python object is created per instruction.
+
+    Args:
+        c_decoder (ICDecoder): The C decoder.
+        data (bytes | bytearray | memoryview): The binary image.
+        start (int): Offset of the first instruction in data.
+        end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+            end of data.
+        count (Optional[int]): Maximum number of instructions to decode.
+
+    Returns:
+        DecodedColumns: The decoded instructions.
+    """
+
+    structs = [
+        StructDef(name=name, members=members)
+        for name, members in zip(c_decoder.struct_names, c_decoder.struct_members)
+    ]
+
+    stop = len(data) if end is None else min(end, len(data))
+    # the C decoder does not export the minimal instruction size, the arrays grow if
+    # the image holds instructions shorter than two bytes
+    capacity = max(stop - start, 0) // 2
+    if count is not None:
+        capacity = min(capacity, count)
+
+    writer = _ColumnWriter(structs, c_decoder.pattern_names, capacity)
+    width = writer.fields_width
+
+    for adr, records, decoded in c_decoder.iter_record_chunks(data, start, end, count):
+        rec = np.ctypeslib.as_array(records)[:decoded]
+        writer.append(
+            rec["address"] + np.uint64(adr),
+            rec["code"],
+            rec["size"],
+            rec["pattern"],
+            rec["structure"],
+            rec["fields"][:, :width],
+        )
+
+    return writer.finish()
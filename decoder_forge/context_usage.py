@@ -0,0 +1,267 @@
+import ast
+
+from dataclasses import dataclass
+from typing import AbstractSet
+from typing import Iterable
+from typing import Optional
+
+# shifts by larger constants are not safe, their results may exhaust the memory
+MAX_SAFE_SHIFT = 256
+
+# operators which never raise for integers
+_SAFE_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.BitAnd, ast.BitOr, ast.BitXor)
+
+# operators which only raise for a zero right operand
+_DIVISION_OPERATORS = (ast.FloorDiv, ast.Mod)
+
+_SAFE_COMPARISONS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+@dataclass(eq=True, frozen=True)
+class ContextUsage:
+    """Members of the context accessed by generated Python code.
+
+    Attributes:
+        reads (frozenset[str]): Members whose values are read.
+        writes (frozenset[str]): Members which are assigned or deleted.
+        opaque (bool): The context is used other than by accessing its members, for
+            example passed to a function. Then reads and writes may be incomplete.
+    """
+
+    reads: frozenset[str]
+    writes: frozenset[str]
+    opaque: bool
+
+
+def analyse_context_usage(code: str, name: str = "context") -> ContextUsage:
+    """Find the members of the context read and written by Python code.
+
+    Args:
+        code (str): Python source code, for example the transpiled calls of a
+            pattern.
+        name (str): Name of the variable holding the context.
+
+    Returns:
+        ContextUsage: The accessed members.
+
+    Example:
+        >>> analyse_context_usage("if context.istate != 0:\\n    cond = 1")
+        ContextUsage(reads=frozenset({'istate'}), writes=frozenset(), opaque=False)
+    """
+
+    reads: set[str] = set()
+    writes: set[str] = set()
+    member_accesses: set[int] = set()
+
+    tree = ast.parse(code)
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id == name
+        ):
+            continue
+
+        member_accesses.add(id(node.value))
+        if isinstance(node.ctx, ast.Load):
+            reads.add(node.attr)
+        else:
+            writes.add(node.attr)
+
+    opaque = False
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.AugAssign)
+            and isinstance(node.target, ast.Attribute)
+            and id(node.target.value) in member_accesses
+        ):
+            # an augmented assignment reads the member before writing it
+            reads.add(node.target.attr)
+        elif (
+            isinstance(node, ast.Name)
+            and node.id == name
+            and id(node) not in member_accesses
+        ):
+            opaque = True
+
+    return ContextUsage(reads=frozenset(reads), writes=frozenset(writes), opaque=opaque)
+
+
+def _is_int_constant(node: ast.expr) -> bool:
+    return isinstance(node, ast.Constant) and type(node.value) is int
+
+
+def is_safe_expression(
+    node: ast.expr, defined: AbstractSet[str], members: AbstractSet[str] = frozenset()
+) -> bool:
+    """Check that an expression of generated code cannot raise.
+
+    Safe expressions have no side effects either. They may read the given locals and
+    members of the context, int and bool constants, and combine them with the
+    arithmetic, bitwise, comparison and boolean operators. Shifts need a constant
+    shift of at most MAX_SAFE_SHIFT, floor divisions and modulos a non-zero constant
+    divisor.
+
+    Args:
+        node (ast.expr): The expression.
+        defined (AbstractSet[str]): The locals which are assigned for sure.
+        members (AbstractSet[str]): The members of the context.
+
+    Returns:
+        bool: True if evaluating the expression cannot raise.
+    """
+
+    if isinstance(node, ast.Constant):
+        return type(node.value) in (int, bool)
+
+    if isinstance(node, ast.Name):
+        return node.id in defined
+
+    if isinstance(node, ast.Attribute):
+        return (
+            isinstance(node.value, ast.Name)
+            and node.value.id == "context"
+            and node.attr in members
+        )
+
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, (ast.LShift, ast.RShift)):
+            right_ok = (
+                _is_int_constant(node.right) and 0 <= node.right.value <= MAX_SAFE_SHIFT
+            )
+        elif isinstance(node.op, _DIVISION_OPERATORS):
+            right_ok = _is_int_constant(node.right) and node.right.value != 0
+        else:
+            right_ok = isinstance(node.op, _SAFE_OPERATORS) and is_safe_expression(
+                node.right, defined, members
+            )
+        return right_ok and is_safe_expression(node.left, defined, members)
+
+    if isinstance(node, ast.UnaryOp):
+        return is_safe_expression(node.operand, defined, members)
+
+    if isinstance(node, ast.BoolOp):
+        return all(is_safe_expression(i, defined, members) for i in node.values)
+
+    if isinstance(node, ast.Compare):
+        return all(isinstance(i, _SAFE_COMPARISONS) for i in node.ops) and all(
+            is_safe_expression(i, defined, members)
+            for i in [node.left, *node.comparators]
+        )
+
+    if isinstance(node, ast.IfExp):
+        return all(
+            is_safe_expression(i, defined, members)
+            for i in (node.test, node.body, node.orelse)
+        )
+
+    return False
+
+
+def _assigned_block(
+    body: list[ast.stmt], defined: frozenset[str], before: dict[int, frozenset[str]]
+) -> Optional[frozenset[str]]:
+    # the locals assigned for sure after the block, None if it does not fall through
+    for stmt in body:
+        before[id(stmt)] = defined
+        if isinstance(stmt, ast.Assign):
+            defined = defined | {i.id for i in stmt.targets if isinstance(i, ast.Name)}
+        elif isinstance(stmt, ast.If):
+            branches = [
+                i
+                for i in (
+                    _assigned_block(stmt.body, defined, before),
+                    _assigned_block(stmt.orelse, defined, before),
+                )
+                if i is not None
+            ]
+            if len(branches) == 0:
+                return None
+            defined = frozenset.intersection(*branches)
+        elif isinstance(stmt, (ast.Return, ast.Raise)):
+            return None
+    return defined
+
+
+def assigned_before(
+    body: list[ast.stmt], defined: Iterable[str] = ("instr",)
+) -> dict[int, frozenset[str]]:
+    """Find the locals which are assigned for sure before every statement.
+
+    Only assignments and if statements are followed, other compound statements do
+    not assign locals. Unreachable statements have no entry.
+
+    Args:
+        body (list[ast.stmt]): The statements, e.g. the body of a parsed module.
+        defined (Iterable[str]): The locals assigned before the first statement.
+
+    Returns:
+        dict[int, frozenset[str]]: The assigned locals by the id of each statement,
+        including nested ones.
+    """
+
+    before: dict[int, frozenset[str]] = {}
+    _assigned_block(body, frozenset(defined), before)
+    return before
+
+
+def _statement_is_safe(
+    stmt: ast.stmt, defined: frozenset[str], members: frozenset[str]
+) -> bool:
+    # the statement itself cannot raise, nested statements are checked separately
+    if isinstance(stmt, ast.Assign):
+        for target in stmt.targets:
+            context_member = (
+                isinstance(target, ast.Attribute)
+                and isinstance(target.value, ast.Name)
+                and target.value.id == "context"
+            )
+            if not (context_member or isinstance(target, ast.Name)):
+                return False
+        return is_safe_expression(stmt.value, defined, members)
+
+    if isinstance(stmt, ast.AugAssign):
+        value = ast.BinOp(left=stmt.target, op=stmt.op, right=stmt.value)
+        return isinstance(
+            stmt.target, (ast.Name, ast.Attribute)
+        ) and is_safe_expression(value, defined, members)
+
+    if isinstance(stmt, ast.If):
+        return is_safe_expression(stmt.test, defined, members)
+
+    if isinstance(stmt, (ast.Expr, ast.Return)):
+        return stmt.value is None or is_safe_expression(stmt.value, defined, members)
+
+    return isinstance(stmt, ast.Pass)
+
+
+def code_may_raise(code: str, context_members: Iterable[str] = ()) -> bool:
+    """Check if generated Python code may raise or have side effects.
+
+    The code must consist of assignments, if statements and returns whose
+    expressions are safe, see is_safe_expression. A local may only be read where it
+    is assigned for sure. Asserts and calls may raise.
+
+    Args:
+        code (str): Python source code, for example the transpiled calls of a
+            pattern.
+        context_members (Iterable[str]): Members of the context which may be read.
+
+    Returns:
+        bool: False if running the code cannot raise.
+
+    Example:
+        >>> code_may_raise("a = instr >> 4\nb = a // 0")
+        True
+    """
+
+    tree = ast.parse(code)
+    members = frozenset(context_members)
+    before = assigned_before(tree.body)
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.stmt):
+            continue
+        defined = before.get(id(node))
+        if defined is not None and not _statement_is_safe(node, defined, members):
+            return True
+    return False
@@ -0,0 +1,117 @@
+import dataclasses
+import hashlib
+import io
+import json
+import logging
+import sys
+
+from decoder_forge.fingerprint import package_fingerprint
+from decoder_forge.generate_code import generate_code
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.i_decoder_cache import IDecoderCache
+from decoder_forge.i_printer import IPrinter
+from decoder_forge.i_template_engine import ITemplateEngine
+from types import CodeType
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CodePrinter(IPrinter):
+    def __init__(self):
+        self._file_object = io.StringIO()
+
+    def to_string(self):
+        self._file_object.seek(0)
+        return self._file_object.read()
+
+    def print(self, out: str):
+        self._file_object.write(out)
+        self._file_object.write("\n")
+
+    def write(self, out: str):
+        self._file_object.write(out)
+
+    def write_bytes(self, out: bytes):
+        raise ValueError("CodePrinter only collects text")
+
+
+def decoder_cache_key(
+    input_yaml: str | bytes, decoder_width: int, options: GeneratorOptions
+) -> str:
+    """Compute the cache key of a generated decoder.
+
+    The key is a hash over everything the generated decoder depends on: the format,
+    the decoder width, the generator options, the version, sources and templates of
+    decoder-forge and the Python version, which defines the format of code objects.
+
+    Args:
+        input_yaml (str | bytes): A YAML string containing pattern definitions, or a
+            spec compiled with compile_spec.
+        decoder_width (int): The bit width of the decoder.
+        options (GeneratorOptions): Options of the code generator.
+
+    Returns:
+        str: The hexadecimal key.
+    """
+
+    digest = hashlib.sha256()
+    for part in (
+        package_fingerprint(),
+        sys.implementation.cache_tag or sys.version,
+        str(decoder_width),
+        json.dumps(dataclasses.asdict(options), sort_keys=True),
+        input_yaml,
+    ):
+        digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_decoder(
+    tengine: ITemplateEngine,
+    input_yaml: str | bytes,
+    decoder_width: int,
+    options: Optional[GeneratorOptions] = None,
+    cache: Optional[IDecoderCache] = None,
+) -> tuple[str, CodeType]:
+    """Generate and compile a decoder, reusing a cached one if available.
+
+    Args:
+        tengine (ITemplateEngine): Template engine used to generate the decoder.
+        input_yaml (str | bytes): A YAML string containing pattern definitions, or a
+            spec compiled with compile_spec.
+        decoder_width (int): The bit width of the decoder.
+        options (Optional[GeneratorOptions]): Options of the code generator.
+        cache (Optional[IDecoderCache]): Cache of generated decoders. If None, the
+            decoder is always generated.
+
+    Returns:
+        tuple[str, CodeType]: The source code and the compiled code of the decoder.
+
+    Example:
+        >>> source, code = build_decoder(tengine, input_yaml, 32, cache=cache)
+        >>> ns = {}
+        >>> exec(code, ns)
+    """
+
+    if options is None:
+        options = GeneratorOptions()
+
+    key = None
+    if cache is not None:
+        key = decoder_cache_key(input_yaml, decoder_width, options)
+        entry = cache.load(key)
+        if entry is not None:
+            return entry
+
+    code_printer = CodePrinter()
+    generate_code(input_yaml, decoder_width, tengine, code_printer, options)
+    source = code_printer.to_string()
+    code = compile(source, "", "exec")
+
+    if cache is not None:
+        assert key is not None
+        cache.store(key, source, code)
+
+    return source, code
@@ -0,0 +1,236 @@
+from decoder_forge.bit_pattern import BitPattern
+from decoder_forge.pattern_algorithms import DecodeLeaf
+from decoder_forge.pattern_algorithms import DecodeNode
+from decoder_forge.pattern_algorithms import DecodeTree
+from decoder_forge.pattern_algorithms import flatten_decode_tree
+from dataclasses import dataclass
+from typing import Optional
+
+MAX_DISPATCH_BITS = 16
+MAX_CODE_GROWTH = 4.0
+
+
+@dataclass(eq=True, frozen=True)
+class DispatchTable:
+    """Lookup table replacing the root level of a decode tree.
+
+    The table is indexed by the most significant bits of an instruction word. Every
+    entry refers to a bucket, which is the decode tree specialised for all instruction
+    words starting with the entry's index. Entries with identical specialised trees
+    share one bucket.
+
+    Attributes:
+        bits (int): Number of most significant bits used as table index.
+        shift (int): Right shift which moves the index bits of an instruction word to
+            the least significant positions.
+        buckets (list[DecodeTree]): The distinct specialised decode trees.
+        runs (list[tuple[int, int]]): Run-length encoded table. Each tuple holds the
+            number of consecutive entries and the index of the bucket they refer to.
+    """
+
+    bits: int
+    shift: int
+    buckets: list[DecodeTree]
+    runs: list[tuple[int, int]]
+
+
+def _specialise_children(
+    children: list[DecodeNode], known_mask: int, known_bits: int
+) -> list[DecodeNode]:
+    out: list[DecodeNode] = []
+    for child in children:
+        pat = child.pat
+        assert pat is not None
+
+        # child can never match for the known bits
+        if (pat.fixedbits ^ known_bits) & pat.fixedmask & known_mask:
+            continue
+
+        remaining = BitPattern(
+            fixedmask=pat.fixedmask & ~known_mask,
+            fixedbits=pat.fixedbits & ~known_mask,
+            bit_length=pat.bit_length,
+        )
+
+        if isinstance(child, DecodeTree):
+            sub_children = _specialise_children(child.children, known_mask, known_bits)
+
+            if remaining.fixedmask == 0x0 and len(out) == 0:
+                # The check always succeeds and nothing is tested before it. The
+                # children of the subtree take over this level.
+                return sub_children
+
+            out.append(DecodeTree(pat=remaining, uid=child.uid, children=sub_children))
+        else:
+            out.append(DecodeLeaf(pat=remaining, uid=child.uid))
+
+        if remaining.fixedmask == 0x0:
+            # all following siblings are unreachable
+            break
+
+    return out
+
+
+def specialise_decode_tree(
+    tree: DecodeTree, known_mask: int, known_bits: int
+) -> DecodeTree:
+    """Specialise a decode tree for instruction words with partially known bits.
+
+    All nodes which cannot match the known bits are removed and the known bits are
+    removed from the patterns of the remaining nodes. Nodes whose check is always
+    fulfilled make their following siblings unreachable, therefore these siblings are
+    dropped. The result decodes every instruction word matching the known bits exactly
+    like the original tree.
+
+    Args:
+        tree (DecodeTree): The decode tree to specialise.
+        known_mask (int): Bitmask of the known bits.
+        known_bits (int): Values of the known bits.
+
+    Returns:
+        DecodeTree: A new root node holding the specialised children.
+
+    Example:
+        >>> bucket = specialise_decode_tree(tree, known_mask=0xF0, known_bits=0xA0)
+    """
+
+    children = _specialise_children(tree.children, known_mask, known_bits & known_mask)
+    return DecodeTree(pat=None, uid="", children=children)
+
+
+def _tree_key(tree: DecodeTree) -> tuple:
+    if len(tree.children) == 0:
+        return tuple()
+    return tuple(flatten_decode_tree(tree))
+
+
+def _worst_case_compares(children: list[DecodeNode]) -> int:
+    worst = 0
+    for idx, child in enumerate(children, 1):
+        compares = idx
+        if isinstance(child, DecodeTree):
+            compares += _worst_case_compares(child.children)
+        worst = max(worst, compares)
+    return worst
+
+
+def _node_count(children: list[DecodeNode]) -> int:
+    count = 0
+    for child in children:
+        count += 1
+        if isinstance(child, DecodeTree):
+            count += _node_count(child.children)
+    return count
+
+
+def _split_buckets(
+    buckets: list[DecodeTree], bit_pos: int
+) -> tuple[list[DecodeTree], list[tuple[int, int]]]:
+    """Specialise every bucket for the bit at bit_pos being 0 and 1."""
+
+    mask = 1 << bit_pos
+    new_buckets: list[DecodeTree] = []
+    key_to_idx: dict[tuple, int] = {}
+    splits: list[tuple[int, int]] = []
+
+    def intern(tree: DecodeTree) -> int:
+        key = _tree_key(tree)
+        if key not in key_to_idx:
+            key_to_idx[key] = len(new_buckets)
+            new_buckets.append(tree)
+        return key_to_idx[key]
+
+    for bucket in buckets:
+        idx_zero = intern(specialise_decode_tree(bucket, mask, 0x0))
+        idx_one = intern(specialise_decode_tree(bucket, mask, mask))
+        splits.append((idx_zero, idx_one))
+
+    return new_buckets, splits
+
+
+def build_dispatch_table(
+    tree: DecodeTree,
+    decoder_width: int,
+    bits: Optional[int] = None,
+    max_bits: int = MAX_DISPATCH_BITS,
+    max_code_growth: float = MAX_CODE_GROWTH,
+) -> DispatchTable:
+    """Build a lookup table for the first level of a decode tree.
+
+    The table is indexed by the most significant bits of the instruction word. The
+    buckets are computed one index bit after another by specialising the buckets of the
+    previous bit count, so identical subtrees are only processed once.
+
+    If no bit count is given, every bit count up to max_bits is evaluated. The chosen
+    bit count minimizes the mean over all table entries of the worst case number of
+    pattern compares needed after the table lookup. Bit counts whose distinct buckets
+    together hold more than max_code_growth times the nodes of the original tree are
+    rejected. Among equally good bit counts the smallest one is chosen.
+
+    Args:
+        tree (DecodeTree): The root node of the decode tree.
+        decoder_width (int): The bit width of the instruction words.
+        bits (Optional[int]): Number of index bits. If None the generator chooses.
+        max_bits (int): Upper limit for the number of index bits if chosen
+            automatically.
+        max_code_growth (float): Upper limit for the growth of the decoder if the
+            number of index bits is chosen automatically.
+
+    Returns:
+        DispatchTable: The lookup table with its buckets.
+
+    Raises:
+        ValueError: If the number of index bits is not between 1 and decoder_width.
+
+    Example:
+        >>> table = build_dispatch_table(tree, decoder_width=32)
+        >>> table.bits
+        8
+    """
+
+    if bits is not None and not (0 < bits <= decoder_width):
+        raise ValueError("Number of dispatch bits must be between 1 and decoder width")
+
+    limit = bits if bits is not None else min(max_bits, decoder_width)
+    max_nodes = max_code_growth * max(_node_count(tree.children), 1)
+
+    # table[j] is the index of the bucket of entry j
+    buckets = [tree]
+    table = [0]
+    best: Optional[tuple[float, int, list[DecodeTree], list[int]]] = None
+
+    for idx_bits in range(1, limit + 1):
+        buckets, splits = _split_buckets(buckets, decoder_width - idx_bits)
+        table = [splits[i][bit] for i in table for bit in (0, 1)]
+
+        if bits is not None:
+            best = (0.0, idx_bits, buckets, table)
+            continue
+
+        if best is not None and (
+            sum(_node_count(i.children) for i in buckets) > max_nodes
+        ):
+            break
+
+        costs = [_worst_case_compares(i.children) for i in buckets]
+        mean_cost = sum(costs[i] for i in table) / len(table)
+
+        if best is None or mean_cost < best[0]:
+            best = (mean_cost, idx_bits, buckets, table)
+
+    assert best is not None
+    _, chosen_bits, buckets, table = best
+
+    runs: list[tuple[int, int]] = []
+    for bucket_idx in table:
+        if len(runs) != 0 and runs[-1][1] == bucket_idx:
+            runs[-1] = (runs[-1][0] + 1, bucket_idx)
+        else:
+            runs.append((1, bucket_idx))
+
+    return DispatchTable(
+        bits=chosen_bits,
+        shift=decoder_width - chosen_bits,
+        buckets=buckets,
+        runs=runs,
+    )
@@ -0,0 +1,255 @@
+import ctypes
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from decoder_forge.i_c_decoder import ICDecoder
+from decoder_forge.i_c_decoder import ICDecoderBuilder
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# flags building a generated C decoder as shared library
+C_FLAGS = ["-O2", "-std=gnu11", "-fwrapv", "-fPIC", "-shared"]
+
+# bytes decoded by one call of decode_buffer
+CHUNK_BYTES = 0x10000
+
+
+def compile_c_decoder(source: str, library_path: Path, compiler: str = "gcc"):
+    """Build a generated C decoder as shared library.
+
+    The library is written to a temporary file first and moved to library_path, so
+    concurrent builds never load a partially written library.
+
+    Args:
+        source (str): Source code of the C decoder.
+        library_path (Path): Path of the shared library.
+        compiler (str): The C compiler, called like gcc.
+
+    Raises:
+        ValueError: If the compiler is not found or fails.
+    """
+
+    if shutil.which(compiler) is None:
+        raise ValueError(f"C compiler {compiler} not found")
+
+    library_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=library_path.parent) as tmp_dir:
+        source_path = Path(tmp_dir) / "decoder.c"
+        source_path.write_text(source, encoding="utf-8")
+        tmp_library = Path(tmp_dir) / library_path.name
+
+        result = subprocess.run(
+            [compiler, *C_FLAGS, "-o", str(tmp_library), str(source_path)],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise ValueError(f"Compiling the C decoder failed:\n{result.stderr}")
+
+        os.replace(tmp_library, library_path)
+
+    logger.info(f"Built C decoder {library_path}")
+
+
+class CDecoder(ICDecoder):
+    """Python binding of a generated C decoder built as shared library.
+
+    The records match the structs of the Python decoder for the instructions it
+    decodes. Where a pattern reads a local before it is assigned, the Python decoder
+    raises an UnboundLocalError, while the C decoder reads 0 and writes a record.
+
+    Attributes:
+        pattern_names (list[str]): Names of the patterns, indexed by record.pattern.
+        struct_names (list[str]): Names of the structs, indexed by record.structure.
+        struct_members (list[list[str]]): Members of each struct.
+        Record (type): ctypes structure of the records written by decode_buffer.
+
+    Example:
+        >>> decoder = CDecoder("decoder.so")
+        >>> for adr, size, code, out in decoder.iter_decode(data):
+        ...     print(hex(adr), out)
+    """
+
+    def __init__(self, library_path: str | Path):
+        self._lib = ctypes.CDLL(str(library_path))
+
+        def uint32(name: str) -> int:
+            return ctypes.c_uint32.in_dll(self._lib, name).value
+
+        def strings(name: str, count: int) -> list[str]:
+            array = (ctypes.c_char_p * count).in_dll(self._lib, name)
+            return [i.decode("utf-8") for i in array]
+
+        self.pattern_names = strings("df_pattern_names", uint32("df_pattern_count"))
+        struct_count = uint32("df_struct_count")
+        self.struct_names = strings("df_struct_names", struct_count)
+        self.struct_members = [
+            i.split(",") if i != "" else []
+            for i in strings("df_struct_members", struct_count)
+        ]
+
+        class Record(ctypes.Structure):
+            _fields_ = [
+                ("address", ctypes.c_uint64),
+                ("code", ctypes.c_uint64),
+                ("size", ctypes.c_uint32),
+                ("pattern", ctypes.c_int32),
+                ("structure", ctypes.c_int32),
+                ("reserved", ctypes.c_int32),
+                ("fields", ctypes.c_int64 * uint32("df_record_fields")),
+            ]
+
+        if ctypes.sizeof(Record) != uint32("df_record_bytes"):
+            raise ValueError("Record layout of the C decoder does not match")
+
+        self.Record = Record
+        self._context_bytes = uint32("df_context_bytes")
+
+        self._lib.decode_buffer.restype = ctypes.c_size_t
+        self._lib.decode_buffer.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_size_t,
+            ctypes.POINTER(Record),
+            ctypes.c_size_t,
+            ctypes.c_void_p,
+        ]
+
+    def new_context(self) -> ctypes.Array:
+        """Create a zeroed context for decode_buffer."""
+
+        return ctypes.create_string_buffer(self._context_bytes)
+
+    def decode_buffer(
+        self, data: bytes, records: ctypes.Array, context: ctypes.Array
+    ) -> int:
+        """Decode the instructions of data into records.
+
+        Args:
+            data (bytes): The instructions, the first one starts at offset 0.
+            records (ctypes.Array): Array of Record receiving the instructions.
+            context (ctypes.Array): The context, see new_context.
+
+        Returns:
+            int: The number of records written. Decoding stops at the first
+            instruction which does not fit into data.
+        """
+
+        return self._lib.decode_buffer(
+            data, len(data), records, len(records), ctypes.addressof(context)
+        )
+
+    def format_record(self, record) -> str:
+        """Format the struct of a record like the repr of the Python decoder."""
+
+        members = self.struct_members[record.structure]
+        args = ", ".join(f"{i}={record.fields[idx]}" for idx, i in enumerate(members))
+        return f"{self.struct_names[record.structure]}({args})"
+
+    def iter_record_chunks(
+        self,
+        data: bytes | bytearray | memoryview,
+        start: int = 0,
+        end: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> Iterator[tuple[int, ctypes.Array, int]]:
+        """Decode a binary image with the C decoder into chunks of records.
+
+        The image is passed to the library in chunks, all chunks share one context.
+        The addresses of the records are relative to the start of their chunk.
+
+        Args:
+            data (bytes | bytearray | memoryview): The binary image.
+            start (int): Offset of the first instruction in data.
+            end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+                end of data.
+            count (Optional[int]): Maximum number of instructions to decode.
+
+        Yields:
+            tuple[int, ctypes.Array, int]: The offset of the chunk in data, the records
+            and the number of valid records. The array of records is reused for the
+            next chunk.
+        """
+
+        end = len(data) if end is None else min(end, len(data))
+        context = self.new_context()
+        records = (self.Record * CHUNK_BYTES)()
+        remaining = count
+
+        adr = start
+        while adr < end and (remaining is None or remaining > 0):
+            chunk = bytes(data[adr : min(adr + CHUNK_BYTES, end)])
+            decoded = self.decode_buffer(chunk, records, context)
+            if remaining is not None:
+                decoded = min(decoded, remaining)
+                remaining -= decoded
+
+            if decoded == 0:
+                break
+
+            yield adr, records, decoded
+
+            last = records[decoded - 1]
+            adr += last.address + last.size
+
+    def iter_decode(
+        self,
+        data: bytes | bytearray | memoryview,
+        start: int = 0,
+        end: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> Iterator[tuple[int, int, int, str]]:
+        """Decode a binary image with the C decoder.
+
+        Args:
+            data (bytes | bytearray | memoryview): The binary image.
+            start (int): Offset of the first instruction in data.
+            end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+                end of data.
+            count (Optional[int]): Maximum number of instructions to decode.
+
+        Yields:
+            tuple[int, int, int, str]: The address, the size in bytes, the instruction
+            as stored in the image and the formatted struct.
+        """
+
+        for adr, records, decoded in self.iter_record_chunks(data, start, end, count):
+            for idx in range(decoded):
+                record = records[idx]
+                yield (
+                    adr + record.address,
+                    record.size,
+                    record.code,
+                    self.format_record(record),
+                )
+
+
+class CDecoderBuilder(ICDecoderBuilder):
+    """Builds generated C decoders and keeps the libraries in a directory.
+
+    Libraries are named after the hash of their source and the compiler, an unchanged
+    decoder is only built once.
+    """
+
+    def __init__(self, library_dir: Path, compiler: str = "gcc"):
+        self._library_dir = library_dir
+        self._compiler = compiler
+
+    def build(self, source: str) -> CDecoder:
+        digest = hashlib.sha256()
+        digest.update(" ".join([self._compiler, *C_FLAGS]).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(source.encode("utf-8"))
+
+        library_path = self._library_dir / f"{digest.hexdigest()}.so"
+        if not library_path.exists():
+            compile_c_decoder(source, library_path, self._compiler)
+
+        return CDecoder(library_path)
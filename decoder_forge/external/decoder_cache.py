@@ -0,0 +1,93 @@
+import logging
+import marshal
+import os
+
+from decoder_forge.i_decoder_cache import IDecoderCache
+from pathlib import Path
+from types import CodeType
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Return the default directory of the decoder cache.
+
+    The directory is "decoder-forge" below $XDG_CACHE_HOME, or below ~/.cache if the
+    variable is not set.
+    """
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(base).expanduser() / "decoder-forge"
+
+
+class DecoderCache(IDecoderCache):
+    """
+    A decoder cache storing the generated source and its code object in a directory.
+
+    Each entry consists of the files <key>.py holding the source and <key>.marshal
+    holding the marshalled code object. Loading an entry updates its modification
+    time. When the entries together exceed max_bytes after storing a new one, the
+    least recently used entries are removed.
+
+    Example:
+        >>> cache = DecoderCache(default_cache_dir())
+        >>> cache.store(key, source, compile(source, "", "exec"))
+        >>> source, code = cache.load(key)
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._cache_dir = Path(cache_dir)
+        self._max_bytes = max_bytes
+
+    def load(self, key: str) -> Optional[tuple[str, CodeType]]:
+        source_path = self._cache_dir / f"{key}.py"
+        code_path = self._cache_dir / f"{key}.marshal"
+
+        try:
+            source = source_path.read_text(encoding="utf-8")
+            code = marshal.loads(code_path.read_bytes())
+            os.utime(source_path)
+            os.utime(code_path)
+        except (OSError, EOFError, ValueError, TypeError):
+            logger.info(f"Decoder cache miss: {key}")
+            return None
+
+        logger.info(f"Decoder cache hit: {key}")
+        return source, code
+
+    def store(self, key: str, source: str, code: CodeType):
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write(self._cache_dir / f"{key}.py", source.encode("utf-8"))
+            self._write(self._cache_dir / f"{key}.marshal", marshal.dumps(code))
+            self._evict()
+        except OSError as e:
+            # a cache which cannot be written must not stop the decoder
+            logger.warning(f"Decoder cache not written: {e}")
+
+    def _write(self, path: Path, data: bytes):
+        # concurrent readers only see complete files
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        entries: dict[str, list[os.stat_result]] = {}
+        for path in self._cache_dir.iterdir():
+            if path.suffix in (".py", ".marshal"):
+                entries.setdefault(path.stem, []).append(path.stat())
+
+        def last_use(key: str) -> float:
+            return max(i.st_mtime for i in entries[key])
+
+        total = sum(i.st_size for stats in entries.values() for i in stats)
+        for key in sorted(entries, key=last_use):
+            if total <= self._max_bytes:
+                break
+            for suffix in (".py", ".marshal"):
+                (self._cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
+            total -= sum(i.st_size for i in entries[key])
+            logger.info(f"Decoder cache evicted: {key}")
@@ -0,0 +1,66 @@
+import logging
+import marshal
+import os
+
+from decoder_forge.i_fragment_store import IFragmentStore
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FragmentStore(IFragmentStore):
+    """
+    A fragment store persisting generated code fragments in a single file.
+
+    The file is read on first access. flush writes the fragments which were read or
+    added since the store was opened, so fragments of removed or changed code do not
+    accumulate.
+
+    Example:
+        >>> store = FragmentStore("armv7-m.fragments")
+        >>> store.put(key, "flags = 0x0")
+        >>> store.flush()
+    """
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._fragments: Optional[dict[str, str]] = None
+        self._used: dict[str, str] = {}
+        self._modified = False
+
+    def _load(self) -> dict[str, str]:
+        if self._fragments is None:
+            try:
+                fragments = marshal.loads(self._path.read_bytes())
+                assert isinstance(fragments, dict)
+                self._fragments = fragments
+            except (OSError, EOFError, ValueError, TypeError, AssertionError):
+                self._fragments = {}
+        return self._fragments
+
+    def get(self, key: str) -> Optional[str]:
+        fragment = self._load().get(key)
+        if fragment is not None:
+            self._used[key] = fragment
+        return fragment
+
+    def put(self, key: str, fragment: str):
+        self._used[key] = fragment
+        self._modified = True
+
+    def flush(self):
+        if not self._modified and len(self._used) == len(self._load()):
+            return
+
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(marshal.dumps(self._used))
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.warning(f"Fragment store not written: {e}")
+            return
+
+        self._fragments = dict(self._used)
+        self._modified = False
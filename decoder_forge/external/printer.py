@@ -6,7 +6,8 @@ class Printer(IPrinter):
     A simple Printer implementation that writes output to a provided file-like object.
 
     This class implements the IPrinter interface and writes each output string followed
-    by a newline to the specified file object.
+    by a newline to the specified file object. write passes text unchanged, which lets
+    callers format many lines at once and write them with a single call.
 
     Example:
         >>> import sys
@@ -20,3 +21,16 @@ class Printer(IPrinter):
     def print(self, out: str):
         self._file_object.write(out)
         self._file_object.write("\n")
+
+    def write(self, out: str):
+        self._file_object.write(out)
+
+    def write_bytes(self, out: bytes):
+        # text streams like sys.stdout write bytes to their underlying buffer
+        binary = getattr(self._file_object, "buffer", None)
+        if binary is None:
+            self._file_object.write(out)
+            return
+
+        self._file_object.flush()
+        binary.write(out)
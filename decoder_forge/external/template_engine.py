@@ -1,19 +1,70 @@
-from jinja2 import Environment
-from jinja2 import PackageLoader
-from jinja2.utils import select_autoescape
+import functools
 
 from decoder_forge.i_template_engine import ITemplateEngine
+from pathlib import Path
+from typing import Optional
+
+# templates of the supported languages
+TEMPLATES = {
+    "python": "python_decoder.py.jinja",
+    "c": "c_decoder.c.jinja",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _environment(bytecode_cache_dir: Optional[Path]):
+    # jinja2 is imported on first use, commands without templates do not load it
+    from jinja2 import Environment
+    from jinja2 import FileSystemBytecodeCache
+    from jinja2 import PackageLoader
+    from jinja2.utils import select_autoescape
+
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        try:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        except OSError:
+            # e.g. a file in the path, the templates are compiled in every process
+            pass
+
+    return Environment(
+        loader=PackageLoader("decoder_forge"),
+        autoescape=select_autoescape(),
+        bytecode_cache=bytecode_cache,
+    )
 
 
 class TemplateEngine(ITemplateEngine):
-    def __init__(self):
-        self._env = Environment(
-            loader=PackageLoader("decoder_forge"), autoescape=select_autoescape()
+    """Renders the decoder templates of the package with Jinja.
+
+    All engines with the same bytecode cache directory share one Jinja environment,
+    which compiles every template only once per process. With a bytecode cache
+    directory the compiled templates are also kept on disk, so later processes skip
+    parsing and compiling them. If the directory cannot be created, no bytecode
+    cache is used.
+
+    Example:
+        >>> tengine = TemplateEngine(default_cache_dir() / "templates")
+        >>> tengine.load("python")
+        >>> code = tengine.generate(context)
+    """
+
+    def __init__(self, bytecode_cache_dir: Optional[str | Path] = None):
+        self._bytecode_cache_dir = (
+            Path(bytecode_cache_dir) if bytecode_cache_dir is not None else None
         )
 
     def load(self, template_key):
-        # has currently no function other than loading the python template
-        self._template = self._env.get_template("python_decoder.py.jinja")
+        if template_key not in TEMPLATES:
+            raise ValueError(f"No template for language {template_key}")
+
+        env = _environment(self._bytecode_cache_dir)
+        self._template = env.get_template(TEMPLATES[template_key])
 
     def generate(self, context):
         return self._template.render(**context)
+
+    def generate_stream(self, context):
+        # yields the output piece by piece while the template is rendered
+        return self._template.generate(**context)
@@ -0,0 +1,30 @@
+import hashlib
+
+from functools import cache
+from importlib import metadata
+from pathlib import Path
+
+
+@cache
+def package_fingerprint() -> str:
+    """Compute a hash identifying the installed code generator.
+
+    The version alone does not change while developing the generator, therefore the
+    sources and templates of the package are part of the fingerprint.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+
+    try:
+        version = metadata.version("decoder-forge")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+
+    digest = hashlib.sha256(version.encode("utf-8"))
+    package_dir = Path(__file__).parent
+    for path in sorted(package_dir.rglob("*")):
+        if path.suffix in (".py", ".jinja") and "__pycache__" not in path.parts:
+            digest.update(path.relative_to(package_dir).as_posix().encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import re
+
+from decoder_forge.fingerprint import package_fingerprint
+
+_FUNC_REF = re.compile(r"&(\w+)")
+
+
+def call_references(expr: str) -> list[str]:
+    """Return the names of the functions a call expression refers to.
+
+    These are the called function and all functions passed as &name arguments.
+
+    Args:
+        expr (str): A call expression like "extract_bit(msb=5, lsb=&lsb_fun)".
+
+    Returns:
+        list[str]: The referenced function names.
+
+    Example:
+        >>> call_references("append_bitmask(val=flags, bm=&flag_set)")
+        ['append_bitmask', 'flag_set']
+    """
+
+    return [expr.split("(")[0].strip()] + _FUNC_REF.findall(expr)
+
+
+def _ast_references(node) -> list[str]:
+    refs = []
+    if isinstance(node, dict):
+        if node.get("op") == "call" and isinstance(node.get("expr"), str):
+            refs.extend(call_references(node["expr"]))
+        for value in node.values():
+            refs.extend(_ast_references(value))
+    elif isinstance(node, list):
+        for value in node:
+            refs.extend(_ast_references(value))
+    return refs
+
+
+def deffun_closure(expr: str, deffun: dict) -> list[str]:
+    """Collect all deffun functions a call expression depends on.
+
+    Functions are followed through nested call expressions and &name references.
+    Names which are not defined in deffun are ignored.
+
+    Args:
+        expr (str): The call expression.
+        deffun (dict): The function definitions of the format.
+
+    Returns:
+        list[str]: The sorted names of all functions the expression depends on.
+    """
+
+    closure = set()
+    stack = call_references(expr)
+    while len(stack) != 0:
+        name = stack.pop()
+        if name in closure or name not in deffun:
+            continue
+        closure.add(name)
+        stack.extend(_ast_references(deffun[name]))
+    return sorted(closure)
+
+
+def fragment_key(expr: str, deffun: dict) -> str:
+    """Compute the key of the code generated for a call expression.
+
+    The key changes whenever the expression, one of the functions it depends on or
+    the code generator changes.
+
+    Args:
+        expr (str): The call expression.
+        deffun (dict): The function definitions of the format.
+
+    Returns:
+        str: The hexadecimal key.
+    """
+
+    digest = hashlib.sha256()
+    digest.update(package_fingerprint().encode("utf-8"))
+    digest.update(expr.encode("utf-8"))
+    for name in deffun_closure(expr, deffun):
+        digest.update(b"\0")
+        digest.update(name.encode("utf-8"))
+        digest.update(json.dumps(deffun[name], sort_keys=True, default=str).encode())
+    return digest.hexdigest()
@@ -1,22 +1,56 @@
+import ast
+import functools
 import logging
-import yaml
+import sys
 
 from decoder_forge.bit_pattern import BitPattern
 from decoder_forge.associated_struct_repo import AssociatedStructRepo
-from decoder_forge.transpiller import transpill
+from decoder_forge.associated_struct_repo import StructDef
+from decoder_forge.hoisting import drop_statements
+from decoder_forge.hoisting import hoist_leading_statements
+from decoder_forge.pattern_optimiser import optimise_pattern
+from decoder_forge.pattern_optimiser import unparse_pattern
+from decoder_forge.transpiller import transpill_ast
+from decoder_forge.transpiller import VisitorC
+from decoder_forge.transpiller import VisitorPython
 from decoder_forge.pattern_algorithms import (
+    DECODE_TREE_BUILDERS,
+    UID,
     build_decode_tree_by_fixed_bits,
     flatten_decode_tree,
+    reorder_decode_tree_by_hits,
 )
-from copy import deepcopy
 from decoder_forge.pattern_algorithms import DecodeLeaf
+from decoder_forge.pattern_algorithms import DecodeNode
 from decoder_forge.pattern_algorithms import DecodeTree
 from uuid import uuid1
 from decoder_forge.i_printer import IPrinter
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.generator_options import STRUCT_STYLES
+from decoder_forge.fragments import fragment_key
+from decoder_forge.i_fragment_store import IFragmentStore
+from decoder_forge.dispatch_table import build_dispatch_table
+from decoder_forge.context_usage import analyse_context_usage
+from decoder_forge.context_usage import assigned_before
+from decoder_forge.context_usage import code_may_raise
+from decoder_forge.size_table import build_size_table
+from decoder_forge.spec_ir import load_spec
+from decoder_forge.spec_ir import pattern_list
+from decoder_forge.size_table import MAX_SIZE_TABLE_BITS
+from dataclasses import dataclass
+from functools import lru_cache
 from math import ceil
+from typing import Callable
+from typing import cast
+from typing import Hashable
+from typing import Iterable
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# names of the decode function of the C backend which cannot be used as locals
+C_RESERVED_NAMES = frozenset({"instr", "context", "rec"})
+
 
 class OutPrinter(IPrinter):
 
@@ -26,170 +60,351 @@ class OutPrinter(IPrinter):
     def print(self, out: str):
         print(out)
 
+    def write(self, out: str):
+        sys.stdout.write(out)
 
-def create_or_get_duid(guid, f_guid_to_data, duid_to_data):
-
-    if guid in duid_to_data:
-        data_entry = duid_to_data[guid]
-    else:
-        data_entry = f_guid_to_data(guid)
+    def write_bytes(self, out: bytes):
+        sys.stdout.flush()
+        sys.stdout.buffer.write(out)
 
-    data_to_duid = {v: k for k, v in duid_to_data.items()}
-    duid = data_to_duid.get(data_entry, uuid1())
-    duid_to_data[duid] = duid_to_data.get(duid, data_entry)
-    return duid
 
+class DataIndex:
+    """Interns data values and assigns one uid to every distinct value.
 
-def minimalize_tree(pat, children, f_guid_to_data, duid_to_data):
+    Attributes:
+        duid_to_data (dict[UID, Any]): Maps the uid of each data value to the value.
+    """
 
-    duid_list = []
-    for i in children:
-        duid = create_or_get_duid(i.uid, f_guid_to_data, duid_to_data)
-        duid_list.append(duid)
+    def __init__(self, f_guid_to_data: Callable[[UID], Hashable]):
+        self._f_guid_to_data = f_guid_to_data
+        self._data_to_duid: dict[Hashable, UID] = dict()
+        self.duid_to_data: dict[UID, Hashable] = dict()
 
-    duid_set = set(duid_list)
-    if len(duid_set) <= 1:
-        duid = duid_list[0]
-        return DecodeLeaf(pat=pat, uid=duid)
+    def duid(self, guid: UID) -> UID:
+        """Return the uid of the data value belonging to a pattern uid."""
 
-    children = deepcopy(children)
-    return DecodeTree(pat=pat, uid="", children=children)
+        data_entry = self._f_guid_to_data(guid)
+        duid = self._data_to_duid.get(data_entry)
+        if duid is None:
+            duid = uuid1()
+            self._data_to_duid[data_entry] = duid
+            self.duid_to_data[duid] = data_entry
+        return duid
 
 
-def minimalize_tree_with_data_algo(tree, f_guid_to_data, duid_to_data=dict()):
-    children = []
+def _minimalize_tree_with_data(tree: DecodeTree, index: DataIndex) -> DecodeNode:
+    children: list[DecodeNode] = []
     for item in tree.children:
         if isinstance(item, DecodeTree):
-            tree_item = minimalize_tree_with_data_algo(
-                item, f_guid_to_data, duid_to_data
-            )
-            children.append(tree_item)
+            children.append(_minimalize_tree_with_data(item, index))
         else:
-            duid = create_or_get_duid(item.uid, f_guid_to_data, duid_to_data)
-            tree_item = DecodeLeaf(pat=item.pat, uid=duid)
-            children.append(tree_item)
+            children.append(DecodeLeaf(pat=item.pat, uid=index.duid(item.uid)))
 
-    if all([isinstance(i, DecodeLeaf) for i in children]):
-        return minimalize_tree(tree.pat, children, f_guid_to_data, duid_to_data)
-    else:
-        return DecodeTree(pat=tree.pat, uid="", children=children)
+    # a subtree whose leaves all lead to the same data is replaced by one leaf
+    if all(isinstance(i, DecodeLeaf) for i in children):
+        duids = {i.uid for i in children}
+        if len(duids) <= 1:
+            # the pattern is None for the root, such a leaf is discarded by the caller
+            return DecodeLeaf(pat=cast(BitPattern, tree.pat), uid=children[0].uid)
 
+    return DecodeTree(pat=tree.pat, uid="", children=children)
 
-def minimalize_tree_with_data(tree, f_guid_to_data):
-    duid_to_data = dict()
-    data_tree = minimalize_tree_with_data_algo(tree, f_guid_to_data, duid_to_data)
+
+def minimalize_tree_with_data(
+    tree: DecodeTree, f_guid_to_data: Callable[[UID], Hashable]
+) -> tuple[Optional[DecodeTree], dict[UID, Hashable]]:
+    """Reduce a decode tree to a tree deciding a data value of the patterns.
+
+    Every leaf is relabeled with the uid of its data value. Subtrees whose leaves all
+    have the same data value are replaced by a single leaf. The tree is rewritten in
+    one pass and each data value is interned once, so the runtime is linear in the
+    number of nodes.
+
+    Args:
+        tree (DecodeTree): The root node of the decode tree.
+        f_guid_to_data (Callable[[UID], Hashable]): Returns the data value of a
+            pattern uid.
+
+    Returns:
+        tuple[Optional[DecodeTree], dict[UID, Hashable]]: The reduced tree, None if
+        all patterns have the same data value, and the data value of each uid.
+    """
+
+    index = DataIndex(f_guid_to_data)
+    data_tree = _minimalize_tree_with_data(tree, index)
 
     # all patterns match
     if isinstance(data_tree, DecodeLeaf):
-        return None, duid_to_data
+        return None, index.duid_to_data
 
-    return data_tree, duid_to_data
+    return cast(DecodeTree, data_tree), index.duid_to_data
 
 
-def call_expression(expr, placeholders=dict(), deffun=dict()):
+@lru_cache(maxsize=None)
+def _parse_call_expression(expr: str) -> tuple[str, tuple[tuple[str, str], ...]]:
     funname, rest = expr.split("(")
     rest = rest.strip(")")
-    args = rest.split(",")
-    arg_dict = dict()
-
-    def call_short(expr, placeholders=dict()):
-        # wraps deffun
-        return call_expression(expr, placeholders=placeholders, deffun=deffun)
-
-    for a in args:
+    args = []
+    for a in rest.split(","):
         if "=" not in a:
             continue
         dname, val = a.split("=")
-        dname = dname.strip()
-        val = val.strip()
-        if val.startswith("$"):
-            ph = val.strip("$")
-            if ph in placeholders:
-                arg_dict[dname] = placeholders[ph]
-        else:
-            if val.startswith("&") and val[1:] in deffun:
+        args.append((dname.strip(), val.strip()))
+    return funname, tuple(args)
+
+
+class CallTranspiler:
+    """Transpiles call expressions of the functions defined in deffun.
+
+    The code of a call only depends on the called function and its bound arguments,
+    therefore it is memoised by both. Placeholder arguments are bound to their values,
+    all other arguments to their text.
+
+    Attributes:
+        visitor (VisitorPython): The visitor generating the code.
+
+    Example:
+        >>> transpile_call = CallTranspiler(deffun)
+        >>> transpile_call("extract_bit(msb=5, lsb=3)")
+        '(instr >> 3) & 0x7'
+    """
+
+    def __init__(
+        self,
+        deffun: dict,
+        visitor_factory: Callable[..., VisitorPython] = VisitorPython,
+    ):
+        """Initializes the CallTranspiler.
+
+        Args:
+            deffun (dict): The functions of the format.
+            visitor_factory (Callable[..., VisitorPython]): Creates the visitor, called
+                with the keyword argument call. Defaults to VisitorPython.
+        """
+
+        self._deffun = deffun
+        self._memo: dict[tuple, str] = dict()
+        self.visitor = visitor_factory(call=self)
+
+    def __call__(self, expr: str, placeholders: dict[str, str] = dict()) -> str:
+        funname, args = _parse_call_expression(expr)
+
+        bound = []
+        for dname, val in args:
+            if val.startswith("$"):
+                ph = val.strip("$")
+                if ph in placeholders:
+                    bound.append((dname, True, placeholders[ph]))
+            else:
+                bound.append((dname, False, val))
+
+        key = (funname, tuple(bound))
+        if key in self._memo:
+            return self._memo[key]
+
+        arg_dict: dict[str, str] = dict()
+        for dname, is_placeholder, val in bound:
+            if not is_placeholder and val.startswith("&") and val[1:] in self._deffun:
                 val_func = val.strip("&")
-                func_ast_arg = deffun[val_func]
-                func_res = transpill(
-                    yaml_ast=yaml.dump(func_ast_arg),
-                    placeholders=arg_dict,
-                    call=call_short,
+                arg_dict[dname] = transpill_ast(
+                    self._deffun[val_func], placeholders=arg_dict, visitor=self.visitor
                 )
-                arg_dict[dname] = func_res
             else:
                 arg_dict[dname] = val
 
-    func_ast = deffun[funname]
-    return transpill(
-        yaml_ast=yaml.dump(func_ast), placeholders=arg_dict, call=call_short
-    )
+        code = transpill_ast(
+            self._deffun[funname], placeholders=arg_dict, visitor=self.visitor
+        )
+        self._memo[key] = code
+        return code
 
 
-def generate_code(input_yaml, decoder_width, tengine, printer):
-    """Generates and outputs decoder code in based on bit-patterns defined in a YAML
-    string.
+def call_expression(expr, placeholders=dict(), deffun=dict()):
+    return CallTranspiler(deffun)(expr, placeholders)
 
-    This function parses a YAML input to extract bit pattern definitions, builds a
-    decode tree based on fixed bit widths, and flattens the decode tree for easier
-    handling. It also creates associated structures and a context dictionary that
-    includes various helper functions and mappings. Lastly, it loads a language template
-    using the provided template engine (tengine) to generate the final code, which is
-    then printed line-by-line using the provided printer object.
+
+def c_statement(code: str) -> str:
+    """Terminate C code used as statement with a semicolon if it is an expression."""
+
+    if code.rstrip().endswith((";", "}", "*/")):
+        return code
+    return code + ";"
+
+
+def pat_calls_code(pat_def: dict, call_expr: Callable[[str], str]) -> str:
+    """Transpile the calls of a pattern definition into one piece of code.
 
     Args:
-        input_yaml (str): A YAML string containing pattern definitions and additional
-           context.
-        decoder_width (int): The bit width to be used when constructing the decode tree.
-        tengine (ITemplateEngine): A template engine instance used to generate code.
-        printer (IPrinter): An output printer instance responsible for printing each
-           line of the generated code.
+        pat_def (dict): The definition of the pattern in the format description.
+        call_expr (Callable[[str], str]): Transpiles a single call.
+
+    Returns:
+        str: The code of all calls, empty if the pattern has none.
+    """
+
+    return "\n".join(call_expr(i) for i in pat_def.get("call", []))
+
+
+def pattern_memo_key(code: str) -> Optional[tuple[str, ...]] | bool:
+    """Decide how the decode result of a pattern is cached.
+
+    Args:
+        code (str): The transpiled calls of the pattern.
+
+    Returns:
+        Optional[tuple[str, ...]] | bool: None if the result does not depend on the
+        context, False if it must not be cached because the calls modify the context
+        or use it other than by reading its members, otherwise the sorted names of
+        the members read.
+    """
+
+    if code == "":
+        return None
+
+    usage = analyse_context_usage(code)
+    if usage.opaque or len(usage.writes) != 0:
+        return False
+    if len(usage.reads) == 0:
+        return None
+    return tuple(sorted(usage.reads))
+
+
+def pattern_is_lazy(code: str, members: Iterable[str] = ()) -> bool:
+    """Decide if the members of a pattern's struct can be computed on first access.
+
+    The calls are deferred if they only depend on the instruction word, cannot
+    raise, see code_may_raise, and assign every member of the struct for sure. Calls
+    using the context or returning early, which may change the returned struct, and
+    calls which may raise, e.g. asserts or reads of unassigned members, are run when
+    the instruction is decoded.
+
+    Args:
+        code (str): The transpiled calls of the pattern.
+        members (Iterable[str]): The members of the pattern's struct.
+
+    Returns:
+        bool: True if the calls can be deferred.
+    """
+
+    if code == "":
+        return False
+
+    usage = analyse_context_usage(code)
+    if usage.opaque or len(usage.reads) != 0 or len(usage.writes) != 0:
+        return False
+    if code_may_raise(code):
+        return False
+
+    tree = ast.parse(code)
+    if any(isinstance(i, ast.Return) for i in ast.walk(tree)):
+        return False
+
+    # the locals assigned for sure after the last statement
+    end = ast.Pass()
+    assigned = assigned_before(tree.body + [end]).get(id(end), frozenset())
+    return all(i in assigned for i in members)
+
+
+def load_format(input_yaml: str | bytes) -> dict:
+    """Parse a format description and add the missing top level sections.
+
+    Args:
+        input_yaml (str | bytes): A YAML string containing pattern definitions and
+           additional context, or a spec compiled with compile_spec.
+
+    Returns:
+        dict: The parsed format with the sections "context", "patterns", "struct_def"
+        and "deffun".
 
     Raises:
         yaml.YAMLError: If the input YAML cannot be parsed.
-        Exception: For any unexpected errors that occur during pattern processing or
-           code generation.
-
-    Example:
-        >>> yaml_input = '''
-        ... context: {}
-        ... patterns:
-        ...   '1010': {name: "BitPatternA"}
-        ... struct_def: {}
-        ... deffun: {}
-        ... '''
-        >>> generate_code(yaml_input, 16, my_template_engine, my_printer)
+        ValueError: If a compiled spec is invalid.
     """
 
-    logger.info("Call: generate_code")
-    ins = yaml.load(input_yaml, Loader=yaml.Loader)
+    return load_spec(input_yaml)
 
-    if ins is None:
-        ins = {}
 
-    if "context" not in ins:
-        ins["context"] = dict()
+def load_structs(input_yaml: str | bytes) -> list[StructDef]:
+    """Return the structs of a format description in the order of the decoders.
 
-    if "patterns" not in ins:
-        ins["patterns"] = dict()
+    Args:
+        input_yaml (str | bytes): A YAML string containing pattern definitions, or a
+            spec compiled with compile_spec.
 
-    if "struct_def" not in ins:
-        ins["struct_def"] = dict()
+    Returns:
+        list[StructDef]: The structs including the internal Undef struct, see
+        AssociatedStructRepo.build.
+    """
+
+    ins = load_format(input_yaml)
+    as_repo = AssociatedStructRepo.build(
+        struct_def=ins["struct_def"],
+        pat_repo={pat: ins["patterns"][key] for key, pat in pattern_list(ins)},
+    )
+    return as_repo.structs
+
+
+@dataclass
+class DecoderModel:
+    """Language independent description of a decoder.
+
+    Attributes:
+        ins (dict): The parsed format description (see load_format).
+        decoder_width (int): The bit width of the decoded instruction words.
+        pat_repo (dict[BitPattern, dict]): Maps each pattern to its definition.
+        uid_to_pat (dict[UID, BitPattern]): Maps the uid of each pattern to the pattern.
+        as_repo (AssociatedStructRepo): The structs and their assignment to patterns.
+        decode_tree (Optional[DecodeTree]): The decode tree, None without patterns.
+        size_tree (Optional[DecodeTree]): The minimized tree deciding the size of an
+            instruction, None if all instructions have the same size.
+        size_dict (dict[UID, int]): Maps the uids of the size tree to sizes in bits.
+        default_size (int): Size returned if the size tree does not match.
+        needed_bytes_for_size_eval (int): Bytes needed to decide the size.
+        needed_bytes_for_code_eval (int): Bytes of a decoded instruction word.
+        sliced_flat_size_tree (list): The flattened size tree, with patterns cut to
+            the bytes needed to decide the size.
+    """
+
+    ins: dict
+    decoder_width: int
+    pat_repo: dict[BitPattern, dict]
+    uid_to_pat: dict[UID, BitPattern]
+    as_repo: AssociatedStructRepo
+    decode_tree: Optional[DecodeTree]
+    size_tree: Optional[DecodeTree]
+    size_dict: dict[UID, int]
+    default_size: int
+    needed_bytes_for_size_eval: int
+    needed_bytes_for_code_eval: int
+    sliced_flat_size_tree: list
+
+
+def build_decoder_model(
+    ins: dict, decoder_width: int, options: GeneratorOptions
+) -> DecoderModel:
+    """Build the decode tree and the size tree of a format description.
 
-    if "deffun" not in ins:
-        ins["deffun"] = dict()
+    Args:
+        ins (dict): The parsed format description (see load_format).
+        decoder_width (int): The bit width to be used when constructing the decode tree.
+        options (GeneratorOptions): Options of the code generator.
+
+    Returns:
+        DecoderModel: The decoder model.
+
+    Raises:
+        ValueError: If patterns are longer than decoder_width or if the size of an
+           instruction cannot be decided with the bytes of the shortest pattern.
+    """
 
     # build pattern list
-    pats = [BitPattern.parse_pattern(str(pat)) for pat, dct in ins["patterns"].items()]
+    pattern_keys = pattern_list(ins)
+    pats = [pat for _, pat in pattern_keys]
 
     # build pattern repo
-    pat_repo = {
-        BitPattern.parse_pattern(str(pat)): dct for pat, dct in ins["patterns"].items()
-    }
+    pat_repo = {pat: ins["patterns"][key] for key, pat in pattern_keys}
 
-    uid_to_pat = {
-        uuid1(): BitPattern.parse_pattern(str(pat))
-        for pat, dct in ins["patterns"].items()
-    }
+    uid_to_pat = {uuid1(): pat for pat in pats}
     pat_to_uid = {v: k for k, v in uid_to_pat.items()}
 
     # associated structs
@@ -197,8 +412,6 @@ def generate_code(input_yaml, decoder_width, tengine, printer):
         struct_def=ins["struct_def"], pat_repo=pat_repo
     )
 
-    context = ins["context"]
-
     # build decode tree
     pats_with_uid = [(i, pat_to_uid[i]) for i in pats]
 
@@ -210,18 +423,23 @@ def generate_code(input_yaml, decoder_width, tengine, printer):
         if max_decoder_bits > decoder_width:
             raise ValueError("Patterns are to long for given decoder width")
 
-        decode_tree = build_decode_tree_by_fixed_bits(
-            pats_with_uid, decoder_width=decoder_width
-        )
-        flat_decode_tree = flatten_decode_tree(decode_tree)
+        build_decode_tree = DECODE_TREE_BUILDERS[options.tree_builder]
+        decode_tree = build_decode_tree(pats_with_uid, decoder_width=decoder_width)
+
+        if options.pattern_hits is not None:
+            uid_hits = {
+                uid: options.pattern_hits.get(str(pat), 0)
+                for uid, pat in uid_to_pat.items()
+            }
+            decode_tree = reorder_decode_tree_by_hits(decode_tree, uid_hits)
     else:
         decoder_width = 0
         max_decoder_bits = 0
         min_decoder_bits = 0
 
         decode_tree = None
-        flat_decode_tree = list()
 
+    size_tree = None
     sliced_flat_size_tree = list()
     size_dict = dict()
     default_size = decoder_width
@@ -231,8 +449,16 @@ def generate_code(input_yaml, decoder_width, tengine, printer):
     # only build size tree if decode tree was created
     if decode_tree is not None:
 
+        # the fixed bits tree decides the size of words matching no pattern like the
+        # instruction set, other builders may split such words differently
+        size_source_tree = decode_tree
+        if options.tree_builder != "fixed_bits":
+            size_source_tree = build_decode_tree_by_fixed_bits(
+                pats_with_uid, decoder_width=decoder_width
+            )
+
         size_tree, size_dict = minimalize_tree_with_data(
-            decode_tree, lambda guid: uid_to_pat[guid].bit_length
+            size_source_tree, lambda guid: uid_to_pat[guid].bit_length
         )
 
         def uid_to_size(uid):
@@ -263,27 +489,354 @@ def generate_code(input_yaml, decoder_width, tengine, printer):
             # with an existing size decoder the default is always wrong
             default_size = 0
 
-    tengine.load("python")
+    return DecoderModel(
+        ins=ins,
+        decoder_width=decoder_width,
+        pat_repo=pat_repo,
+        uid_to_pat=uid_to_pat,
+        as_repo=as_repo,
+        decode_tree=decode_tree,
+        size_tree=size_tree,
+        size_dict=size_dict,
+        default_size=default_size,
+        needed_bytes_for_size_eval=needed_bytes_for_size_eval,
+        needed_bytes_for_code_eval=needed_bytes_for_code_eval,
+        sliced_flat_size_tree=sliced_flat_size_tree,
+    )
+
+
+def generate_code(
+    input_yaml,
+    decoder_width,
+    tengine,
+    printer,
+    options: Optional[GeneratorOptions] = None,
+    fragments: Optional[IFragmentStore] = None,
+):
+    """Generates and outputs decoder code in based on bit-patterns defined in a YAML
+    string.
+
+    This function parses a YAML input to extract bit pattern definitions, builds a
+    decode tree based on fixed bit widths, and flattens the decode tree for easier
+    handling. It also creates associated structures and a context dictionary that
+    includes various helper functions and mappings. Lastly, it loads a language template
+    using the provided template engine (tengine) to generate the final code, which is
+    then printed line-by-line using the provided printer object.
+
+    Args:
+        input_yaml (str | bytes): A YAML string containing pattern definitions and
+           additional context, or a spec compiled with compile_spec.
+        decoder_width (int): The bit width to be used when constructing the decode tree.
+        tengine (ITemplateEngine): A template engine instance used to generate code.
+        printer (IPrinter): An output printer instance responsible for printing each
+           line of the generated code.
+        options (Optional[GeneratorOptions]): Options controlling the shape of the
+           generated decoder. Defaults to GeneratorOptions().
+        fragments (Optional[IFragmentStore]): Store of the code generated for the
+           calls of the patterns. Calls whose functions did not change since the store
+           was filled are not transpiled again. The caller flushes the store.
+
+    Raises:
+        yaml.YAMLError: If the input YAML cannot be parsed.
+        ValueError: If a batch decoder or a C decoder is requested for more than 64
+           bits, if the C decoder is combined with unsupported options, if the
+           size of the decode cache is negative or if the struct style is unknown
+           or combined with an option it does not support.
+        Exception: For any unexpected errors that occur during pattern processing or
+           code generation.
+
+    Example:
+        >>> yaml_input = '''
+        ... context: {}
+        ... patterns:
+        ...   '1010': {name: "BitPatternA"}
+        ... struct_def: {}
+        ... deffun: {}
+        ... '''
+        >>> generate_code(yaml_input, 16, my_template_engine, my_printer)
+    """
+
+    logger.info("Call: generate_code")
+
+    if options is None:
+        options = GeneratorOptions()
+
+    ins = load_format(input_yaml)
+    model = build_decoder_model(ins, decoder_width, options)
+
+    flat_decode_tree = list()
+    if model.decode_tree is not None:
+        flat_decode_tree = flatten_decode_tree(model.decode_tree)
+
+    dispatch_table = None
+    dispatch_flat_buckets = list()
+
+    # only build a dispatch table if there is a decode tree to dispatch into
+    if options.dispatch_table and model.decode_tree is not None:
+        dispatch_table = build_dispatch_table(
+            model.decode_tree,
+            decoder_width=model.decoder_width,
+            bits=options.dispatch_bits,
+        )
+        dispatch_flat_buckets = [flatten_decode_tree(i) for i in dispatch_table.buckets]
+        logger.info(
+            f"Dispatch table: {dispatch_table.bits} bits, "
+            + f"{len(dispatch_table.buckets)} buckets"
+        )
+
+    size_table = None
+
+    # a size table only replaces an existing size tree
+    if options.size_table and model.size_tree is not None:
+        size_bits = model.needed_bytes_for_size_eval * 8
+        if size_bits > min(MAX_SIZE_TABLE_BITS, model.decoder_width):
+            logger.warning(
+                f"Size table would be indexed by {size_bits} bits, "
+                + "generating the size tree instead"
+            )
+        else:
+            size_table = build_size_table(
+                model.size_tree,
+                model.size_dict,
+                model.default_size,
+                decoder_width=model.decoder_width,
+                bits=size_bits,
+            )
+            logger.info(f"Size table: {size_bits} bits, {len(size_table.runs)} runs")
+
+    if options.batch_decoder and model.decoder_width > 64:
+        raise ValueError("Batch decoder supports decoder widths up to 64 bits")
+
+    if options.memo_size < 0:
+        raise ValueError("Size of the decode cache must not be negative")
+
+    if options.struct_style not in STRUCT_STYLES:
+        raise ValueError(f"Unknown struct style {options.struct_style}")
+
+    if options.lazy_structs and options.struct_style != "dataclass":
+        raise ValueError("Lazy structs cannot be combined with a struct style")
+
+    if options.memo_size != 0 and options.struct_style == "slots":
+        raise ValueError("The decode cache cannot share mutable slots structs")
+
+    if options.language == "c":
+        if model.decoder_width > 64:
+            raise ValueError("The C backend supports decoder widths up to 64 bits")
+
+        unsupported = [
+            name
+            for name, used in (
+                ("dispatch_table", options.dispatch_table),
+                ("batch_decoder", options.batch_decoder),
+                ("size_table", options.size_table),
+                ("memo_size", options.memo_size != 0),
+                ("lazy_structs", options.lazy_structs),
+                ("struct_style", options.struct_style != "dataclass"),
+                ("optimise", options.optimise),
+                ("hoist_calls", options.hoist_calls),
+            )
+            if used
+        ]
+        if len(unsupported) != 0:
+            raise ValueError(
+                f"The C backend does not support the options {', '.join(unsupported)}"
+            )
+
+    pattern_names = [
+        model.pat_repo[pat].get("name", str(pat)) for pat in model.uid_to_pat.values()
+    ]
+    pattern_ids = {uid: idx for idx, uid in enumerate(model.uid_to_pat)}
+
+    tengine.load(options.language)
+
+    visitor_factory: Callable[..., VisitorPython] = VisitorPython
+    if options.language == "c":
+        struct_names = [i.name for i in model.as_repo.structs]
+        visitor_factory = functools.partial(VisitorC, struct_names=struct_names)
+
+        # the fragments do not record the locals assigned by the C code
+        fragments = None
+
+    transpile_call = CallTranspiler(ins["deffun"], visitor_factory)
 
     def call_expr(expr, placeholders=dict()):
         # wraps deffun
-        deffun = ins["deffun"]
-        return call_expression(expr, placeholders=placeholders, deffun=deffun)
+        if fragments is None or len(placeholders) != 0:
+            return transpile_call(expr, placeholders)
+
+        key = fragment_key(expr, ins["deffun"])
+        fragment = fragments.get(key)
+        if fragment is None:
+            fragment = transpile_call(expr, placeholders)
+            fragments.put(key, fragment)
+        return fragment
+
+    pattern_code_memo: dict = {}
+    eliminated: dict = {}
+
+    def pattern_code(pat) -> str:
+        # the code of the calls of a pattern, optimised if requested
+        if pat in pattern_code_memo:
+            return pattern_code_memo[pat]
+
+        code = pat_calls_code(model.pat_repo[pat], call_expr)
+        if options.optimise and code != "":
+            struct = model.as_repo.pat_to_struct[pat]
+            live_out = [] if struct.name == "Undef" else struct.members
+            members = ins["context"].get("members", [])
+            optimised = optimise_pattern(ast.parse(code), live_out, members)
+            eliminated[pat] = optimised.eliminated
+            code = unparse_pattern(optimised.tree)
+
+        pattern_code_memo[pat] = code
+        return code
+
+    def pattern_lines(pat) -> list[str]:
+        # the lines of the calls of a pattern
+        if len(model.pat_repo[pat].get("call", [])) == 0:
+            return []
+        return pattern_code(pat).split("\n")
+
+    if options.optimise:
+        for pat in model.uid_to_pat.values():
+            pattern_code(pat)
+            if eliminated.get(pat, 0) != 0:
+                logger.info(
+                    f"Optimiser: eliminated {eliminated[pat]} operations of pattern "
+                    + f"{model.pat_repo[pat].get('name', str(pat))}"
+                )
+        logger.info(
+            f"Optimiser: eliminated {sum(eliminated.values())} operations of "
+            + f"{len(eliminated)} patterns with calls"
+        )
+
+    memo_keys = None
+    if options.memo_size != 0:
+        memo_keys = [
+            pattern_memo_key(pattern_code(pat)) for pat in model.uid_to_pat.values()
+        ]
+        logger.info(
+            f"Decode cache: {memo_keys.count(None)} of {len(memo_keys)} patterns "
+            + "do not depend on the context, "
+            + f"{memo_keys.count(False)} are not cached"
+        )
+
+    lazy_fields = None
+    if options.lazy_structs:
+        lazy_fields = {}
+        for uid, pat in model.uid_to_pat.items():
+            struct = model.as_repo.pat_to_struct[pat]
+            if struct.name == "Undef" or len(struct.members) == 0:
+                continue
+
+            code = pattern_code(pat)
+            if pattern_is_lazy(code, struct.members):
+                lazy_fields[pattern_ids[uid]] = code
+        logger.info(
+            f"Lazy structs: {len(lazy_fields)} of {len(pattern_ids)} patterns "
+            + "compute their members on first access"
+        )
+
+    hoisted_statements = 0
+
+    def decode_lines(flat_tree) -> tuple[list[str], list[list[str]]]:
+        # called by the template, the lines emitted before the decode tree and
+        # after the test of every item of the flattened tree
+        nonlocal hoisted_statements
+
+        lines: list[list[str]] = []
+        codes: list[Optional[str]] = []
+        for _, uid, _, _, _ in flat_tree:
+            pat = model.uid_to_pat.get(uid)
+            if pat is None:
+                lines.append([])
+                codes.append(None)
+            elif lazy_fields is not None and pattern_ids[uid] in lazy_fields:
+                lines.append([])
+                codes.append("")
+            else:
+                lines.append(pattern_lines(pat))
+                codes.append("\n".join(lines[-1]))
+
+        if not options.hoist_calls:
+            return [], lines
+
+        members = ins["context"].get("members", [])
+        hoisted = hoist_leading_statements(flat_tree, codes, members)
+        hoisted_statements += hoisted.statements
+
+        for idx, code in enumerate(codes):
+            if code is None:
+                lines[idx] = hoisted.node_lines[idx]
+            elif len(hoisted.removed[idx]) != 0:
+                code = drop_statements(code, hoisted.removed[idx])
+                lines[idx] = code.split("\n") if code != "" else []
+        return hoisted.root, lines
 
     context = {
-        "pat_repo": pat_repo,
-        "size_dict": size_dict,
-        "uid_to_pat": uid_to_pat,
-        "as_repo": as_repo,
-        "context": context,
+        "pat_repo": model.pat_repo,
+        "size_dict": model.size_dict,
+        "uid_to_pat": model.uid_to_pat,
+        "as_repo": model.as_repo,
+        "context": ins["context"],
         "call_expr": call_expr,
+        "decode_lines": decode_lines,
         "flat_decode_tree": flat_decode_tree,
-        "default_size": default_size,
-        "needed_bytes_for_size_eval": needed_bytes_for_size_eval,
-        "needed_bytes_for_code_eval": needed_bytes_for_code_eval,
-        "sliced_flat_size_tree": sliced_flat_size_tree,
+        "dispatch_table": dispatch_table,
+        "dispatch_flat_buckets": dispatch_flat_buckets,
+        "batch_decoder": options.batch_decoder,
+        "pattern_names": pattern_names,
+        "pattern_ids": pattern_ids,
+        "default_size": model.default_size,
+        "needed_bytes_for_size_eval": model.needed_bytes_for_size_eval,
+        "needed_bytes_for_code_eval": model.needed_bytes_for_code_eval,
+        "sliced_flat_size_tree": model.sliced_flat_size_tree,
+        "size_table": size_table,
+        "memo_size": options.memo_size,
+        "memo_keys": memo_keys,
+        "lazy_fields": lazy_fields,
+        "struct_style": options.struct_style,
+        "pattern_uids": list(model.uid_to_pat),
+        "decode_name": "decode" if memo_keys is None else "_decode",
     }
-    rendered_code = tengine.generate(context)
 
-    for i in rendered_code.splitlines():
-        printer.print(i)
+    if options.language == "c":
+        visitor = cast(VisitorC, transpile_call.visitor)
+
+        def c_locals() -> list[str]:
+            # called by the template after the decode function body is rendered
+            # Undef is always returned with instr
+            members = {
+                j for i in model.as_repo.structs if i.name != "Undef" for j in i.members
+            }
+            return sorted((visitor.assigned | members) - C_RESERVED_NAMES)
+
+        context.update(
+            {
+                "decode_tree": model.decode_tree,
+                "size_tree": model.size_tree,
+                "size_eval_bits": model.needed_bytes_for_size_eval * 8,
+                "record_fields": max(
+                    [len(i.members) for i in model.as_repo.structs] + [1]
+                ),
+                "c_locals": c_locals,
+                "c_statement": c_statement,
+            }
+        )
+
+    # the output is written while it is rendered and never held in memory as a whole
+    last = ""
+    for chunk in tengine.generate_stream(context):
+        if len(chunk) != 0:
+            printer.write(chunk)
+            last = chunk
+
+    # every line ends with a newline, like printed line by line
+    if len(last) != 0 and not last.endswith("\n"):
+        printer.write("\n")
+
+    if options.hoist_calls:
+        logger.info(
+            f"Hoisting: {hoisted_statements} statements are run at inner nodes of "
+            + "the decode tree"
+        )
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# styles of the generated structs, see GeneratorOptions.struct_style
+STRUCT_STYLES = ("dataclass", "dataclass_slots", "namedtuple", "slots")
+
+
+@dataclass(eq=True, frozen=True)
+class GeneratorOptions:
+    """Options controlling the shape of the generated decoder.
+
+    The defaults reproduce the plain decoder: a single decode function which walks the
+    decode tree as a chain of if/elif statements.
+
+    Attributes:
+        dispatch_table (bool): Replace the root of the decode tree by a lookup table
+            indexed by the most significant bits of the instruction word. Each table
+            entry points to a function decoding the remaining subtree.
+        dispatch_bits (Optional[int]): Number of most significant bits used to index
+            the lookup table. If None the generator chooses the number of bits.
+        tree_builder (str): Name of the decode tree builder, a key of
+            pattern_algorithms.DECODE_TREE_BUILDERS. The size tree is always built
+            from the fixed bits tree.
+        pattern_hits (Optional[dict[str, int]]): Number of occurrences of each
+            pattern in a representative image, keyed by the string representation of
+            the pattern. If given, siblings in the decode tree are reordered so that
+            frequent patterns are tested first.
+        batch_decoder (bool): Additionally generate decode_batch, which classifies a
+            numpy array of instruction words at once and returns the index of the
+            matching pattern in PATTERN_NAMES for every word. The generated code
+            requires numpy.
+        size_table (bool): Generate decode_size as a lookup table indexed by the
+            bytes needed to decide the size of an instruction. If the table would
+            have more than 2**size_table.MAX_SIZE_TABLE_BITS entries, the size tree
+            is generated instead.
+        memo_size (int): Number of instruction words whose decode results are
+            cached by decode, 0 disables the cache. Equal words share one result
+            object. Results of patterns reading the context are cached per value of
+            the members they read, patterns writing the context are never cached.
+            The cache is cleared when it is full.
+        lazy_structs (bool): Generate structs computing their members on first
+            access. decode only stores the instruction word and the function
+            computing the members in the struct. Patterns whose calls use the context
+            or return early still compute their members in decode.
+        struct_style (str): Style of the generated structs, one of STRUCT_STYLES:
+            "dataclass" generates frozen dataclasses, "dataclass_slots" frozen
+            dataclasses with slots, "namedtuple" typing.NamedTuple classes and
+            "slots" plain classes with slots and a hand written __init__. Instances
+            of namedtuple structs compare equal to tuples and other structs with
+            the same members. Instances of slots structs are not frozen, therefore
+            this style cannot be combined with memo_size.
+        language (str): Language of the generated decoder, "python" or "c". The C
+            decoder supports decoder widths up to 64 bits and neither a dispatch
+            table nor a batch decoder. Its locals start as 0, so a local read
+            before it is assigned reads 0 where the Python decoder raises an
+            UnboundLocalError.
+        optimise (bool): Optimise the code of the calls of every pattern, see
+            pattern_optimiser.optimise_pattern. Constants are folded, dead
+            assignments removed and bit field extractions fused. The comments of
+            the calls are dropped. Not supported by the C decoder.
+        hoist_calls (bool): Emit the leading statements which the calls of all
+            patterns below a node of the decode tree have in common once at the
+            node, see hoisting.hoist_leading_statements. Only assignments and if
+            statements which cannot raise are hoisted. Not supported by the C
+            decoder.
+    """
+
+    dispatch_table: bool = False
+    dispatch_bits: Optional[int] = None
+    tree_builder: str = "fixed_bits"
+    pattern_hits: Optional[dict[str, int]] = None
+    batch_decoder: bool = False
+    size_table: bool = False
+    memo_size: int = 0
+    lazy_structs: bool = False
+    struct_style: str = "dataclass"
+    language: str = "python"
+    optimise: bool = False
+    hoist_calls: bool = False
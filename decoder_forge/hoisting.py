@@ -0,0 +1,304 @@
+import ast
+
+from dataclasses import dataclass
+from decoder_forge.bit_pattern import BitPattern
+from decoder_forge.context_usage import is_safe_expression
+from decoder_forge.pattern_algorithms import UID
+from typing import Iterable
+from typing import Optional
+
+# locals of the generated decode functions which hoisted statements must not assign
+RESERVED_NAMES = frozenset({"instr", "context", "_decode_pid"})
+
+
+@dataclass
+class HoistedStatements:
+    """The statements hoisted up a flattened decode tree.
+
+    Attributes:
+        root (list[str]): Lines emitted before the decode tree, common to all
+            patterns.
+        node_lines (list[list[str]]): Lines emitted at each inner node of the flat
+            tree after its test, empty for patterns.
+        removed (list[frozenset[int]]): Indices of the statements of each pattern
+            which are hoisted to its ancestors, see drop_statements. Empty for inner
+            nodes.
+        statements (int): Number of hoisted statements, each counted once at the
+            node it is emitted at.
+    """
+
+    root: list[str]
+    node_lines: list[list[str]]
+    removed: list[frozenset[int]]
+    statements: int
+
+
+def _statement_ranges(code: str) -> list[tuple[int, int, ast.stmt]]:
+    # the first line, the line behind the last and the node of each statement
+    if code.strip() == "":
+        return []
+
+    try:
+        body = ast.parse(code).body
+    except SyntaxError:
+        return []
+
+    for prev, stmt in zip(body, body[1:]):
+        if prev.end_lineno is None or stmt.lineno <= prev.end_lineno:
+            return []
+
+    starts = [0] + [stmt.lineno - 1 for stmt in body[1:]]
+    ends = starts[1:] + [len(code.split("\n"))]
+    return list(zip(starts, ends, body))
+
+
+def statement_chunks(code: str) -> list[tuple[str, ast.stmt]]:
+    """Split code into its top level statements.
+
+    Every statement keeps its source lines including comments and blank lines
+    following it. Trailing whitespace of a chunk is removed.
+
+    Args:
+        code (str): The code, e.g. the transpiled calls of a pattern.
+
+    Returns:
+        list[tuple[str, ast.stmt]]: The source and the node of each statement. Empty
+        if the code cannot be parsed or has two statements on one line.
+    """
+
+    lines = code.split("\n")
+    return [
+        ("\n".join(lines[start:end]).rstrip(), stmt)
+        for start, end, stmt in _statement_ranges(code)
+    ]
+
+
+def drop_statements(code: str, indices: Iterable[int]) -> str:
+    """Remove statements from code.
+
+    Args:
+        code (str): The code.
+        indices (Iterable[int]): The indices of the top level statements to remove,
+            see statement_chunks.
+
+    Returns:
+        str: The source lines of the remaining statements, empty if none remain.
+    """
+
+    indices = set(indices)
+    if len(indices) == 0:
+        return code
+
+    lines = code.split("\n")
+    kept = []
+    for idx, (start, end, _) in enumerate(_statement_ranges(code)):
+        if idx not in indices:
+            kept.extend(lines[start:end])
+    return "\n".join(kept)
+
+
+@dataclass(frozen=True)
+class _Effects:
+    # the locals a statement reads and assigns, and if it may change the context
+    reads: frozenset[str]
+    writes: frozenset[str]
+    reads_context: bool
+    changes_context: bool
+
+    @staticmethod
+    def of(stmt: ast.stmt) -> "_Effects":
+        reads = set()
+        writes = set()
+        reads_context = False
+        changes_context = False
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Name):
+                if isinstance(node.ctx, ast.Load):
+                    reads.add(node.id)
+                else:
+                    writes.add(node.id)
+            elif isinstance(node, ast.Call):
+                changes_context = True
+            elif isinstance(node, (ast.Attribute, ast.Subscript)):
+                if isinstance(node.ctx, ast.Load):
+                    reads_context = True
+                else:
+                    changes_context = True
+        return _Effects(
+            frozenset(reads), frozenset(writes), reads_context, changes_context
+        )
+
+    def commutes(self, other: "_Effects") -> bool:
+        # running the statements in either order has the same result
+        return (
+            len(self.writes & (other.reads | other.writes)) == 0
+            and len(self.reads & other.writes) == 0
+            and not (self.reads_context and other.changes_context)
+            and not (self.changes_context and other.reads_context)
+        )
+
+
+def _hoistable(
+    stmt: ast.stmt, defined: set[str], members: set[str]
+) -> Optional[set[str]]:
+    # the locals assigned for sure after the statement, None if the statement may
+    # raise, has side effects or changes the flow of the decode function
+    if isinstance(stmt, ast.Assign):
+        if not is_safe_expression(stmt.value, defined, members):
+            return None
+        names = set()
+        for target in stmt.targets:
+            if not isinstance(target, ast.Name) or target.id in RESERVED_NAMES:
+                return None
+            names.add(target.id)
+        return defined | names
+
+    if isinstance(stmt, ast.AugAssign):
+        value = ast.BinOp(left=stmt.target, op=stmt.op, right=stmt.value)
+        if (
+            not isinstance(stmt.target, ast.Name)
+            or stmt.target.id in RESERVED_NAMES
+            or not is_safe_expression(value, defined, members)
+        ):
+            return None
+        return defined
+
+    if isinstance(stmt, ast.If):
+        if not is_safe_expression(stmt.test, defined, members):
+            return None
+        body = _hoistable_block(stmt.body, defined, members)
+        orelse = _hoistable_block(stmt.orelse, defined, members)
+        if body is None or orelse is None:
+            return None
+        return body & orelse
+
+    if isinstance(stmt, ast.Pass):
+        return defined
+
+    return None
+
+
+def _hoistable_block(
+    body: list[ast.stmt], defined: set[str], members: set[str]
+) -> Optional[set[str]]:
+    for stmt in body:
+        result = _hoistable(stmt, defined, members)
+        if result is None:
+            return None
+        defined = result
+    return defined
+
+
+def hoist_leading_statements(
+    flat_tree: list[tuple[BitPattern, UID, int, bool, bool]],
+    codes: list[Optional[str]],
+    context_members: Iterable[str] = (),
+) -> HoistedStatements:
+    """Hoist the leading statements shared by all patterns below a node.
+
+    A statement is hoisted to a node of the decode tree if the code of every pattern
+    below the node has the same statement and can run it first: the statements
+    before it neither read nor assign the locals it assigns, nor assign the locals
+    it reads, nor change the context if it reads the context. The hoisted statements
+    are run once after the test of the node, in the order they are hoisted.
+
+    Only assignments of locals and if statements are hoisted whose expressions
+    neither have side effects nor raise, see is_safe_expression: they only read the
+    instruction word, the members of the context and locals hoisted before.
+    Instruction words below the node which match no pattern therefore still decode
+    to Undef. Statements are compared by their source, including comments. Nodes
+    with a single pattern below them are left unchanged.
+
+    Args:
+        flat_tree (list[tuple[BitPattern, UID, int, bool, bool]]): The flattened
+            decode tree, see flatten_decode_tree.
+        codes (list[Optional[str]]): For each item of flat_tree the code emitted for
+            the pattern, empty if it emits none, or None for inner nodes.
+        context_members (Iterable[str]): Members of the context, which hoisted
+            statements may read.
+
+    Returns:
+        HoistedStatements: The hoisted lines and the statements removed from the
+        code of each pattern.
+
+    Example:
+        >>> hoisted = hoist_leading_statements(flat_tree, codes)
+        >>> code = drop_statements(codes[idx], hoisted.removed[idx])
+    """
+
+    members = set(context_members)
+    chunks = [statement_chunks(i) if i is not None else [] for i in codes]
+    effects = [[_Effects.of(stmt) for _, stmt in i] for i in chunks]
+    depths = [i[2] for i in flat_tree]
+
+    # indices of the statements of each pattern which are not hoisted yet
+    remaining = [list(range(len(i))) for i in chunks]
+    node_lines: list[list[str]] = [[] for _ in flat_tree]
+    statements = 0
+
+    def movable(leaf: int, text: str) -> Optional[int]:
+        # the first statement of a pattern with the given source which can be run
+        # before the other remaining statements
+        for pos, idx in enumerate(remaining[leaf]):
+            if chunks[leaf][idx][0] == text:
+                stmt_effects = effects[leaf][idx]
+                if all(
+                    stmt_effects.commutes(effects[leaf][i])
+                    for i in remaining[leaf][:pos]
+                ):
+                    return idx
+        return None
+
+    def hoist_statement(leaves: list[int], defined: set[str]):
+        # hoists one statement of the first pattern, returns its source and the
+        # locals assigned for sure after it, None if no statement can be hoisted
+        first = leaves[0]
+        for idx in remaining[first]:
+            text, stmt = chunks[first][idx]
+            result = _hoistable(stmt, defined, members)
+            if result is None:
+                continue
+
+            picks = [movable(leaf, text) for leaf in leaves]
+            if any(i is None for i in picks):
+                continue
+
+            for leaf, pick in zip(leaves, picks):
+                remaining[leaf].remove(pick)
+            return text, result
+        return None
+
+    def hoist(start: int, end: int, defined: set[str]) -> list[str]:
+        # hoists the statements common to the items start..end-1 below a node and
+        # returns the lines emitted at the node
+        nonlocal statements
+
+        lines: list[str] = []
+        leaves = [i for i in range(start, end) if codes[i] is not None]
+        while len(leaves) > 1:
+            hoisted = hoist_statement(leaves, defined)
+            if hoisted is None:
+                break
+            text, defined = hoisted
+            lines.extend(text.split("\n"))
+            statements += 1
+
+        idx = start
+        while idx < end:
+            # the subtree of the child ends at the next item of the same depth
+            subtree_end = idx + 1
+            while subtree_end < end and depths[subtree_end] > depths[idx]:
+                subtree_end += 1
+
+            if codes[idx] is None:
+                node_lines[idx] = hoist(idx + 1, subtree_end, defined)
+            idx = subtree_end
+        return lines
+
+    root = hoist(0, len(flat_tree), {"instr"})
+    removed = [
+        frozenset(range(len(i))) - frozenset(j) for i, j in zip(chunks, remaining)
+    ]
+    return HoistedStatements(
+        root=root, node_lines=node_lines, removed=removed, statements=statements
+    )
@@ -0,0 +1,30 @@
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from typing import Protocol
+
+
+class ICDecoder(Protocol):
+    pattern_names: list[str]
+    struct_names: list[str]
+    struct_members: list[list[str]]
+
+    def iter_record_chunks(
+        self,
+        data: bytes | bytearray | memoryview,
+        start: int = 0,
+        end: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> Iterator[tuple[int, Any, int]]: ...
+
+    def iter_decode(
+        self,
+        data: bytes | bytearray | memoryview,
+        start: int = 0,
+        end: Optional[int] = None,
+        count: Optional[int] = None,
+    ) -> Iterator[tuple[int, int, int, str]]: ...
+
+
+class ICDecoderBuilder(Protocol):
+    def build(self, source: str) -> ICDecoder: ...
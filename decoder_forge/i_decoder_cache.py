@@ -0,0 +1,8 @@
+from types import CodeType
+from typing import Optional
+from typing import Protocol
+
+
+class IDecoderCache(Protocol):
+    def load(self, key: str) -> Optional[tuple[str, CodeType]]: ...
+    def store(self, key: str, source: str, code: CodeType) -> None: ...
@@ -0,0 +1,8 @@
+from typing import Optional
+from typing import Protocol
+
+
+class IFragmentStore(Protocol):
+    def get(self, key: str) -> Optional[str]: ...
+    def put(self, key: str, fragment: str) -> None: ...
+    def flush(self) -> None: ...
@@ -3,3 +3,7 @@ from typing import Protocol
 
 class IPrinter(Protocol):
     def print(self, out: str) -> None: ...
+
+    def write(self, out: str) -> None: ...
+
+    def write_bytes(self, out: bytes) -> None: ...
@@ -1,6 +1,8 @@
+from typing import Iterator
 from typing import Protocol
 
 
 class ITemplateEngine(Protocol):
     def load(self, template_key: str) -> None: ...
     def generate(self, context: dict) -> str: ...
+    def generate_stream(self, context: dict) -> Iterator[str]: ...
@@ -0,0 +1,103 @@
+import sys
+
+from math import ceil
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+# memoryview formats for the little endian units used to decide the size
+_UNIT_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+def iter_instructions(
+    data: bytes | bytearray | memoryview,
+    decode_size: Callable[[int], int],
+    size_bytes: int,
+    decoder_bytes: int,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[tuple[int, int, int]]:
+    """Split a binary image into instruction words.
+
+    The first size_bytes bytes at the current address are read as little endian
+    integer and passed to decode_size, which returns the size of the instruction in
+    bits. Instructions shorter than the decoder width are shifted to the most
+    significant bits of the instruction word. Longer instructions are assembled from
+    the size evaluation part followed by the remaining bytes, which are again read as
+    little endian integer. Instructions of unknown size (a size of zero) are treated
+    as size_bytes long.
+
+    The image is accessed through a memoryview, so data may be a memory mapped file.
+    No bytes are copied apart from the ones of the instruction being assembled.
+
+    Args:
+        data (bytes | bytearray | memoryview): The binary image.
+        decode_size (Callable[[int], int]): Returns the size of an instruction in bits
+            for its first size_bytes bytes.
+        size_bytes (int): Number of bytes needed to decide the size of an instruction.
+        decoder_bytes (int): Number of bytes of an instruction word.
+        start (int): Offset of the first instruction in data.
+        end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+            end of data.
+
+    Yields:
+        tuple[int, int, int]: The address, the size in bytes and the instruction word
+        extended to decoder_bytes.
+
+    Example:
+        >>> for adr, size, instr in iter_instructions(data, decode_size, 2, 4):
+        ...     print(hex(adr), size, hex(instr))
+    """
+
+    view = memoryview(data).cast("B")
+    end = len(view) if end is None else min(end, len(view))
+
+    if start >= end or size_bytes == 0:
+        view.release()
+        return
+
+    # Units of size_bytes starting at start can be read by index if the host is
+    # little endian like the image.
+    units = None
+    if sys.byteorder == "little" and size_bytes in _UNIT_FORMATS:
+        unit_count = (end - start) // size_bytes
+        units = view[start : start + unit_count * size_bytes].cast(
+            _UNIT_FORMATS[size_bytes]
+        )
+
+    try:
+        adr = start
+        while adr + size_bytes <= end:
+            # read the part of the code which is necessary to estimate its size
+            offset = adr - start
+            if units is not None and offset % size_bytes == 0:
+                data_for_size_eval = units[offset // size_bytes]
+            else:
+                data_for_size_eval = int.from_bytes(
+                    view[adr : adr + size_bytes], "little"
+                )
+
+            # calculate size of the following code
+            act_instr_size = int(ceil(decode_size(data_for_size_eval) / 8))
+            act_instr_size = min(max(act_instr_size, size_bytes), decoder_bytes)
+
+            if act_instr_size == size_bytes:
+                instr = data_for_size_eval << ((decoder_bytes - size_bytes) * 8)
+            else:
+                if adr + act_instr_size > end:
+                    break
+
+                missing_bytes = act_instr_size - size_bytes
+                instr = data_for_size_eval << (missing_bytes * 8)
+                instr |= int.from_bytes(
+                    view[adr + size_bytes : adr + act_instr_size], "little"
+                )
+                instr <<= (decoder_bytes - act_instr_size) * 8
+
+            yield adr, act_instr_size, instr
+            adr += act_instr_size
+    finally:
+        # a memory mapped file can only be closed after its buffers are released
+        if units is not None:
+            units.release()
+        view.release()
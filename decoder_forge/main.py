@@ -1,17 +1,32 @@
 import click
+import functools
+import hashlib
 import logging
+import os
 import sys
+import tempfile
 
+from dataclasses import replace
+from pathlib import Path
 from typing import Optional
-from decoder_forge.uc_show_decode_tree import uc_show_decode_tree
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.generator_options import STRUCT_STYLES
+from decoder_forge.output_formats import OUTPUT_FORMATS
+from decoder_forge.pattern_algorithms import DECODE_TREE_BUILDERS
 from decoder_forge.external.printer import Printer
+from decoder_forge.external.template_engine import TEMPLATES
 from decoder_forge.external.template_engine import TemplateEngine
-from decoder_forge.uc_generate_code import uc_generate_code
-from decoder_forge.uc_decode import uc_decode
+from decoder_forge.external.decoder_cache import default_cache_dir
 from contextlib import contextmanager
 
+# The use cases and their dependencies (PyYAML, Jinja, ctypes) are imported by the
+# commands using them, which keeps the startup of the CLI short.
+
 logger = logging.getLogger(__name__)
 
+# buffer size of output files
+OUTPUT_BUFFER_BYTES = 1 << 20
+
 
 @click.group()
 @click.option("-v", "--verbose", count=True)
@@ -32,6 +47,173 @@ def cli(ctx, verbose):
     ctx.obj["verbosity"] = verbose
 
 
+tree_builder_option = click.option(
+    "--tree_builder",
+    help="Algorithm used to build the decode tree (default: fixed_bits)",
+    default="fixed_bits",
+    type=click.Choice(list(DECODE_TREE_BUILDERS.keys())),
+)
+
+
+cache_dir_option = click.option(
+    "--cache_dir",
+    help="Directory caching generated code (default: $XDG_CACHE_HOME/"
+    + "decoder-forge or ~/.cache/decoder-forge)",
+    default=None,
+    type=str,
+)
+
+
+def generator_options(func):
+    """Decorator adding the options of the code generator to a click command.
+
+    The options are collected into a GeneratorOptions instance which is passed to the
+    decorated command as keyword argument "options".
+    """
+
+    @functools.wraps(func)
+    def wrapper(
+        *args,
+        dispatch_table: bool,
+        dispatch_bits: Optional[int],
+        tree_builder: str,
+        batch_decoder: bool,
+        size_table: bool,
+        memo_size: int,
+        lazy_structs: bool,
+        struct_style: str,
+        language: str,
+        optimise: bool,
+        hoist_calls: bool,
+        **kwargs,
+    ):
+        options = GeneratorOptions(
+            dispatch_table=dispatch_table,
+            dispatch_bits=dispatch_bits,
+            tree_builder=tree_builder,
+            batch_decoder=batch_decoder,
+            size_table=size_table,
+            memo_size=memo_size,
+            lazy_structs=lazy_structs,
+            struct_style=struct_style,
+            language=language,
+            optimise=optimise,
+            hoist_calls=hoist_calls,
+        )
+        return func(*args, options=options, **kwargs)
+
+    wrapper = tree_builder_option(wrapper)
+
+    wrapper = click.option(
+        "--hoist_calls",
+        help="Emit the leading statements shared by all patterns below a node of "
+        + "the decode tree once at the node.",
+        is_flag=True,
+        default=False,
+    )(wrapper)
+
+    wrapper = click.option(
+        "--optimise",
+        help="Fold constants, remove dead assignments and fuse bit field "
+        + "extractions in the code of the patterns.",
+        is_flag=True,
+        default=False,
+    )(wrapper)
+
+    wrapper = click.option(
+        "--language",
+        help="Language of the generated decoder (default: python). The decode "
+        + "command builds a C decoder with gcc.",
+        default="python",
+        type=click.Choice(list(TEMPLATES.keys())),
+    )(wrapper)
+
+    wrapper = click.option(
+        "--struct_style",
+        help="Style of the generated structs (default: dataclass).",
+        default="dataclass",
+        type=click.Choice(list(STRUCT_STYLES)),
+    )(wrapper)
+
+    wrapper = click.option(
+        "--lazy_structs",
+        help="Generate structs computing their members on first access.",
+        is_flag=True,
+        default=False,
+    )(wrapper)
+
+    wrapper = click.option(
+        "--memo_size",
+        help="Number of instruction words whose decode results are cached, 0 "
+        + "disables the cache (default: 0).",
+        default=0,
+        type=click.IntRange(min=0),
+    )(wrapper)
+
+    wrapper = click.option(
+        "--size_table",
+        help="Generate the size decoder as a lookup table instead of a tree.",
+        is_flag=True,
+        default=False,
+    )(wrapper)
+
+    wrapper = click.option(
+        "--batch_decoder",
+        help="Additionally generate decode_batch, a numpy based decoder classifying "
+        + "arrays of instruction words.",
+        is_flag=True,
+        default=False,
+    )(wrapper)
+
+    wrapper = click.option(
+        "--dispatch_bits",
+        help="Number of most significant bits indexing the dispatch table. Chosen by "
+        + "the generator if omitted.",
+        default=None,
+        type=int,
+    )(wrapper)
+    wrapper = click.option(
+        "--dispatch_table",
+        help="Replace the root of the decode tree by a lookup table.",
+        is_flag=True,
+        default=False,
+    )(wrapper)
+    return wrapper
+
+
+def parse_int_option(ctx, param, value: Optional[str]) -> Optional[int]:
+    """Click callback converting a decimal, hexadecimal or binary integer option."""
+
+    if value is None:
+        return None
+
+    try:
+        return int(value, 0)
+    except ValueError:
+        raise click.BadParameter(f"{value} is not an integer")
+
+
+def read_spec(path: str) -> str | bytes:
+    """Read a format description, either a YAML file or a compiled spec.
+
+    Args:
+        path (str): Path of the YAML file or of a file written by compile-spec.
+
+    Returns:
+        str | bytes: The compiled spec as bytes or the YAML file as string.
+    """
+
+    from decoder_forge.spec_ir import is_spec_ir
+
+    with open(path, "rb") as fp:
+        buf = fp.read()
+
+    if is_spec_ir(buf):
+        return buf
+
+    return buf.decode("utf-8")
+
+
 @contextmanager
 def open_output_stream(output_file: Optional[str]):
     """
@@ -55,7 +237,7 @@ def open_output_stream(output_file: Optional[str]):
     if output_file is None:
         yield sys.stdout
     else:
-        with open(output_file, "w") as f:
+        with open(output_file, "w", buffering=OUTPUT_BUFFER_BYTES) as f:
             yield f
 
 
@@ -76,19 +258,206 @@ def open_output_stream(output_file: Optional[str]):
     default=None,
     type=str,
 )
+@click.option(
+    "--start",
+    help="Offset of the first instruction in the binary, decimal or with 0x prefix "
+    + "(default: 0)",
+    default="0",
+    callback=parse_int_option,
+)
+@click.option(
+    "--end",
+    help="Offset behind the last byte to decode. Defaults to the end of the binary.",
+    default=None,
+    callback=parse_int_option,
+)
+@click.option(
+    "--count",
+    help="Maximum number of instructions to decode. Defaults to all instructions.",
+    default=None,
+    type=int,
+)
+@click.option(
+    "--jobs",
+    help="Number of processes decoding the binary, 0 for one per CPU (default: 1)",
+    default=1,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--format",
+    "output_format",
+    help="Output format (default: text). jsonl and csv write one line per "
+    + "instruction, binary writes fixed size records after a header describing "
+    + "the structs.",
+    default="text",
+    type=click.Choice(list(OUTPUT_FORMATS)),
+)
+@cache_dir_option
+@click.option(
+    "--no_cache",
+    help="Always generate the decoder, without reading or writing the cache.",
+    is_flag=True,
+    default=False,
+)
+@generator_options
 @click.pass_context
 def decode(
-    self, decoder_path: str, bin_path: str, decoder_width: int, out_file: Optional[str]
+    self,
+    decoder_path: str,
+    bin_path: str,
+    decoder_width: int,
+    out_file: Optional[str],
+    start: int,
+    end: Optional[int],
+    count: Optional[int],
+    jobs: int,
+    output_format: str,
+    cache_dir: Optional[str],
+    no_cache: bool,
+    options: GeneratorOptions,
 ):
+    """Decode a binary file with the decoder generated from DECODER_PATH.
+
+    The binary is decoded from --start to --end, or until --count instructions are
+    decoded, and every instruction is written with its address in the format given
+    by --format.
+
+    Example:
+        $ python cli.py decode armv7-m.yaml firmware.bin --start 0xD4
+    """
+
+    from decoder_forge.external.c_decoder import CDecoderBuilder
+    from decoder_forge.external.decoder_cache import DecoderCache
+    from decoder_forge.uc_decode import uc_decode
 
-    yaml_buf = ""
-    with open(decoder_path, "r", encoding="utf-8") as fp:
-        yaml_buf = fp.read()
+    yaml_buf = read_spec(decoder_path)
 
+    cache = None
+    c_builder = None
     tengine = TemplateEngine()
-    with open_output_stream(out_file) as f:
+    if not no_cache:
+        base_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        cache = DecoderCache(base_dir)
+        c_builder = CDecoderBuilder(base_dir / "native")
+        tengine = TemplateEngine(base_dir / "templates")
+
+    with open_output_stream(out_file) as f, tempfile.TemporaryDirectory() as tmp_dir:
+        if c_builder is None:
+            c_builder = CDecoderBuilder(Path(tmp_dir))
+
         printer = Printer(f)
-        uc_decode(printer, tengine, yaml_buf, decoder_width, bin_path)
+        uc_decode(
+            printer,
+            tengine,
+            yaml_buf,
+            decoder_width,
+            bin_path,
+            options,
+            start=start,
+            end=end,
+            count=count,
+            jobs=jobs if jobs != 0 else (os.cpu_count() or 1),
+            cache=cache,
+            c_builder=c_builder,
+            output_format=output_format,
+        )
+
+
+@cli.command()
+@click.argument("DECODER_PATH", type=str)
+@click.argument("BIN_PATH", type=str)
+@click.argument("OUT_FILE", type=str)
+@click.option(
+    "--decoder_width",
+    help="Target bit width; patterns are extended to this width before decoding "
+    + "(default: 32)",
+    default=32,
+    type=int,
+)
+@click.option(
+    "--start",
+    help="Offset of the first instruction in the binary, decimal or with 0x prefix "
+    + "(default: 0)",
+    default="0",
+    callback=parse_int_option,
+)
+@click.option(
+    "--end",
+    help="Offset behind the last byte to decode. Defaults to the end of the binary.",
+    default=None,
+    callback=parse_int_option,
+)
+@click.option(
+    "--count",
+    help="Maximum number of instructions to decode. Defaults to all instructions.",
+    default=None,
+    type=int,
+)
+@cache_dir_option
+@click.option(
+    "--no_cache",
+    help="Always generate the decoder, without reading or writing the cache.",
+    is_flag=True,
+    default=False,
+)
+@generator_options
+@click.pass_context
+def decode_columns(
+    self,
+    decoder_path: str,
+    bin_path: str,
+    out_file: str,
+    decoder_width: int,
+    start: int,
+    end: Optional[int],
+    count: Optional[int],
+    cache_dir: Optional[str],
+    no_cache: bool,
+    options: GeneratorOptions,
+):
+    """Decode a binary file into columns and save them to OUT_FILE.
+
+    OUT_FILE is an .npz file with one array per column: address, code, size, pattern,
+    structure and one array per struct member with its mask. Requires numpy.
+
+    Example:
+        $ python cli.py decode-columns armv7-m.yaml firmware.bin firmware.npz
+    """
+
+    from decoder_forge.external.c_decoder import CDecoderBuilder
+    from decoder_forge.external.decoder_cache import DecoderCache
+
+    # numpy is an optional dependency
+    from decoder_forge.uc_decode_columns import uc_decode_columns
+
+    yaml_buf = read_spec(decoder_path)
+
+    cache = None
+    c_builder = None
+    tengine = TemplateEngine()
+    if not no_cache:
+        base_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        cache = DecoderCache(base_dir)
+        c_builder = CDecoderBuilder(base_dir / "native")
+        tengine = TemplateEngine(base_dir / "templates")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if c_builder is None:
+            c_builder = CDecoderBuilder(Path(tmp_dir))
+
+        uc_decode_columns(
+            tengine,
+            yaml_buf,
+            decoder_width,
+            bin_path,
+            out_file,
+            options,
+            start=start,
+            end=end,
+            count=count,
+            cache=cache,
+            c_builder=c_builder,
+        )
 
 
 @cli.command()
@@ -107,8 +476,41 @@ def decode(
     default=None,
     type=str,
 )
+@click.option(
+    "--profile",
+    help="Binary image whose pattern hits decide the order of the decode tree "
+    + "children.",
+    default=None,
+    type=str,
+)
+@click.option(
+    "--histogram",
+    help="YAML file with pattern hits. Written if combined with --profile, read "
+    + "otherwise.",
+    default=None,
+    type=str,
+)
+@click.option(
+    "--incremental",
+    help="Reuse the code generated for pattern calls whose functions did not change "
+    + "since the last run.",
+    is_flag=True,
+    default=False,
+)
+@cache_dir_option
+@generator_options
 @click.pass_context
-def generate_code(self, input_path: str, decoder_width: int, out_file: Optional[str]):
+def generate_code(
+    self,
+    input_path: str,
+    decoder_width: int,
+    out_file: Optional[str],
+    profile: Optional[str],
+    histogram: Optional[str],
+    incremental: bool,
+    cache_dir: Optional[str],
+    options: GeneratorOptions,
+):
     """Generate decoder code from YAML instruction patterns.
 
     This command reads a YAML file from the provided INPUT_PATH which should contain
@@ -121,23 +523,85 @@ def generate_code(self, input_path: str, decoder_width: int, out_file: Optional[
         decoder_width (int): The target bit width for extending patterns
           (default is 32).
         output_file (Optional[str]): Optional file path to write the generated code.
+        profile (Optional[str]): Optional binary image used to count pattern hits.
+        histogram (Optional[str]): Optional YAML file storing the pattern hits.
+        incremental (bool): Keep the generated code fragments and the compiled
+          templates in the cache directory.
+        cache_dir (Optional[str]): Optional cache directory. If given, the compiled
+          templates are kept in it.
+        options (GeneratorOptions): Options of the code generator.
 
     Raises:
         IOError: If reading the input file or writing to the output file fails.
 
     Example:
         $ python cli.py generate_code patterns.yaml --decoder_width 32
-          --output_file decoder.py
+          --output_file decoder.py --profile firmware.bin
     """
 
-    yaml_buf = ""
-    with open(input_path, "r", encoding="utf-8") as fp:
-        yaml_buf = fp.read()
+    from decoder_forge.external.fragment_store import FragmentStore
+    from decoder_forge.pattern_profile import dump_pattern_hits
+    from decoder_forge.pattern_profile import load_pattern_hits
+    from decoder_forge.uc_generate_code import uc_generate_code
+    from decoder_forge.uc_profile_patterns import uc_profile_patterns
+
+    yaml_buf = read_spec(input_path)
 
+    pattern_hits = None
+    if profile is not None:
+        pattern_hits = uc_profile_patterns(yaml_buf, decoder_width, profile, options)
+
+        if histogram is not None:
+            with open(histogram, "w", encoding="utf-8") as fp:
+                fp.write(dump_pattern_hits(pattern_hits))
+
+    elif histogram is not None:
+        with open(histogram, "r", encoding="utf-8") as fp:
+            pattern_hits = load_pattern_hits(fp.read())
+
+    if pattern_hits is not None:
+        options = replace(options, pattern_hits=pattern_hits)
+
+    base_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+
+    fragments = None
+    if incremental:
+        store_name = hashlib.sha256(os.path.abspath(input_path).encode("utf-8"))
+        fragments = FragmentStore(
+            base_dir / "fragments" / f"{store_name.hexdigest()}.marshal"
+        )
+
+    # the compiled templates are only cached if a cache is asked for
     tengine = TemplateEngine()
+    if incremental or cache_dir is not None:
+        tengine = TemplateEngine(base_dir / "templates")
     with open_output_stream(out_file) as f:
         printer = Printer(f)
-        uc_generate_code(printer, tengine, yaml_buf, decoder_width)
+        uc_generate_code(printer, tengine, yaml_buf, decoder_width, options, fragments)
+
+
+@cli.command()
+@click.argument("INPUT_PATH", type=str)
+@click.argument("OUT_FILE", type=str)
+@click.pass_context
+def compile_spec(ctx, input_path: str, out_file: str):
+    """Compile a YAML format description into a spec which loads fast.
+
+    The YAML file at INPUT_PATH is parsed and validated once, the parsed format and
+    its patterns are written to OUT_FILE. All commands accept OUT_FILE in place of
+    the YAML file.
+
+    Example:
+        $ python cli.py compile-spec armv7-m.yaml armv7-m.spec
+    """
+
+    from decoder_forge.spec_ir import compile_spec as compile_format
+
+    with open(input_path, "r", encoding="utf-8") as fp:
+        spec = compile_format(fp.read())
+
+    with open(out_file, "wb") as fp:
+        fp.write(spec)
 
 
 @cli.command()
@@ -149,8 +613,9 @@ def generate_code(self, input_path: str, decoder_width: int, out_file: Optional[
     default=32,
     type=int,
 )
+@tree_builder_option
 @click.pass_context
-def show_tree(ctx, input_path: str, decoder_width: int):
+def show_tree(ctx, input_path: str, decoder_width: int, tree_builder: str):
     """
     Show the decode tree of an instruction set.
 
@@ -164,12 +629,12 @@ def show_tree(ctx, input_path: str, decoder_width: int):
         $ python cli.py show_tree instructions.yaml
     """
 
-    yaml_buf = ""
-    with open(input_path, "r", encoding="utf-8") as fp:
-        yaml_buf = fp.read()
+    from decoder_forge.uc_show_decode_tree import uc_show_decode_tree
+
+    yaml_buf = read_spec(input_path)
 
     printer = Printer(sys.stdout)
-    uc_show_decode_tree(printer, yaml_buf, decoder_width)
+    uc_show_decode_tree(printer, yaml_buf, decoder_width, tree_builder)
 
 
 def main():
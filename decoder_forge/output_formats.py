@@ -0,0 +1,236 @@
+import json
+import struct
+
+from decoder_forge.associated_struct_repo import StructDef
+from operator import attrgetter
+from typing import Any
+from typing import Callable
+
+OUTPUT_FORMATS = ("text", "jsonl", "csv", "binary")
+
+# instructions formatted and written with one call of the printer
+CHUNK_ROWS = 0x1000
+
+BINARY_MAGIC = b"DFREC001"
+
+# magic, header bytes, record bytes, fields per record, struct table bytes
+BINARY_HEADER = struct.Struct("<8sIIII")
+
+# address, code, size, struct index; followed by the fields
+BINARY_RECORD = "<QQIi"
+
+# columns of the csv format in front of the members
+CSV_COLUMNS = ("address", "code", "size", "struct")
+
+# address, size, code, struct index, members in the order of the struct
+DecodedRow = tuple[int, int, int, int, tuple]
+
+
+def struct_row_getters(
+    ns: dict[str, Any], structs: list[StructDef]
+) -> dict[type, tuple[int, Callable[[Any], tuple]]]:
+    """Map the struct types of a generated decoder to their index and members.
+
+    Args:
+        ns (dict[str, Any]): Namespace of the generated decoder.
+        structs (list[StructDef]): The structs of the decoder, their order defines
+            the struct indices.
+
+    Returns:
+        dict[type, tuple[int, Callable[[Any], tuple]]]: For every struct type its
+        index and a function returning the members of an instance as tuple.
+    """
+
+    def getter(members: list[str]) -> Callable[[Any], tuple]:
+        if len(members) == 0:
+            return lambda out: ()
+
+        get = attrgetter(*members)
+        if len(members) == 1:
+            return lambda out: (get(out),)
+
+        return get
+
+    return {ns[i.name]: (idx, getter(i.members)) for idx, i in enumerate(structs)}
+
+
+class RowFormatter:
+    """Formats chunks of decoded instructions in one of the OUTPUT_FORMATS.
+
+    - text: the lines of the decode command, like format_decoded.
+    - jsonl: one JSON object per instruction with the keys address, code, size,
+      struct and fields.
+    - csv: a header line, then one line per instruction with address, code, size,
+      struct and one column per member name of all structs. Columns of members the
+      struct does not have are empty. Members named like one of the CSV_COLUMNS get
+      the prefix "member_".
+    - binary: fixed size records, see binary_header.
+
+    The line of every struct is prepared as format string once, so formatting a
+    chunk only fills in the numbers.
+
+    Example:
+        >>> formatter = RowFormatter("csv", structs)
+        >>> printer.write(formatter.header() + formatter.format(rows))
+    """
+
+    def __init__(self, output_format: str, structs: list[StructDef]):
+        """Prepare the formats of all structs.
+
+        Args:
+            output_format (str): One of OUTPUT_FORMATS.
+            structs (list[StructDef]): The structs, indexed by the struct index of the
+                rows.
+
+        Raises:
+            ValueError: If output_format is unknown.
+        """
+
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format {output_format}, "
+                + f"expected one of {', '.join(OUTPUT_FORMATS)}"
+            )
+
+        self.output_format = output_format
+        self.binary = output_format == "binary"
+        self._structs = structs
+        self._fields = max((len(i.members) for i in structs), default=0)
+        self._columns = list(dict.fromkeys(j for i in structs for j in i.members))
+
+        if output_format == "text":
+            self._formats = [
+                "{:<#8x} {:<#10x} "
+                + f"{i.name}("
+                + ", ".join(f"{j}={{:d}}" for j in i.members)
+                + ")\n"
+                for i in structs
+            ]
+        elif output_format == "jsonl":
+            self._formats = [
+                '{{"address":{:d},"code":{:d},"size":{:d},'
+                + f'"struct":{json.dumps(i.name)},"fields":{{{{'
+                + ",".join(f"{json.dumps(j)}:{{:d}}" for j in i.members)
+                + "}}}}\n"
+                for i in structs
+            ]
+        elif output_format == "csv":
+            # the fields are referenced by position, the values keep struct order
+            self._formats = [
+                f"{{0:d}},{{1:d}},{{2:d}},{i.name}"
+                + "".join(
+                    f",{{{3 + i.members.index(j)}:d}}" if j in i.members else ","
+                    for j in self._columns
+                )
+                + "\n"
+                for i in structs
+            ]
+        else:
+            self._record = struct.Struct(BINARY_RECORD + "q" * self._fields)
+
+    def header(self) -> str | bytes:
+        """Return what is written before the first chunk."""
+
+        if self.output_format == "csv":
+            # members named like a fixed column get a prefix
+            members = [f"member_{i}" if i in CSV_COLUMNS else i for i in self._columns]
+            return ",".join([*CSV_COLUMNS, *members]) + "\n"
+
+        if self.binary:
+            return binary_header(self._structs, self._record.size, self._fields)
+
+        return ""
+
+    def format(self, rows: list[DecodedRow]) -> str | bytes:
+        """Format a chunk of decoded instructions.
+
+        Args:
+            rows (list[DecodedRow]): The instructions.
+
+        Returns:
+            str | bytes: The formatted instructions, bytes for the binary format.
+        """
+
+        if self.binary:
+            pack = self._record.pack
+            padding = [(0,) * (self._fields - len(i.members)) for i in self._structs]
+            return b"".join(
+                pack(adr, code, size, idx, *values, *padding[idx])
+                for adr, size, code, idx, values in rows
+            )
+
+        formats = self._formats
+        if self.output_format == "text":
+            return "".join(
+                formats[idx].format(adr, code, *values)
+                for adr, _, code, idx, values in rows
+            )
+
+        return "".join(
+            formats[idx].format(adr, code, size, *values)
+            for adr, size, code, idx, values in rows
+        )
+
+
+def binary_header(structs: list[StructDef], record_bytes: int, fields: int) -> bytes:
+    """Create the header of the binary output format.
+
+    The header consists of BINARY_HEADER followed by a JSON table of the structs
+    ({"structs": [{"name": ..., "members": [...]}, ...]}), padded with spaces to a
+    multiple of eight bytes. The records follow the header, each is packed as
+    BINARY_RECORD followed by the given number of int64 fields; the members of a
+    struct are stored in their order, unused fields are zero. All values are little
+    endian, so the records can be memory mapped, e.g. with numpy.
+
+    Args:
+        structs (list[StructDef]): The structs, indexed by the struct index of the
+            records.
+        record_bytes (int): Size of a record.
+        fields (int): Number of fields in a record.
+
+    Returns:
+        bytes: The header.
+    """
+
+    table = json.dumps(
+        {"structs": [{"name": i.name, "members": i.members} for i in structs]}
+    ).encode("utf-8")
+    table += b" " * (-(BINARY_HEADER.size + len(table)) % 8)
+    header_bytes = BINARY_HEADER.size + len(table)
+    return (
+        BINARY_HEADER.pack(BINARY_MAGIC, header_bytes, record_bytes, fields, len(table))
+        + table
+    )
+
+
+def read_binary_header(data: bytes) -> tuple[int, int, int, list[StructDef]]:
+    """Parse the header of the binary output format, see binary_header.
+
+    Args:
+        data (bytes): The output, at least the header.
+
+    Returns:
+        tuple[int, int, int, list[StructDef]]: The size of the header, which is the
+        offset of the first record, the size of a record, the number of fields in a
+        record and the structs.
+
+    Raises:
+        ValueError: If data does not start with a header of the binary format.
+    """
+
+    if len(data) < BINARY_HEADER.size:
+        raise ValueError("Data is too short for a header of the binary format")
+
+    magic, header_bytes, record_bytes, fields, table_bytes = BINARY_HEADER.unpack_from(
+        data
+    )
+    if magic != BINARY_MAGIC:
+        raise ValueError("Data is not in the binary output format")
+
+    table = json.loads(
+        bytes(data[BINARY_HEADER.size : BINARY_HEADER.size + table_bytes])
+    )
+    structs = [
+        StructDef(name=i["name"], members=i["members"]) for i in table["structs"]
+    ]
+    return header_bytes, record_bytes, fields, structs
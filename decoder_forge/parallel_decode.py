@@ -0,0 +1,196 @@
+import logging
+import mmap
+
+from concurrent.futures import ProcessPoolExecutor
+from decoder_forge.context_usage import analyse_context_usage
+from decoder_forge.instruction_stream import iter_instructions
+from itertools import takewhile
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MIN_CHUNK_BYTES = 0x10000
+CHUNKS_PER_JOB = 4
+
+DecodedLine = tuple[int, int, str]
+
+# namespace of the decoder in a worker process
+_worker_ns: dict[str, Any] = {}
+
+
+def format_decoded(adr: int, code: int, out: Any) -> str:
+    """Format one decoded instruction as printed by the decode command."""
+
+    return f"{hex(adr):8} {hex(code):10} {out}"
+
+
+def decoder_writes_context(code: str) -> bool:
+    """Check if the decode function of a generated decoder modifies its context.
+
+    Args:
+        code (str): Source code of the generated decoder.
+
+    Returns:
+        bool: True if any attribute of the context is assigned.
+    """
+
+    return len(analyse_context_usage(code).writes) != 0
+
+
+def iter_decoded_lines(
+    ns: dict[str, Any],
+    data: bytes | bytearray | memoryview | mmap.mmap,
+    start: int,
+    end: Optional[int] = None,
+) -> Iterator[DecodedLine]:
+    """Decode an image from start and yield the formatted instructions.
+
+    Args:
+        ns (dict[str, Any]): Namespace of the generated decoder.
+        data (bytes | bytearray | memoryview | mmap.mmap): The binary image.
+        start (int): Offset of the first instruction in data.
+        end (Optional[int]): Offset behind the last byte to decode.
+
+    Yields:
+        tuple[int, int, str]: The address, the size in bytes and the formatted line.
+    """
+
+    decode = ns["decode"]
+    context = ns["Context"]()
+    decoder_bytes = ns["get_decoder_eval_bytes"]()
+
+    instrs = iter_instructions(
+        data, ns["decode_size"], ns["get_size_eval_bytes"](), decoder_bytes, start, end
+    )
+
+    try:
+        for adr, size, instr in instrs:
+            code = instr >> ((decoder_bytes - size) * 8)
+            yield adr, size, format_decoded(adr, code, decode(instr, context=context))
+    finally:
+        # releases the buffers of data
+        instrs.close()
+
+
+def _init_worker(code: str):
+    _worker_ns.clear()
+    exec(compile(code, "", "exec"), _worker_ns)
+
+
+def _decode_chunk(
+    bin_file: str, chunk_start: int, chunk_stop: int, end: int
+) -> list[DecodedLine]:
+    # decodes all instructions starting in [chunk_start, chunk_stop), the last one
+    # may reach into the following chunk
+    with open(bin_file, "rb") as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            lines = iter_decoded_lines(_worker_ns, data, chunk_start, end)
+            try:
+                return list(takewhile(lambda i: i[0] < chunk_stop, lines))
+            finally:
+                lines.close()
+
+
+def _resync_chunk(
+    entry: int,
+    chunk: list[DecodedLine],
+    chunk_stop: int,
+    redecode: Callable[[int], Iterator[DecodedLine]],
+) -> list[DecodedLine]:
+    """Align the result of a chunk to the address of its first real instruction.
+
+    A worker starts decoding at the chunk boundary, which may lie within an
+    instruction. Decoding is deterministic from any address on, so the worker's
+    result is correct from the first address both streams have in common. Until
+    then the instructions are decoded again, starting from entry.
+    """
+
+    index = {adr: idx for idx, (adr, _, _) in enumerate(chunk)}
+
+    if entry in index:
+        return chunk[index[entry] :]
+
+    out: list[DecodedLine] = []
+    lines = redecode(entry)
+    try:
+        for line in lines:
+            adr = line[0]
+            if adr >= chunk_stop:
+                break
+            if adr in index:
+                out.extend(chunk[index[adr] :])
+                break
+            out.append(line)
+    finally:
+        lines.close()
+    return out
+
+
+def iter_decoded_lines_parallel(
+    code: str,
+    ns: dict[str, Any],
+    bin_file: str,
+    data: bytes | bytearray | memoryview | mmap.mmap,
+    start: int,
+    end: int,
+    jobs: int,
+) -> Iterator[str]:
+    """Decode an image on several processes and yield the lines in address order.
+
+    The range is split into chunks which are decoded by a process pool. Every worker
+    memory maps the image itself. As instructions may have different sizes, a chunk
+    boundary can lie within an instruction. Therefore the result of each chunk is
+    resynchronised with the end of the previous chunk, which makes the output equal
+    to the one of a sequential run. The decoder must not modify its context, every
+    chunk is decoded with a fresh one.
+
+    Args:
+        code (str): Source code of the generated decoder.
+        ns (dict[str, Any]): Namespace of the generated decoder in this process.
+        bin_file (str): Path to the binary image.
+        data (bytes | bytearray | memoryview | mmap.mmap): The binary image.
+        start (int): Offset of the first instruction.
+        end (int): Offset behind the last byte to decode.
+        jobs (int): Number of worker processes.
+
+    Yields:
+        str: The formatted instructions.
+    """
+
+    size_bytes = ns["get_size_eval_bytes"]()
+    chunk_count = max(jobs * CHUNKS_PER_JOB, 1)
+    chunk_bytes = max((end - start) // chunk_count, MIN_CHUNK_BYTES)
+
+    # boundaries keep the alignment of start
+    if size_bytes > 1:
+        chunk_bytes += -chunk_bytes % size_bytes
+
+    bounds = list(range(start, end, chunk_bytes)) + [end]
+    chunks = list(zip(bounds[:-1], bounds[1:]))
+    logger.info(f"Decoding {len(chunks)} chunks on {jobs} processes")
+
+    def redecode(entry: int) -> Iterator[DecodedLine]:
+        return iter_decoded_lines(ns, data, entry, end)
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(code,)
+    ) as executor:
+        results = executor.map(
+            _decode_chunk,
+            [bin_file] * len(chunks),
+            [i for i, _ in chunks],
+            [i for _, i in chunks],
+            [end] * len(chunks),
+        )
+
+        entry = start
+        for (_, chunk_stop), chunk in zip(chunks, results):
+            lines = _resync_chunk(entry, chunk, chunk_stop, redecode)
+            if len(lines) != 0:
+                entry = lines[-1][0] + lines[-1][1]
+
+            for _, _, line in lines:
+                yield line
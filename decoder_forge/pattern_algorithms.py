@@ -1,9 +1,14 @@
 from decoder_forge.bit_pattern import BitPattern
+from decoder_forge.pattern_set import PatternSet
 from functools import reduce
 from dataclasses import dataclass
+from math import log2
 from typing import cast
 from typing import Optional
 
+MAX_LINEAR_SCAN = 4
+MAX_SPLIT_BITS = 2
+
 
 @dataclass(eq=True, frozen=True)
 class DecodeNode:
@@ -117,6 +122,11 @@ UID = str
 BitPatternWithUID = tuple[BitPattern, UID]
 
 
+def _specificity(node: DecodeNode) -> int:
+    # number of fixed bits of a node, more specific nodes are tested first
+    return cast(BitPattern, cast(DecodeLeaf, node).pat).fixedmask.bit_count()
+
+
 def build_decode_tree_by_fixed_bits(
     pats: list[BitPatternWithUID], decoder_width: int
 ) -> DecodeTree:
@@ -125,9 +135,17 @@ def build_decode_tree_by_fixed_bits(
 
     Each BitPattern is first extended to the target decoder_width using
     extend_and_shift_to_msb() and wrapped into a DecodeLeaf. The leaves are grouped into
-    a tree by computing a common fixed mask and splitting the patterns with
-    split_by_mask. Groups with a single pattern are merged, while groups with multiple
-    patterns form subtrees.
+    a tree by computing a common fixed mask and splitting the patterns by the value of
+    their bits within this mask. Groups with a single pattern are merged, while groups
+    with multiple patterns form subtrees. The children of every node are ordered by
+    their number of fixed bits, most specific first. Children with the same number of
+    fixed bits keep the order of the input patterns.
+
+    The patterns of a node are kept in a PatternSet and split in a single pass using
+    integer operations only. Every node is sorted once. Each level of the tree fixes
+    at least one further bit, so a tree of n patterns is built in O(n * log(n) * d),
+    where d <= decoder_width is the depth of the tree. For typical instruction sets d
+    is small and construction is close to O(n * log(n)).
 
     Args:
         pats (list[BitPatternWithUID]): A list of tuples, each containing a BitPattern
@@ -138,86 +156,373 @@ def build_decode_tree_by_fixed_bits(
         DecodeTree: The root node of the constructed decode tree.
 
     Raises:
-        ValueError: If a BitPattern cannot be split with the computed common fixed mask.
+        ValueError: If a BitPattern is longer than decoder_width.
 
      Example:
         >>> tree = build_decode_tree_by_fixed_bits([(pattern1, 'id1'), (pattern2, 'id2')], 8)
         >>> print(tree)
     """
-    pats_unfolded: list[DecodeNode] = [
-        DecodeLeaf(pat=i.extend_and_shift_to_msb(decoder_width), uid=uid)
-        for i, uid in pats
-    ]
+    pset = PatternSet.from_patterns(i for i, _ in pats)
+    pset = pset.extend_and_shift_to_msb(decoder_width)
 
-    root = DecodeTree(pat=None, children=pats_unfolded, uid="")
+    root = DecodeTree(pat=None, children=[], uid="")
 
-    stack: list[DecodeTree] = []
-    stack.append(root)
-
-    def longest_match(i):
-        pat_str = str(i.pat)
-        no_zeros = pat_str.count("0")
-        no_ones = pat_str.count("1")
-        return no_zeros + no_ones
+    # nodes whose children are not built yet, with their patterns and uids
+    stack: list[tuple[DecodeTree, PatternSet, list[UID]]] = []
+    stack.append((root, pset, [uid for _, uid in pats]))
 
     while len(stack) != 0:
-        current_tree = stack.pop()
-        leafs = cast(list[DecodeLeaf], [i for i in current_tree.children])
+        current_tree, pset, uids = stack.pop()
 
-        if len(pats) == 0:
+        if len(pset) == 0:
             continue
 
-        current_tree.children.clear()
+        # split patterns into groups by the value of the common fixed bits
+        mask = pset.common_fixedmask()
 
-        # remember which patterns were orginated by which origin
-        pats_to_uids = {i.pat: i.uid for i in leafs}
+        children: list[DecodeNode] = []
+        for outer_bits, idxs in pset.group_by_fixed_bits(mask).items():
+            if len(idxs) == 1:
+                # a single pattern is not split
+                children.append(DecodeLeaf(pat=pset[idxs[0]], uid=uids[idxs[0]]))
+                continue
 
-        # split pats into groups with fixed bits
-        fgrps = build_groups_by_fixed_bits([i.pat for i in leafs])
+            inner = pset.take(idxs).without_mask(mask)
+            inner_uids = [uids[i] for i in idxs]
 
-        for outer_pat, inner_pats in fgrps.items():
-            if len(inner_pats) == 1:
-                combined_pat = outer_pat.combine(inner_pats[0][0])
-                src_pat = inner_pats[0][1]
-                dleaf = DecodeLeaf(
-                    pat=combined_pat,
-                    uid=pats_to_uids[src_pat],
+            if mask == 0x0:  # catch all
+                children.extend(
+                    DecodeLeaf(pat=pat, uid=uid) for pat, uid in zip(inner, inner_uids)
                 )
-                current_tree.children.append(dleaf)
-
-                # keep children list sorted
-                current_tree.children.sort(key=longest_match, reverse=True)
             else:
-                if outer_pat.fixedmask != 0x0:  # catch all
-                    children: list[DecodeNode] = [
-                        DecodeLeaf(
-                            pat=i,
-                            uid=pats_to_uids[src_pat],
-                        )
-                        for (i, src_pat) in inner_pats
-                    ]
-
-                    dtree = DecodeTree(pat=outer_pat, children=children, uid="")
-                    current_tree.children.append(dtree)
-
-                    # keep children list sorted
-                    current_tree.children.sort(key=longest_match, reverse=True)
-                    stack.append(dtree)  # process during next cycles
-                else:
-                    children = [
-                        DecodeLeaf(
-                            pat=i,
-                            uid=pats_to_uids[src_pat],
-                        )
-                        for (i, src_pat) in inner_pats
-                    ]
-                    current_tree.children.extend(children)
-
-                    # keep children list sorted
-                    current_tree.children.sort(key=longest_match, reverse=True)
+                outer_pat = BitPattern._unchecked(mask, outer_bits, decoder_width)
+                dtree = DecodeTree(pat=outer_pat, children=[], uid="")
+                children.append(dtree)
+                stack.append((dtree, inner, inner_uids))  # process during next cycles
+
+        # sort is stable, equally specific children keep their order
+        children.sort(key=_specificity, reverse=True)
+        current_tree.children.extend(children)
+
     return root
 
 
+def _entropy_term(count: int) -> float:
+    return count * log2(count) if count > 1 else 0.0
+
+
+def _information_gain(pats: list[BitPattern], bit: int) -> float:
+    """Information gain of testing a single bit, wildcard patterns go both ways."""
+
+    count_zero = 0
+    count_one = 0
+    count_wild = 0
+    for pat in pats:
+        if not pat.fixedmask & bit:
+            count_wild += 1
+        elif pat.fixedbits & bit:
+            count_one += 1
+        else:
+            count_zero += 1
+
+    size_zero = count_zero + count_wild
+    size_one = count_one + count_wild
+    total = size_zero + size_one
+
+    after = (_entropy_term(size_zero) + _entropy_term(size_one)) / total
+    return log2(len(pats)) - after
+
+
+def _split_groups(pats: list[BitPattern], mask: int) -> dict[int, list[int]]:
+    """Map every value of the bits in mask to the indices of the compatible
+    patterns."""
+
+    bits = [1 << i for i in range(mask.bit_length()) if mask & (1 << i)]
+    groups: dict[int, list[int]] = {}
+    for value_idx in range(1 << len(bits)):
+        value = 0
+        for pos, bit in enumerate(bits):
+            if value_idx & (1 << pos):
+                value |= bit
+
+        members = [
+            idx
+            for idx, pat in enumerate(pats)
+            if not (pat.fixedbits ^ value) & pat.fixedmask & mask
+        ]
+        if len(members) != 0:
+            groups[value] = members
+    return groups
+
+
+def _expected_compares(group_sizes: list[int]) -> float:
+    """Estimate the mean number of compares to decode through a split.
+
+    The groups are tested in the given order, a group of n patterns is expected to
+    need about 1.5 * log2(n) further compares in its subtree.
+    """
+
+    total = sum(group_sizes)
+    cost = 0.0
+    for rank, size in enumerate(group_sizes, 1):
+        cost += size * (rank + 1.5 * log2(size))
+    return cost / total
+
+
+def _choose_split_mask(pats: list[BitPattern], known_mask: int, max_split_bits: int):
+    candidate_mask = reduce(lambda a, b: a | b, (i.fixedmask for i in pats), 0)
+    candidate_mask &= ~known_mask
+
+    gains = [
+        (_information_gain(pats, 1 << i), i)
+        for i in range(candidate_mask.bit_length())
+        if candidate_mask & (1 << i)
+    ]
+    gains = [i for i in gains if i[0] > 0.0]
+
+    if len(gains) == 0:
+        return 0x0
+
+    # best gain first, higher bits first on equal gain
+    gains.sort(reverse=True)
+
+    split_mask = 1 << gains[0][1]
+    split_cost = _expected_compares(
+        sorted((len(i) for i in _split_groups(pats, split_mask).values()), reverse=True)
+    )
+
+    for _, bit_pos in gains[1:max_split_bits]:
+        mask = split_mask | (1 << bit_pos)
+        cost = _expected_compares(
+            sorted((len(i) for i in _split_groups(pats, mask).values()), reverse=True)
+        )
+        if cost >= split_cost:
+            break
+        split_mask = mask
+        split_cost = cost
+
+    return split_mask
+
+
+def _build_information_gain_children(
+    leafs: list[DecodeLeaf],
+    known_mask: int,
+    max_linear: int,
+    max_split_bits: int,
+) -> list[DecodeNode]:
+    # patterns behind a pattern without unknown bits are never reached
+    for idx, leaf in enumerate(leafs):
+        if leaf.pat.fixedmask & ~known_mask == 0x0:
+            leafs = leafs[: idx + 1]
+            break
+
+    split_mask = 0x0
+    if len(leafs) > max_linear:
+        split_mask = _choose_split_mask(
+            [i.pat for i in leafs], known_mask, max_split_bits
+        )
+
+    if split_mask == 0x0:
+        return [
+            DecodeLeaf(
+                pat=BitPattern(
+                    fixedmask=i.pat.fixedmask & ~known_mask,
+                    fixedbits=i.pat.fixedbits & ~known_mask,
+                    bit_length=i.pat.bit_length,
+                ),
+                uid=i.uid,
+            )
+            for i in leafs
+        ]
+
+    groups = _split_groups([i.pat for i in leafs], split_mask)
+
+    children: list[DecodeNode] = []
+    for value, members in sorted(
+        groups.items(), key=lambda item: len(item[1]), reverse=True
+    ):
+        group_pat = BitPattern(
+            fixedmask=split_mask,
+            fixedbits=value,
+            bit_length=leafs[0].pat.bit_length,
+        )
+        sub_children = _build_information_gain_children(
+            [leafs[i] for i in members],
+            known_mask | split_mask,
+            max_linear,
+            max_split_bits,
+        )
+
+        if len(sub_children) == 1 and isinstance(sub_children[0], DecodeLeaf):
+            # merge the group check into the check of its only pattern
+            children.append(
+                DecodeLeaf(
+                    pat=group_pat.combine(sub_children[0].pat),
+                    uid=sub_children[0].uid,
+                )
+            )
+        else:
+            children.append(DecodeTree(pat=group_pat, children=sub_children, uid=""))
+
+    return children
+
+
+def build_decode_tree_by_information_gain(
+    pats: list[BitPatternWithUID],
+    decoder_width: int,
+    max_linear: int = MAX_LINEAR_SCAN,
+    max_split_bits: int = MAX_SPLIT_BITS,
+) -> DecodeTree:
+    """Build a decode tree by splitting on the most informative bits.
+
+    Each BitPattern is first extended to the target decoder_width using
+    extend_and_shift_to_msb(). Patterns with more fixed bits take precedence over
+    patterns with less fixed bits, patterns with an equal number of fixed bits keep
+    their input order. An instruction word is decoded to the first pattern in this
+    order which matches it.
+
+    At every node the bit with the highest information gain is chosen, where
+    patterns having a wildcard at that bit count for both values. Further bits are
+    added to the split (up to max_split_bits) as long as the estimated mean number
+    of compares decreases. The children of a node are the groups of compatible
+    patterns for each value of the split bits. Groups are mutually exclusive, so a
+    pattern with wildcards at the split bits appears in every compatible group. Only
+    nodes with at most max_linear patterns, or without any informative bit, test
+    their patterns one after another.
+
+    Args:
+        pats (list[BitPatternWithUID]): A list of tuples, each containing a BitPattern
+           and its UID.
+        decoder_width (int): The target bit width for extending each BitPattern.
+        max_linear (int): Maximum number of patterns tested one after another.
+        max_split_bits (int): Maximum number of bits tested by one node.
+
+    Returns:
+        DecodeTree: The root node of the constructed decode tree.
+
+    Example:
+        >>> tree = build_decode_tree_by_information_gain(
+        ...     [(pattern1, 'id1'), (pattern2, 'id2')], 8
+        ... )
+    """
+
+    leafs = [
+        DecodeLeaf(pat=i.extend_and_shift_to_msb(decoder_width), uid=uid)
+        for i, uid in pats
+    ]
+
+    # most specific patterns first, python's sort is stable
+    leafs.sort(key=lambda i: i.pat.fixedmask.bit_count(), reverse=True)
+
+    children: list[DecodeNode] = []
+    if len(leafs) != 0:
+        children = _build_information_gain_children(
+            leafs, 0x0, max_linear, max_split_bits
+        )
+
+    return DecodeTree(pat=None, children=children, uid="")
+
+
+def match_decode_tree(tree: DecodeTree, instr: int) -> Optional[UID]:
+    """Find the pattern a decoder generated from a decode tree selects for a word.
+
+    The children of a node are checked in order and the first matching child is
+    taken. A matching subtree is never left again, even if none of its children
+    matches.
+
+    Args:
+        tree (DecodeTree): The root node of the decode tree.
+        instr (int): The instruction word, extended to the width of the decode tree.
+
+    Returns:
+        Optional[UID]: The uid of the matching leaf or None if no leaf matches.
+
+    Example:
+        >>> match_decode_tree(tree, 0x4770)
+        'UIDA'
+    """
+
+    children = tree.children
+    while True:
+        for child in children:
+            pat = child.pat
+            assert pat is not None
+            if instr & pat.fixedmask == pat.fixedbits:
+                break
+        else:
+            return None
+
+        if isinstance(child, DecodeLeaf):
+            return child.uid
+
+        children = cast(DecodeTree, child).children
+
+
+def _is_disjoint(pat_a: BitPattern, pat_b: BitPattern) -> bool:
+    # two patterns never match the same word if they differ in a common fixed bit
+    return (pat_a.fixedbits ^ pat_b.fixedbits) & pat_a.fixedmask & pat_b.fixedmask != 0
+
+
+def _reorder_children(
+    children: list[DecodeNode], uid_hits: dict[UID, int]
+) -> tuple[list[DecodeNode], int]:
+    weighted: list[tuple[DecodeNode, int]] = []
+    for child in children:
+        if isinstance(child, DecodeTree):
+            sub_children, hits = _reorder_children(child.children, uid_hits)
+            child = DecodeTree(pat=child.pat, uid=child.uid, children=sub_children)
+        else:
+            hits = uid_hits.get(child.uid, 0)
+        weighted.append((child, hits))
+
+    # insertion sort which only swaps neighbours that never match the same word
+    for idx in range(1, len(weighted)):
+        pos = idx
+        while pos > 0:
+            prev, prev_hits = weighted[pos - 1]
+            act, act_hits = weighted[pos]
+            assert prev.pat is not None and act.pat is not None
+            if prev_hits >= act_hits or not _is_disjoint(prev.pat, act.pat):
+                break
+            weighted[pos - 1], weighted[pos] = weighted[pos], weighted[pos - 1]
+            pos -= 1
+
+    return [i for i, _ in weighted], sum(hits for _, hits in weighted)
+
+
+def reorder_decode_tree_by_hits(
+    tree: DecodeTree, uid_hits: dict[UID, int]
+) -> DecodeTree:
+    """Reorder the children of all nodes so that frequently matched ones come first.
+
+    The weight of a leaf is its number of hits, the weight of a subtree is the sum of
+    the hits of its leaves. Children are moved in front of lighter siblings as long as
+    both can never match the same instruction word. Overlapping siblings keep their
+    relative order, so the reordered tree selects the same pattern for every
+    instruction word as the original one.
+
+    Args:
+        tree (DecodeTree): The root node of the decode tree.
+        uid_hits (dict[UID, int]): Number of hits of each leaf uid. Missing uids
+            count as zero hits.
+
+    Returns:
+        DecodeTree: A new decode tree with reordered children.
+
+    Example:
+        >>> tree = reorder_decode_tree_by_hits(tree, {"UIDA": 10, "UIDB": 1000})
+    """
+
+    children, _ = _reorder_children(tree.children, uid_hits)
+    return DecodeTree(pat=tree.pat, uid=tree.uid, children=children)
+
+
+DECODE_TREE_BUILDERS = {
+    "fixed_bits": build_decode_tree_by_fixed_bits,
+    "information_gain": build_decode_tree_by_information_gain,
+}
+
+
 def flatten_decode_tree(
     tree: DecodeTree,
 ) -> list[tuple[BitPattern, UID, int, bool, bool]]:
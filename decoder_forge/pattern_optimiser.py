@@ -0,0 +1,758 @@
+import ast
+import copy
+
+from dataclasses import dataclass
+from decoder_forge.context_usage import assigned_before
+from decoder_forge.context_usage import is_safe_expression
+from typing import AbstractSet
+from typing import Iterable
+from typing import Optional
+
+# a bit field (base >> shift) & mask, a negative shift is a left shift, the mask is
+# None if the value is not masked
+Field = tuple[ast.expr, int, Optional[int]]
+
+# shifts by larger constants are not folded, their results get too large
+MAX_FOLDED_SHIFT = 256
+
+# constants are shown in hex if they are operands of these operators
+_HEX_OPERATORS = (ast.BitAnd, ast.BitOr, ast.BitXor)
+
+# constants folded from these operators are shown in hex
+_HEX_RESULTS = (ast.BitAnd, ast.BitOr, ast.BitXor, ast.LShift, ast.Invert)
+
+_BINARY_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Mod: lambda a, b: a % b if b != 0 else None,
+    ast.FloorDiv: lambda a, b: a // b if b != 0 else None,
+    ast.BitAnd: lambda a, b: a & b,
+    ast.BitOr: lambda a, b: a | b,
+    ast.BitXor: lambda a, b: a ^ b,
+    ast.LShift: lambda a, b: a << b if 0 <= b <= MAX_FOLDED_SHIFT else None,
+    ast.RShift: lambda a, b: a >> b if b >= 0 else None,
+}
+
+_UNARY_OPERATORS = {
+    ast.Invert: lambda a: ~a,
+    ast.USub: lambda a: -a,
+    ast.UAdd: lambda a: +a,
+    ast.Not: lambda a: not a,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+}
+
+# right operands which leave the left operand unchanged
+_NEUTRAL_RIGHT = {
+    ast.Add: 0,
+    ast.Sub: 0,
+    ast.Mult: 1,
+    ast.BitOr: 0,
+    ast.BitXor: 0,
+    ast.LShift: 0,
+    ast.RShift: 0,
+}
+
+# left operands which leave the right operand unchanged
+_NEUTRAL_LEFT = {ast.Add: 0, ast.Mult: 1, ast.BitOr: 0, ast.BitXor: 0}
+
+
+# expressions binding names, the code is not optimised if it contains them
+_SCOPES = (
+    ast.Lambda,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.NamedExpr,
+)
+
+
+class _HexInt(int):
+    # shown in hex by ast.unparse, only used for the output of unparse_pattern
+    def __repr__(self):
+        return hex(self)
+
+
+@dataclass
+class OptimisedPattern:
+    """The optimised code of a pattern.
+
+    Attributes:
+        tree (ast.Module): The optimised statements.
+        operations_before (int): Operations of the code before the optimisation, see
+            count_operations.
+        operations_after (int): Operations of the optimised code.
+    """
+
+    tree: ast.Module
+    operations_before: int
+    operations_after: int
+
+    @property
+    def eliminated(self) -> int:
+        """Number of operations removed by the optimisation."""
+        return self.operations_before - self.operations_after
+
+
+def count_operations(tree: ast.AST) -> int:
+    """Count the operations of Python code.
+
+    Every arithmetic, bitwise, logical and comparison operator and every
+    assignment counts as one operation.
+
+    Args:
+        tree (ast.AST): The code.
+
+    Returns:
+        int: The number of operations.
+    """
+
+    count = 0
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.BinOp, ast.UnaryOp, ast.Assign, ast.AugAssign)):
+            count += 1
+        elif isinstance(node, ast.BoolOp):
+            count += len(node.values) - 1
+        elif isinstance(node, ast.Compare):
+            count += len(node.ops)
+    return count
+
+
+def _is_int(node) -> bool:
+    return (
+        isinstance(node, ast.Constant)
+        and isinstance(node.value, int)
+        and not isinstance(node.value, bool)
+    )
+
+
+def _is_int_valued(node: ast.expr, ints: set[str]) -> bool:
+    # the expression evaluates to an int, never to a bool, if the locals in ints do
+    if isinstance(node, ast.Constant):
+        return _is_int(node)
+    if isinstance(node, ast.Name):
+        return node.id in ints
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, _HEX_OPERATORS):
+            # True | False is a bool, True | 0 an int
+            return _is_int_valued(node.left, ints) or _is_int_valued(node.right, ints)
+        return not isinstance(node.op, ast.Div)
+    if isinstance(node, ast.UnaryOp):
+        return not isinstance(node.op, ast.Not)
+    if isinstance(node, ast.IfExp):
+        return _is_int_valued(node.body, ints) and _is_int_valued(node.orelse, ints)
+    return False
+
+
+def _constant(value, hex: bool = False) -> ast.Constant:
+    node = ast.Constant(value=value, lineno=1, col_offset=0)
+    # shown in hex by unparse_pattern
+    node.df_hex = hex
+    return node
+
+
+def _is_pure(node: ast.AST) -> bool:
+    # evaluating the expression has no side effects
+    return not any(isinstance(i, (ast.Call, ast.NamedExpr)) for i in ast.walk(node))
+
+
+def _names_read(node: ast.AST) -> set[str]:
+    return {
+        i.id
+        for i in ast.walk(node)
+        if isinstance(i, ast.Name) and isinstance(i.ctx, ast.Load)
+    }
+
+
+def _field(node: ast.expr) -> Optional[tuple[Field, int]]:
+    # the bit field computed by shifts and masks with constants and the number of
+    # operators computing it
+    if not isinstance(node, ast.BinOp):
+        return None
+
+    if isinstance(node.op, (ast.RShift, ast.LShift)) and _is_int(node.right):
+        amount = node.right.value
+        if amount < 0:
+            return None
+
+        (base, shift, mask), count = _field(node.left) or ((node.left, 0, None), 0)
+        if isinstance(node.op, ast.RShift):
+            mask = None if mask is None else mask >> amount
+            return (base, shift + amount, mask), count + 1
+
+        # without mask the low bits of a right shift would be shifted back in
+        if mask is None and shift > 0:
+            return None
+        mask = None if mask is None else mask << amount
+        return (base, shift - amount, mask), count + 1
+
+    if isinstance(node.op, ast.BitAnd):
+        for value, other in ((node.right, node.left), (node.left, node.right)):
+            if _is_int(value) and value.value >= 0:
+                (base, shift, mask), count = _field(other) or ((other, 0, None), 0)
+                mask = value.value if mask is None else mask & value.value
+                return (base, shift, mask), count + 1
+
+    return None
+
+
+def _emit_field(field: Field) -> ast.expr:
+    base, shift, mask = field
+    node = base
+    if shift > 0:
+        node = ast.BinOp(left=node, op=ast.RShift(), right=_constant(shift))
+    elif shift < 0:
+        node = ast.BinOp(left=node, op=ast.LShift(), right=_constant(-shift))
+    if mask is not None:
+        node = ast.BinOp(left=node, op=ast.BitAnd(), right=_constant(mask))
+    return node
+
+
+def _or_operands(node: ast.expr) -> list[ast.expr]:
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _or_operands(node.left) + [node.right]
+    return [node]
+
+
+def _merge_or(node: ast.BinOp, ints: set[str]) -> ast.expr:
+    # merges constants and fields of the same base and shift in a chain of ors
+    operands: list = []
+    fields: dict[tuple[str, int], int] = {}
+    constant_index = None
+    for operand in _or_operands(node):
+        if _is_int(operand):
+            if constant_index is None:
+                constant_index = len(operands)
+                operands.append(operand.value)
+            else:
+                operands[constant_index] |= operand.value
+            continue
+
+        field = _field(operand)
+        if field is not None:
+            base, shift, mask = field[0]
+            if mask is not None and _is_pure(base):
+                key = (ast.dump(base), shift)
+                if key in fields:
+                    _, _, merged_mask = operands[fields[key]]
+                    operands[fields[key]] = (base, shift, merged_mask | mask)
+                    continue
+                fields[key] = len(operands)
+                operands.append(field[0])
+                continue
+
+        operands.append(operand)
+
+    # an or with 0 turns a bool into an int
+    keep_zero = len(operands) == 1 or not any(
+        isinstance(i, tuple) or (isinstance(i, ast.expr) and _is_int_valued(i, ints))
+        for i in operands
+    )
+    merged = []
+    for i in operands:
+        if isinstance(i, tuple):
+            merged.append(_emit_field(i))
+        elif isinstance(i, int):
+            if i != 0 or keep_zero:
+                merged.append(_constant(i, hex=True))
+        else:
+            merged.append(i)
+
+    result = merged[0]
+    for i in merged[1:]:
+        result = ast.BinOp(left=result, op=ast.BitOr(), right=i)
+    return result
+
+
+class _Simplifier:
+    # folds constants, propagates constants assigned to locals and fuses shifts
+    # and masks
+
+    def __init__(self):
+        self.env: dict[str, ast.Constant] = {}
+        # locals which hold ints and no bools
+        self.ints: set[str] = {"instr"}
+
+    def expr(self, node: ast.expr) -> ast.expr:
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load) and node.id in self.env:
+                value = self.env[node.id]
+                return _constant(value.value, getattr(value, "df_hex", False))
+            return node
+
+        if isinstance(node, ast.BinOp):
+            return self._binop(
+                ast.BinOp(
+                    left=self.expr(node.left), op=node.op, right=self.expr(node.right)
+                )
+            )
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.expr(node.operand)
+            compute = _UNARY_OPERATORS.get(type(node.op))
+            if compute is not None and _is_int(operand):
+                return _constant(
+                    compute(operand.value), isinstance(node.op, _HEX_RESULTS)
+                )
+            return ast.UnaryOp(op=node.op, operand=operand)
+
+        if isinstance(node, ast.Compare):
+            left = self.expr(node.left)
+            comparators = [self.expr(i) for i in node.comparators]
+            values = [left, *comparators]
+            if all(_is_int(i) for i in values) and all(
+                type(i) in _COMPARE_OPERATORS for i in node.ops
+            ):
+                result = all(
+                    _COMPARE_OPERATORS[type(op)](a.value, b.value)
+                    for op, a, b in zip(node.ops, values, values[1:])
+                )
+                return _constant(result)
+            return ast.Compare(left=left, ops=node.ops, comparators=comparators)
+
+        if isinstance(node, ast.BoolOp):
+            return ast.BoolOp(op=node.op, values=[self.expr(i) for i in node.values])
+
+        if isinstance(node, _SCOPES):
+            # the names of the scope may hide the propagated constants
+            raise _Unsupported()
+
+        # calls, attributes and other expressions keep their structure
+        node = copy.copy(node)
+        for name, value in ast.iter_fields(node):
+            if isinstance(value, ast.expr):
+                setattr(node, name, self.expr(value))
+            elif isinstance(value, list):
+                setattr(node, name, [self._child(i) for i in value])
+        return node
+
+    def _child(self, node):
+        if isinstance(node, ast.expr):
+            return self.expr(node)
+        if isinstance(node, ast.keyword):
+            return ast.keyword(arg=node.arg, value=self.expr(node.value))
+        return node
+
+    def _binop(self, node: ast.BinOp) -> ast.expr:
+        op = type(node.op)
+        if _is_int(node.left) and _is_int(node.right) and op in _BINARY_OPERATORS:
+            value = _BINARY_OPERATORS[op](node.left.value, node.right.value)
+            if value is not None:
+                return _constant(value, isinstance(node.op, _HEX_RESULTS))
+
+        # the operation turns a bool into an int, so the operand must be an int
+        if (
+            _is_int(node.right)
+            and _NEUTRAL_RIGHT.get(op) == node.right.value
+            and _is_int_valued(node.left, self.ints)
+        ):
+            return node.left
+        if (
+            _is_int(node.left)
+            and _NEUTRAL_LEFT.get(op) == node.left.value
+            and _is_int_valued(node.right, self.ints)
+        ):
+            return node.right
+
+        if op is ast.BitOr:
+            return _merge_or(node, self.ints)
+
+        field = _field(node)
+        if field is not None:
+            (base, shift, mask), count = field
+            if (shift != 0) + (mask is not None) < count and (
+                shift != 0 or mask is not None or _is_int_valued(base, self.ints)
+            ):
+                return _emit_field(field[0])
+        return node
+
+    def statements(self, body: list[ast.stmt]) -> list[ast.stmt]:
+        out: list[ast.stmt] = []
+        for stmt in body:
+            out.extend(self.statement(stmt))
+            if isinstance(stmt, ast.Return):
+                # the statements behind a return are never run
+                break
+        return out
+
+    def statement(self, stmt: ast.stmt) -> list[ast.stmt]:
+        if isinstance(stmt, ast.Assign):
+            value = self.expr(stmt.value)
+            for target in stmt.targets:
+                for name in _names_stored(target):
+                    self.env.pop(name, None)
+                    self.ints.discard(name)
+            if len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                if isinstance(value, ast.Constant):
+                    self.env[stmt.targets[0].id] = value
+                if _is_int_valued(value, self.ints):
+                    self.ints.add(stmt.targets[0].id)
+            return [ast.Assign(targets=stmt.targets, value=value, lineno=1)]
+
+        if isinstance(stmt, ast.AugAssign):
+            if isinstance(stmt.target, ast.Name):
+                # x op= y is handled like x = x op y
+                load = ast.Name(id=stmt.target.id, ctx=ast.Load())
+                assign = ast.Assign(
+                    targets=[stmt.target],
+                    value=ast.BinOp(left=load, op=stmt.op, right=stmt.value),
+                    lineno=1,
+                )
+                return self.statement(assign)
+            return [
+                ast.AugAssign(
+                    target=stmt.target, op=stmt.op, value=self.expr(stmt.value)
+                )
+            ]
+
+        if isinstance(stmt, ast.If):
+            test = self.expr(stmt.test)
+            if isinstance(test, ast.Constant):
+                # only one branch is ever run
+                return self.statements(stmt.body if test.value else stmt.orelse)
+
+            env, ints = self.env, self.ints
+            self.env, self.ints = dict(env), set(ints)
+            body = self.statements(stmt.body)
+            body_env, body_ints = self.env, self.ints
+            self.env, self.ints = dict(env), set(ints)
+            orelse = self.statements(stmt.orelse)
+            orelse_env, orelse_ints = self.env, self.ints
+
+            # the constants known after the if, a branch returning adds none
+            if _returns(body):
+                self.env, self.ints = orelse_env, orelse_ints
+            elif _returns(orelse):
+                self.env, self.ints = body_env, body_ints
+            else:
+                self.ints = body_ints & orelse_ints
+                self.env = {
+                    k: v
+                    for k, v in body_env.items()
+                    if k in orelse_env
+                    and orelse_env[k].value == v.value
+                    and type(orelse_env[k].value) is type(v.value)
+                }
+            return [ast.If(test=test, body=body, orelse=orelse)]
+
+        if isinstance(stmt, ast.Return):
+            value = None if stmt.value is None else self.expr(stmt.value)
+            return [ast.Return(value=value)]
+
+        if isinstance(stmt, ast.Expr):
+            return [ast.Expr(value=self.expr(stmt.value))]
+
+        if isinstance(stmt, ast.Assert):
+            return [ast.Assert(test=self.expr(stmt.test), msg=stmt.msg)]
+
+        if isinstance(stmt, ast.Pass):
+            return []
+
+        raise _Unsupported()
+
+
+class _Unsupported(Exception):
+    # the code contains statements the optimiser does not handle
+    pass
+
+
+def _names_stored(target: ast.expr) -> set[str]:
+    return {
+        i.id
+        for i in ast.walk(target)
+        if isinstance(i, ast.Name) and isinstance(i.ctx, ast.Store)
+    }
+
+
+def _returns(body: list[ast.stmt]) -> bool:
+    return len(body) != 0 and isinstance(body[-1], ast.Return)
+
+
+def _has_side_effects(stmt: ast.stmt) -> bool:
+    # the statement calls functions or changes attributes
+    for node in ast.walk(stmt):
+        if isinstance(node, ast.Call):
+            return True
+        if isinstance(node, (ast.Attribute, ast.Subscript)) and not isinstance(
+            node.ctx, ast.Load
+        ):
+            return True
+    return False
+
+
+def _expressions(stmt: ast.stmt) -> list[ast.expr]:
+    # the expressions evaluated by a statement before its nested statements
+    if isinstance(stmt, ast.Assign):
+        return [stmt.value]
+    if isinstance(stmt, (ast.Return, ast.Expr)):
+        return [] if stmt.value is None else [stmt.value]
+    if isinstance(stmt, ast.AugAssign):
+        return [stmt.value]
+    if isinstance(stmt, (ast.If, ast.Assert)):
+        return [stmt.test]
+    return []
+
+
+def _count_loads(nodes: Iterable[ast.AST], name: str) -> int:
+    return sum(
+        1
+        for node in nodes
+        for i in ast.walk(node)
+        if isinstance(i, ast.Name) and i.id == name and isinstance(i.ctx, ast.Load)
+    )
+
+
+class _Substitute(ast.NodeTransformer):
+    def __init__(self, name: str, value: ast.expr):
+        self._name = name
+        self._value = value
+
+    def visit_Name(self, node):
+        if node.id == self._name and isinstance(node.ctx, ast.Load):
+            return self._value
+        return node
+
+
+@dataclass
+class _Safety:
+    # the locals assigned for sure before each statement by its id and the members
+    # of the context, which expressions that cannot raise may read
+    before: dict[int, frozenset[str]]
+    members: AbstractSet[str]
+
+    def safe(self, stmt: ast.stmt, node: ast.expr) -> bool:
+        # the expression evaluated by the statement cannot raise
+        defined = self.before.get(id(stmt), frozenset())
+        return is_safe_expression(node, defined, self.members)
+
+
+def _inline_temporaries(
+    body: list[ast.stmt], live_out: set[str], safety: _Safety
+) -> list[ast.stmt]:
+    # replaces locals read once by the next statements by their value
+    body = list(body)
+    for stmt in body:
+        if isinstance(stmt, ast.If):
+            stmt.body = _inline_temporaries(stmt.body, live_out, safety)
+            stmt.orelse = _inline_temporaries(stmt.orelse, live_out, safety)
+
+    idx = 0
+    while idx < len(body):
+        stmt = body[idx]
+        if not (
+            isinstance(stmt, ast.Assign)
+            and len(stmt.targets) == 1
+            and isinstance(stmt.targets[0], ast.Name)
+            and safety.safe(stmt, stmt.value)
+        ):
+            idx += 1
+            continue
+
+        name = stmt.targets[0].id
+        rest = body[idx + 1 :]
+        if name in live_out or _count_loads(rest, name) != 1:
+            idx += 1
+            continue
+
+        # the statement evaluating the only read and the statements before it
+        # must neither change the value nor the read values
+        reads = _names_read(stmt.value)
+        reads_attributes = any(
+            isinstance(i, (ast.Attribute, ast.Subscript)) for i in ast.walk(stmt.value)
+        )
+        inlined = False
+        for pos, later in enumerate(rest):
+            in_expressions = _count_loads(_expressions(later), name) == 1
+            if not in_expressions and _count_loads([later], name) == 1:
+                # read in a nested statement
+                break
+
+            if in_expressions:
+                target = [i for i in _expressions(later)]
+                for expr in target:
+                    new = _Substitute(name, stmt.value).visit(expr)
+                    _replace_expression(later, expr, new)
+                del body[idx]
+                inlined = True
+                break
+
+            stored = set().union(
+                *(_names_stored(i) for i in ast.walk(later) if isinstance(i, ast.expr))
+            )
+            if name in stored or len(reads & stored) != 0:
+                break
+            if reads_attributes and _has_side_effects(later):
+                break
+
+        if not inlined:
+            idx += 1
+    return body
+
+
+def _replace_expression(stmt: ast.stmt, old: ast.expr, new: ast.expr):
+    for field in ("value", "test"):
+        if getattr(stmt, field, None) is old:
+            setattr(stmt, field, new)
+
+
+def _remove_dead_stores(
+    body: list[ast.stmt], live: set[str], safety: _Safety
+) -> tuple[list[ast.stmt], set[str]]:
+    # removes assignments of locals which are never read, returns the remaining
+    # statements and the locals read by them before assigning them
+    out: list[ast.stmt] = []
+    for stmt in reversed(body):
+        if isinstance(stmt, ast.Return):
+            live = set() if stmt.value is None else _names_read(stmt.value)
+            out.append(stmt)
+
+        elif isinstance(stmt, ast.Assign):
+            stored = set().union(*(_names_stored(i) for i in stmt.targets))
+            if (
+                all(isinstance(i, ast.Name) for i in stmt.targets)
+                and len(stored & live) == 0
+                and safety.safe(stmt, stmt.value)
+            ):
+                continue
+            live = (live - stored) | _names_read(stmt.value)
+            for target in stmt.targets:
+                live |= _names_read(target)
+            out.append(stmt)
+
+        elif isinstance(stmt, ast.If):
+            body_stmts, body_live = _remove_dead_stores(stmt.body, set(live), safety)
+            orelse, orelse_live = _remove_dead_stores(stmt.orelse, set(live), safety)
+            if (
+                len(body_stmts) == 0
+                and len(orelse) == 0
+                and safety.safe(stmt, stmt.test)
+            ):
+                continue
+            if len(body_stmts) == 0:
+                body_stmts = [ast.Pass()]
+            live = body_live | orelse_live | _names_read(stmt.test)
+            out.append(ast.If(test=stmt.test, body=body_stmts, orelse=orelse))
+
+        else:
+            live = live | _names_read(stmt)
+            out.append(stmt)
+
+    out.reverse()
+    return out, live
+
+
+def optimise_pattern(
+    tree: ast.Module, live_out: Iterable[str], context_members: Iterable[str] = ()
+) -> OptimisedPattern:
+    """Optimise the transpiled calls of a pattern.
+
+    The passes are repeated as long as they remove operations:
+
+    - constants are folded and constants assigned to locals are propagated, so
+      flags = 0x0 followed by flags = flags | (1 << 0) becomes flags = 1;
+      branches with a constant condition are replaced by the branch run;
+    - operations with a neutral operand (x >> 0, x | 0, ...) are removed;
+    - shifts and masks of the same value are fused, ((x >> 8) & 0xf) << 4
+      becomes (x >> 4) & 0xf0, and fields of the same value and shift in a chain
+      of ors are merged into one mask;
+    - locals read once by one of the next statements are replaced by their value;
+    - assignments of locals which are never read are removed.
+
+    Comparisons and boolean operators evaluate to booleans, for which x | 0 and x are
+    not the same. Operands are only removed if the result stays an integer.
+    Expressions which may raise or have side effects, see is_safe_expression, are
+    never removed or moved.
+
+    Args:
+        tree (ast.Module): The parsed calls of a pattern. The nodes are not modified.
+        live_out (Iterable[str]): The locals read after the code, e.g. the members
+            of the returned struct.
+        context_members (Iterable[str]): Members of the context, which expressions
+            that are removed or moved may read.
+
+    Returns:
+        OptimisedPattern: The optimised code. If the code contains statements other
+        than assignments, if, return, assert and expressions, it is returned
+        unchanged.
+
+    Example:
+        >>> tree = ast.parse("flags = 0x0\\nflags = flags | (1 << 0)\\n_t = 5")
+        >>> ast.unparse(optimise_pattern(tree, ["flags"]).tree)
+        'flags = 1'
+    """
+
+    live_out = set(live_out)
+    members = frozenset(context_members)
+    operations_before = count_operations(tree)
+
+    module = tree
+    operations_after = operations_before
+    try:
+        while True:
+            body = _Simplifier().statements(module.body)
+            safety = _Safety(assigned_before(body), members)
+            body = _inline_temporaries(body, live_out, safety)
+            body, _ = _remove_dead_stores(body, set(live_out), safety)
+
+            optimised = ast.Module(body=body, type_ignores=[])
+            operations = count_operations(optimised)
+            if operations >= operations_after:
+                break
+            module = optimised
+            operations_after = operations
+    except _Unsupported:
+        pass
+
+    if module is not tree:
+        ast.fix_missing_locations(module)
+
+    return OptimisedPattern(
+        tree=module,
+        operations_before=operations_before,
+        operations_after=operations_after,
+    )
+
+
+def unparse_pattern(tree: ast.Module) -> str:
+    """Turn optimised code into source code.
+
+    Operands of bitwise operators and constants folded from bitwise operators are
+    written in hex.
+
+    Args:
+        tree (ast.Module): The code.
+
+    Returns:
+        str: The source code.
+    """
+
+    operands = [
+        operand
+        for node in ast.walk(tree)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, _HEX_OPERATORS)
+        for operand in (node.left, node.right)
+        if _is_int(operand) and operand.value >= 0
+    ]
+    operands += [
+        node
+        for node in ast.walk(tree)
+        if getattr(node, "df_hex", False) and _is_int(node) and node.value >= 0
+    ]
+
+    # the values are changed while unparsing, so the tree can still be compiled
+    try:
+        for operand in operands:
+            operand.value = _HexInt(operand.value)
+        return ast.unparse(tree)
+    finally:
+        for operand in operands:
+            operand.value = int(operand.value)
@@ -0,0 +1,112 @@
+import logging
+import yaml
+
+from collections import Counter
+from decoder_forge.generate_code import DecoderModel
+from decoder_forge.instruction_stream import iter_instructions
+from decoder_forge.pattern_algorithms import match_decode_tree
+
+logger = logging.getLogger(__name__)
+
+
+def profile_pattern_hits(
+    model: DecoderModel, data: bytes, start: int = 0
+) -> dict[str, int]:
+    """Count how often each pattern of a decoder matches in a binary image.
+
+    The image is split into instructions with the size tree of the model and every
+    instruction word is matched against the decode tree, exactly like the generated
+    decoder does. Each distinct instruction word is only matched once.
+
+    Args:
+        model (DecoderModel): The decoder model.
+        data (bytes): The binary image.
+        start (int): Offset of the first instruction in data.
+
+    Returns:
+        dict[str, int]: Number of hits of every pattern of the model, keyed by the
+        string representation of the pattern.
+
+    Example:
+        >>> hits = profile_pattern_hits(model, data)
+        >>> hits["0100011101110xxx"]
+        312
+    """
+
+    hits = {str(pat): 0 for pat in model.uid_to_pat.values()}
+
+    if model.decode_tree is None:
+        return hits
+
+    size_tree = model.size_tree
+    size_bytes = model.needed_bytes_for_size_eval
+    decoder_bytes = model.needed_bytes_for_code_eval
+
+    def decode_size(data_for_size_eval: int) -> int:
+        if size_tree is None:
+            return model.default_size
+
+        word = data_for_size_eval << ((decoder_bytes - size_bytes) * 8)
+        uid = match_decode_tree(size_tree, word)
+        if uid is None:
+            return model.default_size
+        return model.size_dict[uid]
+
+    words = Counter(
+        instr
+        for _, _, instr in iter_instructions(
+            data, decode_size, size_bytes, decoder_bytes, start
+        )
+    )
+    logger.info(f"Profiled {words.total()} instructions, {len(words)} distinct")
+
+    for instr, count in words.items():
+        uid = match_decode_tree(model.decode_tree, instr)
+        if uid is not None:
+            hits[str(model.uid_to_pat[uid])] += count
+
+    return hits
+
+
+def dump_pattern_hits(hits: dict[str, int]) -> str:
+    """Serialize pattern hits to a YAML mapping, most frequent pattern first.
+
+    Args:
+        hits (dict[str, int]): Number of hits keyed by pattern string.
+
+    Returns:
+        str: The YAML document.
+    """
+
+    ordered = dict(sorted(hits.items(), key=lambda i: i[1], reverse=True))
+    return yaml.safe_dump(ordered, sort_keys=False)
+
+
+def load_pattern_hits(input_yaml: str) -> dict[str, int]:
+    """Parse pattern hits written by dump_pattern_hits.
+
+    Args:
+        input_yaml (str): A YAML mapping from pattern strings to hit counts.
+
+    Returns:
+        dict[str, int]: Number of hits keyed by pattern string.
+
+    Raises:
+        ValueError: If the document is not a mapping of patterns to integers.
+    """
+
+    ins = yaml.safe_load(input_yaml)
+
+    if ins is None:
+        return dict()
+
+    if not isinstance(ins, dict):
+        raise ValueError("Pattern hits must be a mapping of patterns to hit counts")
+
+    hits = dict()
+    for pat, count in ins.items():
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Invalid hit count for pattern {pat}")
+        hits[str(pat)] = count
+
+    return hits
@@ -0,0 +1,193 @@
+from decoder_forge.bit_pattern import BitPattern
+from functools import reduce
+from operator import and_
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+
+class PatternSet:
+    """An ordered collection of bit patterns stored as parallel integer lists.
+
+    The fixedmask, fixedbits and bit_length of the pattern at index i are stored at
+    index i of the lists fixedmasks, fixedbits and bit_lengths. Bulk operations work
+    on these lists directly and do not create BitPattern objects. A BitPattern is only
+    created when a single pattern is accessed.
+
+    Attributes:
+        fixedmasks (list[int]): The fixed masks of the patterns.
+        fixedbits (list[int]): The fixed bits of the patterns.
+        bit_lengths (list[int]): The bit lengths of the patterns.
+
+    Example:
+        >>> pset = PatternSet.from_patterns(
+        ...     [BitPattern.parse_pattern("10x1"), BitPattern.parse_pattern("11xx")]
+        ... )
+        >>> hex(pset.common_fixedmask())
+        '0xc'
+        >>> pset.group_by_fixed_bits(0xC)
+        {8: [0], 12: [1]}
+    """
+
+    __slots__ = ("fixedmasks", "fixedbits", "bit_lengths")
+
+    def __init__(
+        self,
+        fixedmasks: Optional[list[int]] = None,
+        fixedbits: Optional[list[int]] = None,
+        bit_lengths: Optional[list[int]] = None,
+    ):
+        """Initialize a PatternSet from parallel lists.
+
+        The lists are taken over without copying or checking them.
+
+        Args:
+            fixedmasks (Optional[list[int]]): The fixed masks of the patterns.
+            fixedbits (Optional[list[int]]): The fixed bits of the patterns, which must
+                be contained in the fixed masks.
+            bit_lengths (Optional[list[int]]): The bit lengths of the patterns.
+
+        Raises:
+            ValueError: If the lists differ in length.
+        """
+
+        self.fixedmasks = fixedmasks if fixedmasks is not None else []
+        self.fixedbits = fixedbits if fixedbits is not None else []
+        self.bit_lengths = bit_lengths if bit_lengths is not None else []
+
+        if not len(self.fixedmasks) == len(self.fixedbits) == len(self.bit_lengths):
+            raise ValueError("The lists of a PatternSet must have the same length")
+
+    @staticmethod
+    def from_patterns(pats: Iterable[BitPattern]) -> "PatternSet":
+        """Create a PatternSet holding the given patterns in their order.
+
+        Args:
+            pats (Iterable[BitPattern]): The patterns.
+
+        Returns:
+            PatternSet: The new set.
+        """
+
+        pset = PatternSet()
+        for pat in pats:
+            pset.append(pat)
+        return pset
+
+    def append(self, pat: BitPattern):
+        """Append a pattern to the end of the set.
+
+        Args:
+            pat (BitPattern): The pattern.
+        """
+
+        self.fixedmasks.append(pat.fixedmask)
+        self.fixedbits.append(pat.fixedbits)
+        self.bit_lengths.append(pat.bit_length)
+
+    def __len__(self) -> int:
+        return len(self.fixedmasks)
+
+    def __getitem__(self, idx: int) -> BitPattern:
+        return BitPattern._unchecked(
+            self.fixedmasks[idx], self.fixedbits[idx], self.bit_lengths[idx]
+        )
+
+    def __iter__(self) -> Iterator[BitPattern]:
+        for fixedmask, fixedbits, bit_length in zip(
+            self.fixedmasks, self.fixedbits, self.bit_lengths
+        ):
+            yield BitPattern._unchecked(fixedmask, fixedbits, bit_length)
+
+    def common_fixedmask(self) -> int:
+        """Compute the bits which are fixed in every pattern of the set.
+
+        Returns:
+            int: The bitwise AND of all fixed masks.
+
+        Raises:
+            ValueError: If the set is empty.
+        """
+
+        if len(self.fixedmasks) == 0:
+            raise ValueError("An empty PatternSet has no common fixed mask")
+
+        return reduce(and_, self.fixedmasks)
+
+    def group_by_fixed_bits(self, mask: int) -> dict[int, list[int]]:
+        """Group the patterns by the value of their bits within a mask.
+
+        The mask should be contained in the fixed mask of every pattern, for example
+        the result of common_fixedmask.
+
+        Args:
+            mask (int): The bits used for grouping.
+
+        Returns:
+            dict[int, list[int]]: The indices of the patterns keyed by their fixed bits
+            within mask. Groups and indices are in the order of the set.
+        """
+
+        groups: dict[int, list[int]] = {}
+        for idx, fixedbits in enumerate(self.fixedbits):
+            groups.setdefault(fixedbits & mask, []).append(idx)
+        return groups
+
+    def take(self, indices: Iterable[int]) -> "PatternSet":
+        """Select patterns by their indices.
+
+        Args:
+            indices (Iterable[int]): Indices of the selected patterns.
+
+        Returns:
+            PatternSet: A new set with the selected patterns in the order of indices.
+        """
+
+        indices = list(indices)
+        return PatternSet(
+            [self.fixedmasks[i] for i in indices],
+            [self.fixedbits[i] for i in indices],
+            [self.bit_lengths[i] for i in indices],
+        )
+
+    def without_mask(self, mask: int) -> "PatternSet":
+        """Turn the bits of a mask into wildcards in every pattern.
+
+        This is the second part of BitPattern.split_by_mask applied to all patterns.
+
+        Args:
+            mask (int): The bits to remove.
+
+        Returns:
+            PatternSet: A new set with the remaining fixed bits of every pattern.
+        """
+
+        keep = ~mask
+        return PatternSet(
+            [i & keep for i in self.fixedmasks],
+            [i & keep for i in self.fixedbits],
+            list(self.bit_lengths),
+        )
+
+    def extend_and_shift_to_msb(self, bit_length: int) -> "PatternSet":
+        """Extend all patterns to bit_length, see BitPattern.extend_and_shift_to_msb.
+
+        Args:
+            bit_length (int): The bit length of the extended patterns.
+
+        Returns:
+            PatternSet: A new set with the extended patterns.
+
+        Raises:
+            ValueError: If a pattern is longer than bit_length.
+        """
+
+        if any(i > bit_length for i in self.bit_lengths):
+            raise ValueError("BitPattern bit length is to big")
+
+        shifts = [bit_length - i for i in self.bit_lengths]
+        return PatternSet(
+            [i << shift for i, shift in zip(self.fixedmasks, shifts)],
+            [i << shift for i, shift in zip(self.fixedbits, shifts)],
+            [bit_length] * len(shifts),
+        )
@@ -0,0 +1,93 @@
+from decoder_forge.pattern_algorithms import DecodeTree
+from decoder_forge.pattern_algorithms import flatten_decode_tree
+from decoder_forge.pattern_algorithms import UID
+from decoder_forge.pattern_algorithms import match_decode_tree
+from dataclasses import dataclass
+
+MAX_SIZE_TABLE_BITS = 16
+
+
+@dataclass(eq=True, frozen=True)
+class SizeTable:
+    """Lookup table replacing the size tree of a decoder.
+
+    The table holds the size of an instruction for every value of the word passed to
+    decode_size, so the size is found with a single index operation.
+
+    Attributes:
+        bits (int): Bit width of the words indexing the table.
+        runs (list[tuple[int, int]]): Run-length encoded table. Each tuple holds the
+            number of consecutive entries and their size in bits.
+    """
+
+    bits: int
+    runs: list[tuple[int, int]]
+
+    def max_size(self) -> int:
+        """Return the largest size in the table."""
+
+        return max(size for _, size in self.runs)
+
+
+def build_size_table(
+    size_tree: DecodeTree,
+    size_dict: dict[UID, int],
+    default_size: int,
+    decoder_width: int,
+    bits: int,
+    max_bits: int = MAX_SIZE_TABLE_BITS,
+) -> SizeTable:
+    """Evaluate a size tree for every word passed to decode_size.
+
+    The words hold the most significant bits of an instruction. Words for which the
+    size tree does not find a size get default_size, like in the size decoder
+    generated from the tree. The tree is evaluated once for every combination of the
+    bits tested by its patterns; all other bits do not change the size.
+
+    Args:
+        size_tree (DecodeTree): The minimized size tree.
+        size_dict (dict[UID, int]): Maps the uids of the size tree to sizes in bits.
+        default_size (int): Size of the words not matched by the size tree.
+        decoder_width (int): The bit width of the size tree.
+        bits (int): Bit width of the words passed to decode_size.
+        max_bits (int): Upper limit for bits, the table has 2**bits entries.
+
+    Returns:
+        SizeTable: The lookup table.
+
+    Raises:
+        ValueError: If bits is not between 1 and max_bits or larger than
+            decoder_width.
+
+    Example:
+        >>> table = build_size_table(size_tree, size_dict, 0, 32, 16)
+        >>> table.runs[:2]
+        [(59392, 16), (6144, 32)]
+    """
+
+    if not (0 < bits <= min(max_bits, decoder_width)):
+        raise ValueError(f"Size table index must have between 1 and {max_bits} bits")
+
+    shift = decoder_width - bits
+
+    # the tree is only evaluated once for every combination of the bits it tests
+    used = 0
+    for pat, _, _, _, _ in flatten_decode_tree(size_tree):
+        used |= pat.fixedmask >> shift
+
+    sizes: dict[int, int] = {}
+    runs: list[tuple[int, int]] = []
+    for word in range(1 << bits):
+        key = word & used
+        size = sizes.get(key)
+        if size is None:
+            uid = match_decode_tree(size_tree, key << shift)
+            size = default_size if uid is None else size_dict[uid]
+            sizes[key] = size
+
+        if len(runs) != 0 and runs[-1][1] == size:
+            runs[-1] = (runs[-1][0] + 1, size)
+        else:
+            runs.append((1, size))
+
+    return SizeTable(bits=bits, runs=runs)
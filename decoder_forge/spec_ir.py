@@ -0,0 +1,174 @@
+import marshal
+import yaml
+
+from decoder_forge.associated_struct_repo import AssociatedStructRepo
+from decoder_forge.bit_pattern import BitPattern
+from typing import Any
+
+SPEC_IR_MAGIC = b"DFSPEC\0\1"
+
+# version of the data stored in a compiled spec
+SPEC_IR_VERSION = 1
+
+# libyaml's loader is an order of magnitude faster than the pure Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SECTIONS = ("context", "patterns", "struct_def", "deffun")
+
+# key of the pre-parsed patterns in a format loaded from a compiled spec
+BIT_PATTERNS_KEY = "bit_patterns"
+
+
+def is_spec_ir(spec: str | bytes) -> bool:
+    """Check if a format description is a compiled spec, see compile_spec."""
+
+    return isinstance(spec, bytes) and spec.startswith(SPEC_IR_MAGIC)
+
+
+def parse_yaml(input_yaml: str) -> Any:
+    """Parse YAML with libyaml if available, otherwise with the Python parser.
+
+    Raises:
+        yaml.YAMLError: If the input YAML cannot be parsed.
+    """
+
+    return yaml.load(input_yaml, Loader=YAML_LOADER)
+
+
+def load_spec(spec: str | bytes) -> dict:
+    """Load a format description and add the missing top level sections.
+
+    Args:
+        spec (str | bytes): A YAML string containing pattern definitions and
+            additional context, or a spec compiled with compile_spec.
+
+    Returns:
+        dict: The format with the sections "context", "patterns", "struct_def" and
+        "deffun". A format loaded from a compiled spec additionally holds the parsed
+        patterns, see pattern_list.
+
+    Raises:
+        yaml.YAMLError: If the input YAML cannot be parsed.
+        ValueError: If a compiled spec is invalid or has another version.
+    """
+
+    if isinstance(spec, bytes):
+        if not is_spec_ir(spec):
+            raise ValueError("Data is not a compiled spec")
+
+        try:
+            ir = marshal.loads(spec[len(SPEC_IR_MAGIC) :])
+        except (EOFError, TypeError, ValueError) as e:
+            raise ValueError("Compiled spec is damaged") from e
+
+        if not isinstance(ir, dict) or ir.get("version") != SPEC_IR_VERSION:
+            raise ValueError("Compiled spec was created by another version")
+
+        ins = ir["format"]
+        ins[BIT_PATTERNS_KEY] = ir["bit_patterns"]
+        return ins
+
+    ins = parse_yaml(spec)
+
+    if ins is None:
+        ins = {}
+
+    for section in SECTIONS:
+        if section not in ins:
+            ins[section] = dict()
+
+    return ins
+
+
+def pattern_list(ins: dict) -> list[tuple[Any, BitPattern]]:
+    """Return the patterns of a format with their keys in the order of the format.
+
+    Patterns of a format loaded from a compiled spec are not parsed again.
+
+    Args:
+        ins (dict): The format, see load_spec.
+
+    Returns:
+        list[tuple[Any, BitPattern]]: The key of each pattern in ins["patterns"] and
+        the parsed pattern.
+    """
+
+    bit_patterns = ins.get(BIT_PATTERNS_KEY)
+    if bit_patterns is not None:
+        return [
+            (key, BitPattern(*bits))
+            for key, bits in zip(ins["patterns"].keys(), bit_patterns)
+        ]
+
+    return [(key, BitPattern.parse_pattern(str(key))) for key in ins["patterns"]]
+
+
+def validate_format(ins: dict):
+    """Check the structure of a format description.
+
+    Args:
+        ins (dict): The format, see load_spec.
+
+    Raises:
+        ValueError: If a section is not a mapping, a pattern is invalid, a pattern
+            refers to an unknown struct or a function has no operation.
+    """
+
+    for section in SECTIONS:
+        if not isinstance(ins[section], dict):
+            raise ValueError(f"Section {section} must be a mapping")
+
+    # raises ValueError for a struct named Undef
+    as_repo = AssociatedStructRepo.build(struct_def=ins["struct_def"], pat_repo={})
+    struct_names = {i.name for i in as_repo.structs}
+
+    for key, dct in ins["patterns"].items():
+        BitPattern.parse_pattern(str(key))
+
+        if not isinstance(dct, dict):
+            raise ValueError(f"Definition of pattern {key} must be a mapping")
+
+        if "to" in dct and dct["to"] not in struct_names:
+            raise ValueError(f"Pattern {key} refers to unknown struct {dct['to']}")
+
+        calls = dct.get("call", [])
+        if not isinstance(calls, list) or not all(isinstance(i, str) for i in calls):
+            raise ValueError(f"Calls of pattern {key} must be a list of strings")
+
+    for name, fun in ins["deffun"].items():
+        if not isinstance(fun, dict) or "op" not in fun:
+            raise ValueError(f"Function {name} must be a mapping with an op")
+
+
+def compile_spec(input_yaml: str) -> bytes:
+    """Parse and validate a format description and compile it for fast loading.
+
+    The compiled spec holds the parsed format, including the function definitions
+    as plain dicts and lists, and the fixed mask, fixed bits and bit length of every
+    pattern. It is serialized with marshal and loads in a fraction of the time the
+    YAML parser needs. All functions accepting a format also accept a compiled spec.
+
+    Args:
+        input_yaml (str): A YAML string containing pattern definitions.
+
+    Returns:
+        bytes: The compiled spec, starting with SPEC_IR_MAGIC.
+
+    Raises:
+        yaml.YAMLError: If the input YAML cannot be parsed.
+        ValueError: If the format is invalid, see validate_format.
+
+    Example:
+        >>> spec = compile_spec(input_yaml)
+        >>> load_spec(spec)["struct_def"] == load_spec(input_yaml)["struct_def"]
+        True
+    """
+
+    ins = load_spec(input_yaml)
+    validate_format(ins)
+
+    bit_patterns = [
+        (pat.fixedmask, pat.fixedbits, pat.bit_length) for _, pat in pattern_list(ins)
+    ]
+    ir = {"version": SPEC_IR_VERSION, "format": ins, "bit_patterns": bit_patterns}
+    return SPEC_IR_MAGIC + marshal.dumps(ir)
@@ -1,5 +1,10 @@
+import re
 import yaml
 
+from functools import lru_cache
+from types import CodeType
+from typing import Optional
+
 
 class VisitorPython:
     """A visitor class for generating Python code from an AST-like structure.
@@ -20,6 +25,12 @@ class VisitorPython:
         """
         self._call = call
 
+    # OPERANDS
+    # ----------------
+    def do_name(self, expr):
+        """Translates an operand, which is a name or a literal."""
+        return expr
+
     # VARIADIC
     # ----------------
     def do_add(self, *args):
@@ -67,7 +78,7 @@ class VisitorPython:
 
     def do_less(self, left, right):
         return f"{left} < {right}"
-    
+
     def do_is_not_equal(self, left, right):
         """Generates a string representing the not equality check between two operands."""
         return f"{left} != {right}"
@@ -126,8 +137,8 @@ class VisitorPython:
 
     def do_eval(self, expr, placeholders):
         """Evaluates an expression using the provided placeholders."""
-        py_expr = expr.replace("$", "_ph_")
-        return str(eval(py_expr, {"_ph_" + k: v for k, v in placeholders.items()}))
+        code = compile_eval_expression(expr)
+        return str(eval(code, {"_ph_" + k: v for k, v in placeholders.items()}))
 
     def do_switch(self, var, *cond_then):
         out = ""
@@ -164,6 +175,163 @@ class VisitorPython:
         return out
 
 
+# a struct construction like Name(a, b)
+_STRUCT_CONSTRUCTION = re.compile(r"\s*([A-Za-z_]\w*)\s*\((.*)\)\s*", re.DOTALL)
+
+
+class VisitorC(VisitorPython):
+    """A visitor class for generating C code from an AST-like structure.
+
+    The generated code is meant to be placed in the decode function of the C
+    template. All values are int64_t locals, attributes of the context are accessed
+    through the context pointer and returning a struct fills the output record. The
+    names of all assigned locals are collected in the attribute assigned, so that the
+    template can declare them.
+
+    C and Python differ for signed division, modulo and right shifts of negative
+    values and for values exceeding 64 bits. Formats relying on these produce different
+    results in both languages.
+
+    Attributes:
+        assigned (set[str]): Names of the locals assigned by the generated code.
+    """
+
+    def __init__(self, call, struct_names=()):
+        """Initializes the VisitorC instance.
+
+        Args:
+            call (Callable): A function to handle function call translations.  It should
+                accept two arguments: the expression to call and a dictionary of
+                placeholder values.
+            struct_names (Iterable[str]): Names of the structs which can be returned.
+        """
+        super().__init__(call)
+        self._struct_names = set(struct_names)
+        self.assigned: set[str] = set()
+
+    # OPERANDS
+    # ----------------
+    def do_name(self, expr):
+        """Accesses attributes of the context through the context pointer."""
+        if isinstance(expr, str) and expr.startswith("context."):
+            return "context->" + expr[len("context.") :]
+        return expr
+
+    # VARIADIC
+    # ----------------
+    def do_logical_and(self, *args):
+        """Generates a string representing the logical AND operation."""
+        return " && ".join(str(i) for i in args)
+
+    def do_logical_or(self, *args):
+        """Generates a string representing the logical OR operation."""
+        return " || ".join(str(i) for i in args)
+
+    # BINARY
+    # ----------------
+    # comparisons bind stronger than bitwise operators in C, unlike in Python
+    def do_is_equal(self, left, right):
+        """Generates a string representing the equality check between two operands."""
+        return f"({left}) == ({right})"
+
+    def do_less(self, left, right):
+        return f"({left}) < ({right})"
+
+    def do_is_not_equal(self, left, right):
+        """Generates a string representing the not equality check between two operands."""
+        return f"({left}) != ({right})"
+
+    def do_shiftleft(self, left, right):
+        """Generates a left shift, which is done in 64 bits like in Python."""
+        return f"(int64_t){left} << {right}"
+
+    # UNARY
+    # ----------------
+    def do_logical_not(self, expr):
+        return f"!({expr})"
+
+    def do_assert(self, expr):
+        """Generates a string representing an assert statement."""
+        return f"assert({expr});"
+
+    # SPECIAL
+    # ----------------
+    def do_assign(self, target, expr, comment):
+        """Generates an assignment and records the assigned local."""
+        target = self.do_name(str(target))
+        if "->" not in target:
+            self.assigned.add(target)
+
+        if comment is None:
+            return f"{target} = {expr};"
+        else:
+            return f"{target} = {expr};  /* {comment} */"
+
+    def do_return(self, expr, comment):
+        """Generates the return of a struct, which fills the output record.
+
+        Raises:
+            ValueError: If expr does not construct a struct.
+        """
+        match = _STRUCT_CONSTRUCTION.fullmatch(str(expr))
+        if match is None or match.group(1) not in self._struct_names:
+            raise ValueError(f"The C backend can only return structs, not {expr}")
+
+        code = f"DF_RETURN_{match.group(1)}({match.group(2)});"
+        if comment is None:
+            return code
+        else:
+            return f"{code}  /* {comment} */"
+
+    def do_call(self, expr, placeholders, comment):
+        """Generates a string representing a function call, optionally with a
+        comment."""
+        if comment is None:
+            return f"{self._call(expr, placeholders)}"
+        else:
+            return f"{self._call(expr, placeholders)}  /* {comment} */"
+
+    def do_switch(self, var, *cond_then):
+        out = ""
+        for idx, (cond, then) in enumerate(cond_then):
+            out += "if" if idx == 0 else "} else if"
+            out += f" ({var} == {cond}) {{\n"
+            for line in then.split("\n"):
+                out += f"    {line}\n"
+        if len(cond_then) != 0:
+            out += "}\n"
+        return out
+
+    def do_if(self, cond, then, el):
+        """Generates a string representing an if-else statement."""
+        out = f"if ({cond}) {{\n"
+        for line in then.split("\n"):
+            out += f"    {line}\n"
+
+        if el is not None:
+            out += "} else {\n"
+            for line in el.split("\n"):
+                out += f"    {line}\n"
+        out += "}\n"
+        return out
+
+
+@lru_cache(maxsize=None)
+def compile_eval_expression(expr: str) -> CodeType:
+    """Compile the expression of an eval node, placeholders become _ph_ variables.
+
+    The compiled code is cached, every distinct expression is only compiled once.
+
+    Args:
+        expr (str): The Python expression with $ placeholders.
+
+    Returns:
+        CodeType: The compiled expression.
+    """
+
+    return compile(expr.replace("$", "_ph_"), "<eval>", "eval")
+
+
 def transpill_recurse(visitor: VisitorPython, node, placeholders: dict[str, str]):
     """Recursively traverses the AST and translates nodes into Python code.
 
@@ -209,7 +377,7 @@ def transpill_recurse(visitor: VisitorPython, node, placeholders: dict[str, str]
             arg = transpill_recurse(visitor, node, placeholders)
         else:
             expr = node
-            arg = replace_placeholders(expr)
+            arg = visitor.do_name(replace_placeholders(expr))
         return arg
 
     # VARIADIC
@@ -413,10 +581,43 @@ def transpill(
 
     ast = yaml.load(yaml_ast, Loader=yaml.Loader)
 
+    return transpill_ast(ast, placeholders=placeholders, call=call)
+
+
+def transpill_ast(
+    ast: Optional[dict],
+    placeholders: dict[str, str] = dict(),
+    call=lambda name, args: "",
+    visitor: Optional[VisitorPython] = None,
+) -> str:
+    """Transpiles an already parsed AST into Python code.
+
+    Same as transpill, but without parsing YAML. The AST is not modified.
+
+    Args:
+        ast (Optional[dict]): The AST as loaded from YAML. None is treated as an
+            empty AST.
+        placeholders (dict[str, str], optional): A mapping for placeholder replacement
+            in expressions.  Defaults to an empty dictionary.
+        call (Callable, optional): A function to handle function call translation.
+            It should accept two parameters: the expression and the placeholders.
+            Defaults to a lambda function returning an empty string.
+        visitor (Optional[VisitorPython]): The visitor generating the code, for
+            example a VisitorC. Defaults to a VisitorPython using call.
+
+    Returns:
+        str: The generated code.
+
+    Example:
+        >>> transpill_ast({"op": "add", "args": ["a", "b"]})
+        'a + b'
+    """
+
     if ast is None:
         ast = dict()
 
-    visitor = VisitorPython(call=call)
+    if visitor is None:
+        visitor = VisitorPython(call=call)
     code = transpill_recurse(visitor, ast, placeholders)
 
     return code
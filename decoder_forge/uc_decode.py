@@ -1,87 +1,252 @@
 import logging
 
 import io
+import mmap
+from decoder_forge.decoder_build import CodePrinter
+from decoder_forge.decoder_build import build_decoder
+from decoder_forge.associated_struct_repo import StructDef
+from decoder_forge.generate_code import generate_code
+from decoder_forge.generate_code import load_structs
+from decoder_forge.i_c_decoder import ICDecoderBuilder
+from decoder_forge.i_decoder_cache import IDecoderCache
 from decoder_forge.i_printer import IPrinter
 from decoder_forge.i_template_engine import ITemplateEngine
-from decoder_forge.generate_code import generate_code
-from math import ceil
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.instruction_stream import iter_instructions
+from decoder_forge.output_formats import CHUNK_ROWS
+from decoder_forge.output_formats import OUTPUT_FORMATS
+from decoder_forge.output_formats import RowFormatter
+from decoder_forge.output_formats import struct_row_getters
+from decoder_forge.parallel_decode import decoder_writes_context
+from decoder_forge.parallel_decode import format_decoded
+from decoder_forge.parallel_decode import iter_decoded_lines_parallel
+from contextlib import closing
+from itertools import islice
+from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TypeVar
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-class CodePrinter(IPrinter):
-    def __init__(self):
-        self._file_object = io.StringIO()
 
-    def to_string(self):
-        self._file_object.seek(0)
-        return self._file_object.read()
+def iter_decode(
+    ns: dict[str, Any],
+    data: bytes | bytearray | memoryview,
+    start: int = 0,
+    end: Optional[int] = None,
+    count: Optional[int] = None,
+) -> Iterator[tuple[int, int, int, Any]]:
+    """Decode a binary image with a generated decoder.
 
-    def print(self, out: str):
-        self._file_object.write(out)
-        self._file_object.write("\n")
+    Args:
+        ns (dict[str, Any]): Namespace of the generated decoder.
+        data (bytes | bytearray | memoryview): The binary image.
+        start (int): Offset of the first instruction in data.
+        end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+            end of data.
+        count (Optional[int]): Maximum number of instructions to decode. Defaults to
+            all instructions between start and end.
 
+    Yields:
+        tuple[int, int, int, Any]: The address, the size in bytes, the instruction as
+        stored in the image and the decoded instruction.
 
-def uc_decode(
-    printer: IPrinter,
-    tengine: ITemplateEngine,
-    input_yaml: str,
-    decoder_width: int,
-    bin_file: str,
-):
-    logger.info("Call: uc_decode")
-    code_printer = CodePrinter()
-    generate_code(input_yaml, decoder_width, tengine, code_printer)
-    code = code_printer.to_string()
-    compiled_code = compile(code, "", "exec")
+    Example:
+        >>> for adr, size, code, out in iter_decode(ns, data, start=0xD4):
+        ...     print(hex(adr), out)
+    """
 
-    ns: dict[str, Callable] = {}
+    decode = ns["decode"]
+    context = ns["Context"]()
+    decoder_bytes = ns["get_decoder_eval_bytes"]()
 
-    exec(compiled_code, ns)
+    instrs = iter_instructions(
+        data, ns["decode_size"], ns["get_size_eval_bytes"](), decoder_bytes, start, end
+    )
 
-    Context = ns["Context"]
-    decode = ns["decode"]
-    decode_size = ns["decode_size"]
+    try:
+        for adr, size, instr in islice(instrs, count):
+            code = instr >> ((decoder_bytes - size) * 8)
+            yield adr, size, code, decode(instr, context=context)
+    finally:
+        # releases the buffers of data
+        instrs.close()
 
-    context = Context()
 
-    size_bytes = ns["get_size_eval_bytes"]()
-    decoder_bytes = ns["get_decoder_eval_bytes"]()
+def _iter_chunks(items: Iterable[T], size: int = CHUNK_ROWS) -> Iterator[list[T]]:
+    items = iter(items)
+    while len(chunk := list(islice(items, size))) != 0:
+        yield chunk
 
-    adr = 0xD4
-    with open(bin_file, "rb") as fp:
 
-        fp.seek(adr)
+def _write(printer: IPrinter, out: str | bytes):
+    if isinstance(out, bytes):
+        printer.write_bytes(out)
+    else:
+        printer.write(out)
 
-        for i in range(0, 50000):
-            # read enough data to estimate the size of the following code
-            raw_size_code = fp.read(size_bytes)
 
-            if len(raw_size_code) < size_bytes:
-                break
+def uc_decode(
+    printer: IPrinter,
+    tengine: ITemplateEngine,
+    input_yaml: str | bytes,
+    decoder_width: int,
+    bin_file: str,
+    options: Optional[GeneratorOptions] = None,
+    start: int = 0,
+    end: Optional[int] = None,
+    count: Optional[int] = None,
+    jobs: int = 1,
+    cache: Optional[IDecoderCache] = None,
+    c_builder: Optional[ICDecoderBuilder] = None,
+    output_format: str = "text",
+):
+    """Decode a binary image and write the instructions in an output format.
+
+    The image is memory mapped, so its size is only limited by the address space.
+    The instructions are formatted in chunks of CHUNK_ROWS and every chunk is written
+    with a single call of the printer. The text format prints one line per
+    instruction; see RowFormatter for the other formats.
+
+    With more than one job the text output is decoded by a process pool, unless a
+    count is given or the decoder modifies its context. The output is the same in
+    both cases.
+
+    If the language of the options is "c", a C decoder is generated and built with
+    c_builder. It decodes the image in a single process.
+
+    Args:
+        printer (IPrinter): Printer receiving the decoded instructions.
+        tengine (ITemplateEngine): Template engine used to generate the decoder.
+        input_yaml (str | bytes): A YAML string containing pattern definitions, or a
+            spec compiled with compile_spec.
+        decoder_width (int): The bit width to be used when constructing the decode tree.
+        bin_file (str): Path to the binary image.
+        options (Optional[GeneratorOptions]): Options of the code generator.
+        start (int): Offset of the first instruction in the image.
+        end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+            end of the image.
+        count (Optional[int]): Maximum number of instructions to decode.
+        jobs (int): Number of processes decoding the image.
+        cache (Optional[IDecoderCache]): Cache of generated decoders.
+        c_builder (Optional[ICDecoderBuilder]): Builds C decoders.
+        output_format (str): One of OUTPUT_FORMATS.
+
+    Raises:
+        ValueError: If a C decoder is requested without c_builder or if the output
+            format is unknown.
+    """
+
+    logger.info("Call: uc_decode")
 
-            # read the part of the code which is necessary to estimate its size
-            data_for_size_eval = int.from_bytes(raw_size_code, "little")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format {output_format}, "
+            + f"expected one of {', '.join(OUTPUT_FORMATS)}"
+        )
+
+    if options is not None and options.language == "c":
+        if c_builder is None:
+            raise ValueError("Decoding with a C decoder requires a C decoder builder")
+
+        code_printer = CodePrinter()
+        generate_code(input_yaml, decoder_width, tengine, code_printer, options)
+        c_decoder = c_builder.build(code_printer.to_string())
+        formatter = RowFormatter(
+            output_format,
+            [
+                StructDef(name=name, members=members)
+                for name, members in zip(
+                    c_decoder.struct_names, c_decoder.struct_members
+                )
+            ],
+        )
+        widths = [len(i) for i in c_decoder.struct_members]
+
+        with open(bin_file, "rb") as fp:
+            _write(printer, formatter.header())
+
+            # an empty file cannot be memory mapped
+            if fp.seek(0, io.SEEK_END) == 0:
+                return
+
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for adr, records, decoded in c_decoder.iter_record_chunks(
+                    data, start, end, count
+                ):
+                    rows = [
+                        (
+                            adr + rec.address,
+                            rec.size,
+                            rec.code,
+                            rec.structure,
+                            tuple(rec.fields[: widths[rec.structure]]),
+                        )
+                        for rec in records[:decoded]
+                    ]
+                    for chunk in _iter_chunks(rows):
+                        _write(printer, formatter.format(chunk))
+        return
+
+    code, compiled_code = build_decoder(
+        tengine, input_yaml, decoder_width, options, cache
+    )
 
-            # calculate size of the following code
-            act_instr_size = int(ceil(decode_size(data_for_size_eval) / 8))
+    ns: dict[str, Callable] = {}
 
-            to_shift = decoder_bytes - act_instr_size
+    exec(compiled_code, ns)
 
-            # read the code
-            if to_shift > 0:
-                short_instr = data_for_size_eval
-                instr = short_instr << (to_shift * 8)
-                print(f"{hex(adr):8} {hex(short_instr):10} ", end="")
-                adr += 2
-            else:
-                missing_bytes = decoder_bytes - size_bytes
-                instr = data_for_size_eval << (missing_bytes * 8)
-                instr |= int.from_bytes(fp.read(missing_bytes), "little")
-                print(f"{hex(adr):8} {hex(instr):10} ", end="")
-                adr += 4
+    formatter = None
+    if output_format != "text":
+        formatter = RowFormatter(output_format, load_structs(input_yaml))
+        _write(printer, formatter.header())
 
-            # decode
-            out = decode(instr, context=context)
-            print(out)
+    with open(bin_file, "rb") as fp:
+        # an empty file cannot be memory mapped
+        if fp.seek(0, io.SEEK_END) == 0:
+            return
+
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            parallel = jobs > 1 and count is None and formatter is None
+            if parallel and not decoder_writes_context(code):
+                stop = len(data) if end is None else min(end, len(data))
+                for lines in _iter_chunks(
+                    iter_decoded_lines_parallel(
+                        code, ns, bin_file, data, start, stop, jobs
+                    )
+                ):
+                    lines.append("")
+                    printer.write("\n".join(lines))
+                return
+
+            if parallel:
+                logger.info("Decoding sequentially, the decoder modifies its context")
+            elif jobs > 1 and formatter is not None:
+                logger.info("Decoding sequentially, the output format is not text")
+
+            getters = None
+            if formatter is not None:
+                getters = struct_row_getters(ns, load_structs(input_yaml))
+
+            # closing releases the buffers of data if writing fails
+            with closing(iter_decode(ns, data, start, end, count)) as decoded:
+                for chunk in _iter_chunks(decoded):
+                    if formatter is None or getters is None:
+                        printer.write(
+                            "".join(
+                                f"{format_decoded(adr, instr_code, out)}\n"
+                                for adr, _, instr_code, out in chunk
+                            )
+                        )
+                        continue
+
+                    rows = []
+                    for adr, size, instr_code, out in chunk:
+                        idx, get = getters[type(out)]
+                        rows.append((adr, size, instr_code, idx, get(out)))
+                    _write(printer, formatter.format(rows))
@@ -0,0 +1,101 @@
+import logging
+
+import dataclasses
+import io
+import mmap
+from decoder_forge.columnar import DecodedColumns
+from decoder_forge.columnar import decode_columns
+from decoder_forge.columnar import decode_columns_c
+from decoder_forge.decoder_build import CodePrinter
+from decoder_forge.decoder_build import build_decoder
+from decoder_forge.generate_code import generate_code
+from decoder_forge.generate_code import load_structs
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.i_c_decoder import ICDecoderBuilder
+from decoder_forge.i_decoder_cache import IDecoderCache
+from decoder_forge.i_template_engine import ITemplateEngine
+from typing import Callable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def uc_decode_columns(
+    tengine: ITemplateEngine,
+    input_yaml: str | bytes,
+    decoder_width: int,
+    bin_file: str,
+    out_file: str,
+    options: Optional[GeneratorOptions] = None,
+    start: int = 0,
+    end: Optional[int] = None,
+    count: Optional[int] = None,
+    cache: Optional[IDecoderCache] = None,
+    c_builder: Optional[ICDecoderBuilder] = None,
+) -> DecodedColumns:
+    """Decode a binary image into columns and save them as .npz file.
+
+    The Python decoder is always generated with the batch decoder, which provides the
+    pattern of every instruction. If the language of the options is "c", a C decoder
+    is built with c_builder instead.
+
+    Args:
+        tengine (ITemplateEngine): Template engine used to generate the decoder.
+        input_yaml (str | bytes): A YAML string containing pattern definitions, or a
+            spec compiled with compile_spec.
+        decoder_width (int): The bit width to be used when constructing the decode tree.
+        bin_file (str): Path to the binary image.
+        out_file (str): Path of the .npz file, see DecodedColumns.save.
+        options (Optional[GeneratorOptions]): Options of the code generator.
+        start (int): Offset of the first instruction in the image.
+        end (Optional[int]): Offset behind the last byte to decode. Defaults to the
+            end of the image.
+        count (Optional[int]): Maximum number of instructions to decode.
+        cache (Optional[IDecoderCache]): Cache of generated decoders.
+        c_builder (Optional[ICDecoderBuilder]): Builds C decoders.
+
+    Returns:
+        DecodedColumns: The saved columns.
+
+    Raises:
+        ValueError: If a C decoder is requested without c_builder.
+    """
+
+    logger.info("Call: uc_decode_columns")
+
+    options = options if options is not None else GeneratorOptions()
+
+    with open(bin_file, "rb") as fp:
+        # an empty file cannot be memory mapped
+        data: bytes | mmap.mmap = b""
+        if fp.seek(0, io.SEEK_END) != 0:
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if options.language == "c":
+                if c_builder is None:
+                    raise ValueError(
+                        "Decoding with a C decoder requires a C decoder builder"
+                    )
+
+                code_printer = CodePrinter()
+                generate_code(input_yaml, decoder_width, tengine, code_printer, options)
+                c_decoder = c_builder.build(code_printer.to_string())
+                columns = decode_columns_c(c_decoder, data, start, end, count)
+            else:
+                options = dataclasses.replace(options, batch_decoder=True)
+                _, compiled_code = build_decoder(
+                    tengine, input_yaml, decoder_width, options, cache
+                )
+                ns: dict[str, Callable] = {}
+                exec(compiled_code, ns)
+
+                structs = load_structs(input_yaml)
+                columns = decode_columns(ns, structs, data, start, end, count)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    logger.info(f"Decoded {len(columns)} instructions into columns")
+    columns.save(out_file)
+    return columns
@@ -3,12 +3,23 @@ import logging
 from decoder_forge.i_printer import IPrinter
 from decoder_forge.i_template_engine import ITemplateEngine
 from decoder_forge.generate_code import generate_code
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.i_fragment_store import IFragmentStore
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
 def uc_generate_code(
-    printer: IPrinter, tengine: ITemplateEngine, input_yaml: str, decoder_width: int
+    printer: IPrinter,
+    tengine: ITemplateEngine,
+    input_yaml: str | bytes,
+    decoder_width: int,
+    options: Optional[GeneratorOptions] = None,
+    fragments: Optional[IFragmentStore] = None,
 ):
     logger.info("Call: uc_generate_code")
-    generate_code(input_yaml, decoder_width, tengine, printer)
+    generate_code(input_yaml, decoder_width, tengine, printer, options, fragments)
+
+    if fragments is not None:
+        fragments.flush()
@@ -0,0 +1,42 @@
+import logging
+
+from decoder_forge.generate_code import build_decoder_model
+from decoder_forge.generate_code import load_format
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.pattern_profile import profile_pattern_hits
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def uc_profile_patterns(
+    input_yaml: str | bytes,
+    decoder_width: int,
+    bin_file: str,
+    options: Optional[GeneratorOptions] = None,
+) -> dict[str, int]:
+    """Count how often each pattern of a format matches in a binary image.
+
+    Args:
+        input_yaml (str | bytes): A YAML string containing pattern definitions, or a
+            spec compiled with compile_spec.
+        decoder_width (int): The bit width to be used when constructing the decode tree.
+        bin_file (str): Path to the binary image.
+        options (Optional[GeneratorOptions]): Options of the code generator.
+
+    Returns:
+        dict[str, int]: Number of hits keyed by the string representation of the
+        pattern.
+    """
+
+    logger.info("Call: uc_profile_patterns")
+
+    if options is None:
+        options = GeneratorOptions()
+
+    model = build_decoder_model(load_format(input_yaml), decoder_width, options)
+
+    with open(bin_file, "rb") as fp:
+        data = fp.read()
+
+    return profile_pattern_hits(model, data)
@@ -1,15 +1,20 @@
-import yaml
 import logging
 from uuid import uuid1
 from decoder_forge.i_printer import IPrinter
-from decoder_forge.bit_pattern import BitPattern
-from decoder_forge.pattern_algorithms import build_decode_tree_by_fixed_bits
+from decoder_forge.pattern_algorithms import DECODE_TREE_BUILDERS
 from decoder_forge.print_tree import print_tree
+from decoder_forge.spec_ir import load_spec
+from decoder_forge.spec_ir import pattern_list
 
 logger = logging.getLogger(__name__)
 
 
-def uc_show_decode_tree(printer: IPrinter, input_yaml: str, decoder_width: int):
+def uc_show_decode_tree(
+    printer: IPrinter,
+    input_yaml: str | bytes,
+    decoder_width: int,
+    tree_builder: str = "fixed_bits",
+):
     """Decode a YAML string to build and display a decode tree.
 
     This function takes a YAML string which encodes a list of pattern dictionaries.
@@ -20,7 +25,11 @@ def uc_show_decode_tree(printer: IPrinter, input_yaml: str, decoder_width: int):
 
     Args:
         printer (IPrinter): An instance of IPrinter used for printing the tree.
-        input_yaml (str): A YAML string containing a list of pattern dictionaries.
+        input_yaml (str | bytes): A YAML string containing a list of pattern
+            dictionaries, or a spec compiled with compile_spec.
+        decoder_width (int): The bit width to be used when constructing the decode tree.
+        tree_builder (str): Name of the decode tree builder, a key of
+            DECODE_TREE_BUILDERS.
 
     Raises:
         yaml.YAMLErrors: If the input YAML is not valid.
@@ -33,34 +42,23 @@ def uc_show_decode_tree(printer: IPrinter, input_yaml: str, decoder_width: int):
     """
 
     logger.info("Call: uc_show_decode_tree")
-    ins = yaml.load(input_yaml, Loader=yaml.Loader)
-
-    if ins is None:
-        ins = {}
-
-    if "patterns" not in ins:
-        ins["patterns"] = dict()
+    ins = load_spec(input_yaml)
 
     # build pattern list
-    pats = [BitPattern.parse_pattern(str(pat)) for pat, dct in ins["patterns"].items()]
+    pattern_keys = pattern_list(ins)
+    pats = [pat for _, pat in pattern_keys]
 
     # build pattern repo
-    pat_repo = {
-        BitPattern.parse_pattern(str(pat)): dct for pat, dct in ins["patterns"].items()
-    }
-
-    uid_to_pat = {
-        uuid1(): BitPattern.parse_pattern(str(pat))
-        for pat, dct in ins["patterns"].items()
-    }
+    pat_repo = {pat: ins["patterns"][key] for key, pat in pattern_keys}
+
+    uid_to_pat = {uuid1(): pat for pat in pats}
     pat_to_uid = {v: k for k, v in uid_to_pat.items()}
 
     pats_with_uid = [(i, pat_to_uid[i]) for i in pats]
 
     # build decode tree
-    decode_tree = build_decode_tree_by_fixed_bits(
-        pats_with_uid, decoder_width=decoder_width
-    )
+    build_decode_tree = DECODE_TREE_BUILDERS[tree_builder]
+    decode_tree = build_decode_tree(pats_with_uid, decoder_width=decoder_width)
 
     def f_uid_to_pat(uid):
         if uid not in uid_to_pat:
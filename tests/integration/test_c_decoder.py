@@ -0,0 +1,82 @@
+from decoder_forge.decoder_build import CodePrinter
+from decoder_forge.decoder_build import build_decoder
+from decoder_forge.external.c_decoder import CDecoderBuilder
+from decoder_forge.external.template_engine import TemplateEngine
+from decoder_forge.generate_code import generate_code
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.uc_decode import iter_decode
+from importlib.resources import files
+import shutil
+import pytest
+
+requires_gcc = pytest.mark.skipif(shutil.which("gcc") is None, reason="needs gcc")
+
+
+def generate_c_code(input_yaml: str, decoder_width: int) -> str:
+    printer = CodePrinter()
+    options = GeneratorOptions(language="c")
+    generate_code(input_yaml, decoder_width, TemplateEngine(), printer, options)
+    return printer.to_string()
+
+
+@requires_gcc
+def test_c_decoder_test_format_all_words_decode_like_python_decoder(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    data = bytes(range(256))
+    _, code = build_decoder(TemplateEngine(), test_format, 8)
+    ns: dict = {}
+    exec(code, ns)
+
+    # method under test
+    c_decoder = CDecoderBuilder(tmp_path).build(generate_c_code(test_format, 8))
+
+    expected = [(a, s, c, repr(o)) for a, s, c, o in iter_decode(ns, data)]
+    assert list(c_decoder.iter_decode(data)) == expected
+
+
+@requires_gcc
+def test_c_decoder_mixed_sizes_start_end_and_count_select_instructions(tmp_path):
+    test_format = """
+struct_def:
+  Short: {members: [a]}
+  Long: {members: [b]}
+deffun:
+  set_a: {op: assign, target: a, expr: {op: and, args: [instr, "0x7f000000"]}}
+  set_b: {op: assign, target: b, expr: {op: and, args: [instr, "0x7fff0000"]}}
+patterns:
+  0xxxxxxx: {name: short, to: Short, call: [set_a()]}
+  1xxxxxxxxxxxxxxx: {name: long, to: Long, call: [set_b()]}
+"""
+    data = bytes([0x01, 0x80, 0x02, 0x03, 0x81, 0x04, 0x05])
+    c_decoder = CDecoderBuilder(tmp_path).build(generate_c_code(test_format, 32))
+
+    # method under test
+    decoded = list(c_decoder.iter_decode(data, start=1, end=6, count=3))
+
+    assert decoded == [
+        (1, 2, 0x8002, f"Long(b={0x00020000})"),
+        (3, 1, 0x03, f"Short(a={0x03000000})"),
+        (4, 2, 0x8104, f"Long(b={0x01040000})"),
+    ]
+
+
+@requires_gcc
+def test_c_decoder_builder_same_source_reuses_library(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    source = generate_c_code(test_format, 8)
+    builder = CDecoderBuilder(tmp_path)
+    builder.build(source)
+    libraries = list(tmp_path.iterdir())
+
+    # method under test
+    builder.build(source)
+
+    assert len(libraries) == 1
+    assert list(tmp_path.iterdir()) == libraries
+
+
+def test_generate_code_c_decoder_too_wide_raises_value_error():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+
+    with pytest.raises(ValueError):
+        _ = generate_c_code(test_format, 72)
@@ -0,0 +1,38 @@
+from decoder_forge.decoder_build import build_decoder
+from decoder_forge.decoder_build import decoder_cache_key
+from decoder_forge.external.decoder_cache import DecoderCache
+from decoder_forge.external.template_engine import TemplateEngine
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.i_template_engine import ITemplateEngine
+from importlib.resources import files
+from unittest.mock import Mock
+
+
+def test_build_decoder_cached_decoder_skips_generation(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    cache = DecoderCache(tmp_path)
+    source, _ = build_decoder(TemplateEngine(), test_format, 8, cache=cache)
+    tengine_mock = Mock(spec=ITemplateEngine)
+
+    # method under test
+    cached_source, cached_code = build_decoder(
+        tengine_mock, test_format, 8, cache=cache
+    )
+
+    ns = {}
+    exec(cached_code, ns)
+    tengine_mock.generate.assert_not_called()
+    assert cached_source == source
+    assert ns["decode"](0x1F, ns["Context"]()) == ns["StructD"](rd0=0x3)
+
+
+def test_decoder_cache_key_differs_for_width_and_options():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+
+    keys = {
+        decoder_cache_key(test_format, 8, GeneratorOptions()),
+        decoder_cache_key(test_format, 16, GeneratorOptions()),
+        decoder_cache_key(test_format, 8, GeneratorOptions(dispatch_table=True)),
+    }
+
+    assert len(keys) == 3
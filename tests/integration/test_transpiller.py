@@ -1,4 +1,8 @@
+from decoder_forge.generate_code import CallTranspiler
 from decoder_forge.transpiller import transpill
+from decoder_forge.transpiller import transpill_ast
+from decoder_forge.transpiller import VisitorC
+import pytest
 
 
 def test_transpil_empty_str():
@@ -199,3 +203,77 @@ expr:
     tcode = transpill(ast_yaml, {"result": "rd", "msb": "5", "lsb": "2"})
 
     assert tcode == "rd = (code >> 2) & 0xf"
+
+
+def test_transpill_ast_parsed_ast_returns_python_code():
+    ast = {
+        "op": "assign",
+        "target": "$result",
+        "expr": {"op": "eval", "expr": "1+int($a)"},
+    }
+
+    tcode = transpill_ast(ast, {"result": "rd", "a": "2"})
+
+    assert tcode == "rd = 3"
+
+
+def test_call_transpiler_nested_calls_and_function_arguments_return_python_code():
+    deffun = {
+        "flag_set": {"op": "eval", "expr": "1 << 2"},
+        "append_bitmask": {
+            "op": "assign",
+            "target": "$val",
+            "expr": {"op": "or", "args": ["$val", "$bm"]},
+        },
+        "append_flags_set": {
+            "op": "call",
+            "expr": "append_bitmask(val=flags, bm=&flag_set)",
+        },
+    }
+    transpile_call = CallTranspiler(deffun)
+
+    assert transpile_call("append_flags_set()") == "flags = flags | 4"
+    assert transpile_call("append_bitmask(val=$v, bm=1)", {"v": "a"}) == "a = a | 1"
+    assert transpile_call("append_bitmask(val=$v, bm=1)", {"v": "b"}) == "b = b | 1"
+
+
+def test_transpill_ast_c_visitor_comparison_in_parentheses_and_context_pointer():
+    ast = {
+        "op": "if",
+        "cond": {
+            "op": "is_equal",
+            "left": {"op": "and", "args": ["context.mode", "0x3"]},
+            "right": "1",
+        },
+        "then": {"op": "assign", "target": "context.mode", "expr": "0"},
+        "else": {"op": "assign", "target": "$res", "expr": "1", "comment": "c"},
+    }
+    visitor = VisitorC(call=lambda expr, placeholders: "")
+
+    tcode = transpill_ast(ast, {"res": "rd"}, visitor=visitor)
+
+    assert tcode == (
+        "if ((context->mode & 0x3) == (1)) {\n"
+        + "    context->mode = 0;\n"
+        + "} else {\n"
+        + "    rd = 1;  /* c */\n"
+        + "}\n"
+    )
+    assert visitor.assigned == {"rd"}
+
+
+def test_transpill_ast_c_visitor_return_struct_fills_record():
+    ast = {"op": "return", "expr": "Unpred(instr)"}
+    visitor = VisitorC(call=lambda expr, placeholders: "", struct_names=["Unpred"])
+
+    tcode = transpill_ast(ast, visitor=visitor)
+
+    assert tcode == "DF_RETURN_Unpred(instr);"
+
+
+def test_transpill_ast_c_visitor_return_value_raises_value_error():
+    ast = {"op": "return", "expr": "1"}
+    visitor = VisitorC(call=lambda expr, placeholders: "", struct_names=["Unpred"])
+
+    with pytest.raises(ValueError):
+        _ = transpill_ast(ast, visitor=visitor)
@@ -0,0 +1,178 @@
+from decoder_forge.external.c_decoder import CDecoderBuilder
+from decoder_forge.external.template_engine import TemplateEngine
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge import parallel_decode
+from decoder_forge.external.printer import Printer
+from decoder_forge.output_formats import BINARY_RECORD
+from decoder_forge.output_formats import OUTPUT_FORMATS
+from decoder_forge.output_formats import read_binary_header
+from decoder_forge.uc_decode import uc_decode
+from unittest.mock import Mock
+from decoder_forge.i_printer import IPrinter
+from importlib.resources import files
+import io
+import json
+import shutil
+import struct
+import pytest
+
+
+def test_uc_decode_test_format_start_and_count_print_selected_instructions(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(bytes([0x60, 0x1F, 0xEF, 0x60]))
+    out = io.StringIO()
+    tengine = TemplateEngine()
+
+    # method under test
+    uc_decode(Printer(out), tengine, test_format, 8, str(bin_file), start=1, count=2)
+
+    assert out.getvalue() == (
+        "0x1      0x1f       StructD(rd0=3)\n"
+        + "0x2      0xef       StructC(rc0=1, rc1=2)\n"
+    )
+
+
+def test_uc_decode_empty_file_prints_nothing(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(b"")
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    uc_decode(printer_mock, tengine, test_format, 8, str(bin_file))
+
+    printer_mock.print.assert_not_called()
+    printer_mock.write.assert_not_called()
+
+
+def test_uc_decode_mixed_sizes_parallel_jobs_print_like_sequential(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(parallel_decode, "MIN_CHUNK_BYTES", 2)
+    test_format = """
+struct_def:
+  Short: {members: []}
+  Long: {members: []}
+patterns:
+  0xxxxxxx: {name: short, to: Short}
+  1xxxxxxxxxxxxxxx: {name: long, to: Long}
+"""
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(bytes((i * 0x9D) & 0xFF for i in range(0, 128)))
+    tengine = TemplateEngine()
+
+    out_sequential = io.StringIO()
+    uc_decode(Printer(out_sequential), tengine, test_format, 16, str(bin_file))
+
+    # method under test
+    out_parallel = io.StringIO()
+    uc_decode(Printer(out_parallel), tengine, test_format, 16, str(bin_file), jobs=2)
+
+    assert len(out_sequential.getvalue()) > 0
+    assert out_parallel.getvalue() == out_sequential.getvalue()
+
+
+def decode_to_bytes(*args, **kwargs) -> bytes:
+    out = io.BytesIO()
+    stream = io.TextIOWrapper(out, encoding="utf-8")
+    uc_decode(Printer(stream), *args, **kwargs)
+    stream.flush()
+    return out.getvalue()
+
+
+@pytest.mark.skipif(shutil.which("gcc") is None, reason="needs gcc")
+@pytest.mark.parametrize("output_format", OUTPUT_FORMATS)
+def test_uc_decode_c_language_prints_like_python_decoder(tmp_path, output_format):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(bytes([0x60, 0x1F, 0xEF, 0x60, 0x40, 0xF8, 0x05]))
+    tengine = TemplateEngine()
+
+    out_python = decode_to_bytes(
+        tengine, test_format, 8, str(bin_file), start=1, output_format=output_format
+    )
+
+    # method under test
+    out_c = decode_to_bytes(
+        tengine,
+        test_format,
+        8,
+        str(bin_file),
+        GeneratorOptions(language="c"),
+        start=1,
+        c_builder=CDecoderBuilder(tmp_path / "native"),
+        output_format=output_format,
+    )
+
+    assert len(out_python) > 0
+    assert out_c == out_python
+
+
+def test_uc_decode_jsonl_format_writes_one_object_per_instruction(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(bytes([0x60, 0x1F, 0xEF, 0x60]))
+    out = io.StringIO()
+
+    # method under test
+    uc_decode(
+        Printer(out),
+        TemplateEngine(),
+        test_format,
+        8,
+        str(bin_file),
+        start=1,
+        count=2,
+        output_format="jsonl",
+    )
+
+    assert [json.loads(i) for i in out.getvalue().splitlines()] == [
+        {
+            "address": 1,
+            "code": 0x1F,
+            "size": 1,
+            "struct": "StructD",
+            "fields": {"rd0": 3},
+        },
+        {
+            "address": 2,
+            "code": 0xEF,
+            "size": 1,
+            "struct": "StructC",
+            "fields": {"rc0": 1, "rc1": 2},
+        },
+    ]
+
+
+def test_uc_decode_binary_format_writes_header_and_fixed_size_records(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(bytes([0x60, 0x1F, 0xEF, 0x60]))
+    out = io.BytesIO()
+
+    # method under test
+    uc_decode(
+        Printer(out),
+        TemplateEngine(),
+        test_format,
+        8,
+        str(bin_file),
+        start=1,
+        count=2,
+        output_format="binary",
+    )
+
+    data = out.getvalue()
+    header_bytes, record_bytes, fields, structs = read_binary_header(data)
+    assert len(data) == header_bytes + 2 * record_bytes
+    names = [i.name for i in structs]
+    record = struct.Struct(BINARY_RECORD + "q" * fields)
+    assert record.size == record_bytes
+    adr, code, size, idx, *values = record.unpack_from(data, header_bytes)
+    assert (adr, code, size, names[idx], values[0]) == (1, 0x1F, 1, "StructD", 3)
+    adr, code, size, idx, *values = record.unpack_from(
+        data, header_bytes + record_bytes
+    )
+    assert (adr, code, size, names[idx], values[:2]) == (2, 0xEF, 1, "StructC", [1, 2])
@@ -0,0 +1,77 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from decoder_forge.columnar import DecodedColumns  # noqa: E402
+from decoder_forge.decoder_build import build_decoder  # noqa: E402
+from decoder_forge.external.c_decoder import CDecoderBuilder  # noqa: E402
+from decoder_forge.external.template_engine import TemplateEngine  # noqa: E402
+from decoder_forge.generator_options import GeneratorOptions  # noqa: E402
+from decoder_forge.uc_decode import iter_decode  # noqa: E402
+from decoder_forge.uc_decode_columns import uc_decode_columns  # noqa: E402
+from importlib.resources import files  # noqa: E402
+import dataclasses  # noqa: E402
+import shutil  # noqa: E402
+
+
+def test_uc_decode_columns_test_format_columns_match_decoded_structs(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    data = bytes(range(256))
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(data)
+    out_file = tmp_path / "image.npz"
+    options = GeneratorOptions(batch_decoder=True)
+    _, code = build_decoder(TemplateEngine(), test_format, 8, options)
+    ns: dict = {}
+    exec(code, ns)
+
+    # method under test
+    uc_decode_columns(TemplateEngine(), test_format, 8, str(bin_file), str(out_file))
+
+    columns = DecodedColumns.load(out_file)
+    decoded = list(iter_decode(ns, data))
+    assert len(columns) == len(decoded)
+    assert columns.pattern.tolist() == ns["decode_batch"](list(data)).tolist()
+    for row, (adr, size, instr_code, out) in enumerate(decoded):
+        assert columns.address[row] == adr
+        assert columns.size[row] == size
+        assert columns.code[row] == instr_code
+        assert columns.struct_names[columns.structure[row]] == type(out).__name__
+        values = dataclasses.asdict(out)
+        for name, column in columns.members.items():
+            if name in values:
+                assert column[row] == values[name]
+            else:
+                assert column.mask[row]
+
+
+@pytest.mark.skipif(shutil.which("gcc") is None, reason="needs gcc")
+def test_uc_decode_columns_c_language_saves_python_decoder_columns(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(bytes(range(256)))
+    tengine = TemplateEngine()
+
+    expected = uc_decode_columns(
+        tengine, test_format, 8, str(bin_file), str(tmp_path / "python.npz"), start=1
+    )
+
+    # method under test
+    columns = uc_decode_columns(
+        tengine,
+        test_format,
+        8,
+        str(bin_file),
+        str(tmp_path / "c.npz"),
+        GeneratorOptions(language="c"),
+        start=1,
+        c_builder=CDecoderBuilder(tmp_path / "native"),
+    )
+
+    assert len(columns) == len(expected) == 255
+    for name in ("address", "code", "size", "pattern", "structure"):
+        assert getattr(columns, name).tolist() == getattr(expected, name).tolist()
+    assert columns.struct_names == expected.struct_names
+    assert columns.members.keys() == expected.members.keys()
+    for name, column in columns.members.items():
+        assert column.tolist() == expected.members[name].tolist()
@@ -2,15 +2,19 @@ from decoder_forge.external.template_engine import TemplateEngine
 from decoder_forge.uc_generate_code import uc_generate_code
 from unittest.mock import Mock
 from decoder_forge.i_printer import IPrinter
+from decoder_forge.generator_options import GeneratorOptions
+from decoder_forge.external.fragment_store import FragmentStore
+from decoder_forge.spec_ir import compile_spec
 from importlib.resources import files
+import pytest
 
 
 def extract_generated_code(printer_mock: Mock):
     # call[0] is the list of positional arg, call[0][0] is the first positional arg
-    generated_code = [call[0][0] for call in printer_mock.print.call_args_list]
+    generated_code = [call[0][0] for call in printer_mock.write.call_args_list]
 
-    # generated code is in a list ... join it to get a string
-    generated_code_str = "\n".join(generated_code)
+    # the code is written in chunks ... join them to get a string
+    generated_code_str = "".join(generated_code)
 
     return generated_code_str
 
@@ -38,6 +42,91 @@ def test_uc_generate_code_generate_and_eval__code_empty_format_outputs_None():
     assert decode_output == test_namespace["Undef"](code=0xFF)
 
 
+def test_uc_generate_code_test_format_writes_lines_while_rendering():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    uc_generate_code(printer_mock, tengine, test_format, decoder_width=8)
+
+    chunks = [call[0][0] for call in printer_mock.write.call_args_list]
+    assert len(chunks) > 1
+    assert "".join(chunks).endswith("\n")
+    printer_mock.print.assert_not_called()
+
+
+def test_uc_generate_code_template_bytecode_cache_generates_same_code(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    printer_mock = Mock(spec=IPrinter)
+    uc_generate_code(printer_mock, TemplateEngine(), test_format, decoder_width=8)
+
+    # method under test
+    printer_cached = Mock(spec=IPrinter)
+    tengine = TemplateEngine(tmp_path / "templates")
+    uc_generate_code(printer_cached, tengine, test_format, decoder_width=8)
+
+    assert len(list((tmp_path / "templates").iterdir())) == 1
+    assert extract_generated_code(printer_cached) == extract_generated_code(
+        printer_mock
+    )
+
+
+def test_uc_generate_code_bytecode_cache_dir_not_creatable_generates_code(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    (tmp_path / "file").write_text("")
+    printer_mock = Mock(spec=IPrinter)
+    uc_generate_code(printer_mock, TemplateEngine(), test_format, decoder_width=8)
+
+    # method under test
+    printer_cached = Mock(spec=IPrinter)
+    tengine = TemplateEngine(tmp_path / "file" / "templates")
+    uc_generate_code(printer_cached, tengine, test_format, decoder_width=8)
+
+    assert extract_generated_code(printer_cached) == extract_generated_code(
+        printer_mock
+    )
+
+
+@pytest.mark.parametrize("size_table", [False, True])
+def test_uc_generate_code_information_gain_armv7m_decode_size_matches_fixed_bits(
+    size_table,
+):
+    armv7m = files("formats").joinpath("armv7-m.yaml").read_text()
+    decode_size = []
+    for tree_builder in ("fixed_bits", "information_gain"):
+        printer_mock = Mock(spec=IPrinter)
+        options = GeneratorOptions(tree_builder=tree_builder, size_table=size_table)
+
+        # method under test
+        uc_generate_code(printer_mock, TemplateEngine(), armv7m, 32, options)
+
+        test_namespace = {}
+        exec(extract_generated_code(printer_mock), test_namespace)
+        decode_size.append(test_namespace["decode_size"])
+
+    fixed_bits, information_gain = decode_size
+    for prefix in range(0x10000):
+        assert information_gain(prefix) == fixed_bits(prefix)
+
+
+def test_uc_generate_code_compiled_spec_generates_same_code():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    yaml_printer_mock = Mock(spec=IPrinter)
+    spec_printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+    uc_generate_code(yaml_printer_mock, tengine, test_format, decoder_width=8)
+
+    # method under test
+    uc_generate_code(
+        spec_printer_mock, tengine, compile_spec(test_format), decoder_width=8
+    )
+
+    assert extract_generated_code(spec_printer_mock) == extract_generated_code(
+        yaml_printer_mock
+    )
+
+
 def test_uc_generate_code_generate_and_eval_0x1F_test_format_returns_structD():
     printer_mock = Mock(spec=IPrinter)
     tengine = TemplateEngine()
@@ -103,3 +192,345 @@ def test_uc_generate_code_generate_and_eval_code_0xEF_code_return_structC():
 
     # returns undef class
     assert decode_output == test_namespace["StructC"](rc0=1, rc1=2)
+
+
+def test_uc_generate_code_generate_and_eval_0x60_pattern_without_struct_undef():
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    uc_generate_code(printer_mock, tengine, test_format, decoder_width=8)
+
+    generated_code = extract_generated_code(printer_mock)
+
+    # execute the code
+    test_namespace = {}
+    exec(generated_code, test_namespace)
+
+    context = test_namespace["Context"]()
+
+    # call the decoder
+    decode_output = test_namespace["decode"](0x60, context)
+
+    assert decode_output == test_namespace["Undef"](code=0x60)
+
+
+def test_uc_generate_code_generator_options_decode_like_default_options():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+
+    decoders = []
+    for options in (
+        GeneratorOptions(),
+        GeneratorOptions(dispatch_table=True),
+        GeneratorOptions(dispatch_table=True, dispatch_bits=8),
+        GeneratorOptions(tree_builder="information_gain"),
+        GeneratorOptions(pattern_hits={"00xxx111": 5, "110xxxxx": 7}),
+        GeneratorOptions(dispatch_table=True, memo_size=16),
+        GeneratorOptions(lazy_structs=True),
+        GeneratorOptions(lazy_structs=True, memo_size=16),
+        GeneratorOptions(struct_style="dataclass_slots"),
+        GeneratorOptions(struct_style="namedtuple", memo_size=16),
+        GeneratorOptions(struct_style="slots"),
+        GeneratorOptions(optimise=True),
+        GeneratorOptions(optimise=True, lazy_structs=True, memo_size=16),
+        GeneratorOptions(hoist_calls=True),
+        GeneratorOptions(hoist_calls=True, optimise=True, dispatch_table=True),
+    ):
+        printer_mock = Mock(spec=IPrinter)
+        tengine = TemplateEngine()
+
+        # method under test
+        uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+        # execute the code
+        test_namespace = {}
+        exec(extract_generated_code(printer_mock), test_namespace)
+        decoders.append(test_namespace)
+
+    for instr in range(0, 256):
+        outputs = [repr(ns["decode"](instr, ns["Context"]())) for ns in decoders]
+        assert all(i == outputs[0] for i in outputs)
+
+
+def test_uc_generate_code_batch_decoder_classifies_words_like_patterns():
+    np = pytest.importorskip("numpy")
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    options = GeneratorOptions(batch_decoder=True)
+    uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+    generated_code = extract_generated_code(printer_mock)
+
+    # execute the code
+    test_namespace = {}
+    exec(generated_code, test_namespace)
+
+    ids = test_namespace["decode_batch"](np.array([0x1F, 0xEF, 0x88, 0x00]))
+    names = [test_namespace["PATTERN_NAMES"][i] for i in ids[:3]]
+
+    assert names == ["instr_D0", "instr_C0", "instr_UNDEF1"]
+    assert ids[3] == test_namespace["PATTERN_NAMES"].index("instr_A0")
+
+
+def test_uc_generate_code_batch_decoder_too_wide_raises_value_error():
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    options = GeneratorOptions(batch_decoder=True)
+    with pytest.raises(ValueError):
+        uc_generate_code(printer_mock, tengine, "patterns: {'1x': {}}", 65, options)
+
+
+def test_uc_generate_code_fragment_store_changed_deffun_regenerates_fragment(
+    tmp_path,
+):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    changed_format = test_format.replace('expr: "0xCAFE"', 'expr: "0xBEEF"')
+    assert changed_format != test_format
+
+    tengine = TemplateEngine()
+    store = FragmentStore(tmp_path / "fragments.marshal")
+    uc_generate_code(Mock(spec=IPrinter), tengine, test_format, 8, fragments=store)
+
+    # method under test
+    printer_mock = Mock(spec=IPrinter)
+    store = FragmentStore(tmp_path / "fragments.marshal")
+    uc_generate_code(printer_mock, tengine, changed_format, 8, fragments=store)
+
+    printer_expected = Mock(spec=IPrinter)
+    uc_generate_code(printer_expected, tengine, changed_format, 8)
+
+    assert extract_generated_code(printer_mock) == extract_generated_code(
+        printer_expected
+    )
+
+
+VARIABLE_SIZE_FORMAT = """
+patterns:
+  '0xxxxxxx': {name: short}
+  '10xxxxxxxxxxxxxx': {name: long}
+  '11xxxxxxxxxxxxxxxxxxxxxx': {name: longer}
+"""
+
+
+def test_uc_generate_code_size_table_decodes_size_like_size_tree():
+    sizes = []
+    for options in (GeneratorOptions(), GeneratorOptions(size_table=True)):
+        printer_mock = Mock(spec=IPrinter)
+        tengine = TemplateEngine()
+
+        # method under test
+        uc_generate_code(printer_mock, tengine, VARIABLE_SIZE_FORMAT, 24, options)
+
+        generated_code = extract_generated_code(printer_mock)
+        assert ("_SIZE_TABLE" in generated_code) == options.size_table
+
+        # execute the code
+        test_namespace = {}
+        exec(generated_code, test_namespace)
+        sizes.append([test_namespace["decode_size"](i) for i in range(0, 256)])
+
+    assert sizes[0] == sizes[1]
+    assert sizes[1][0x00] == 8 and sizes[1][0x80] == 16 and sizes[1][0xC0] == 24
+
+
+def test_uc_generate_code_size_table_too_large_falls_back_to_size_tree():
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # deciding the size needs 24 bits
+    test_format = VARIABLE_SIZE_FORMAT.replace(
+        "'0xxxxxxx'", "'0xxxxxxxxxxxxxxxxxxxxxxx'"
+    )
+    test_format = test_format.replace(
+        "'10xxxxxxxxxxxxxx'", "'10xxxxxxxxxxxxxxxxxxxxxxxxxxxxxx'"
+    )
+    options = GeneratorOptions(size_table=True)
+    uc_generate_code(printer_mock, tengine, test_format, 32, options)
+
+    generated_code = extract_generated_code(printer_mock)
+    assert "_SIZE_TABLE" not in generated_code
+
+    test_namespace = {}
+    exec(generated_code, test_namespace)
+    assert test_namespace["decode_size"](0x800000) == 32
+
+
+def test_uc_generate_code_memo_decodes_like_default_options():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+
+    decoders = []
+    for options in (GeneratorOptions(), GeneratorOptions(memo_size=16)):
+        printer_mock = Mock(spec=IPrinter)
+        tengine = TemplateEngine()
+
+        # method under test
+        uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+        # execute the code
+        test_namespace = {}
+        exec(extract_generated_code(printer_mock), test_namespace)
+        decoders.append(test_namespace)
+
+    contexts = [ns["Context"]() for ns in decoders]
+    for instr in list(range(0, 256)) * 2:
+        outputs = [
+            (repr(ns["decode"](instr, ctx)), repr(ctx))
+            for ns, ctx in zip(decoders, contexts)
+        ]
+        assert outputs[0] == outputs[1]
+
+    # equal words share their result, patterns writing the context are decoded again
+    ns = decoders[1]
+    assert ns["decode"](0x1F, ns["Context"]()) is ns["decode"](0x1F, ns["Context"]())
+    context = ns["Context"]()
+    ns["decode"](0x40, context)
+    assert context.context1 == 0xCAFE
+
+
+def test_uc_generate_code_memo_context_dependent_result_keyed_by_member():
+    test_format = """
+context: {members: [mode, unused]}
+struct_def:
+  StructM: {members: [m]}
+deffun:
+  read_mode: {op: assign, target: m, expr: "context.mode"}
+patterns:
+  '1xxxxxxx': {name: instr_M, to: StructM, call: [read_mode()]}
+"""
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    options = GeneratorOptions(memo_size=16)
+    uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+    generated_code = extract_generated_code(printer_mock)
+    assert 'attrgetter("mode")' in generated_code
+
+    test_namespace = {}
+    exec(generated_code, test_namespace)
+    decode = test_namespace["decode"]
+    Context = test_namespace["Context"]
+
+    first = decode(0x80, Context(mode=1))
+    assert decode(0x80, Context(mode=2)) == test_namespace["StructM"](m=2)
+    assert decode(0x80, Context(mode=1, unused=5)) is first
+
+
+def test_uc_generate_code_lazy_structs_compute_members_on_first_access():
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    options = GeneratorOptions(lazy_structs=True)
+    uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+    generated_code = extract_generated_code(printer_mock)
+
+    # execute the code
+    test_namespace = {}
+    exec(generated_code, test_namespace)
+    StructD = test_namespace["StructD"]
+
+    out = test_namespace["decode"](0x1F, test_namespace["Context"]())
+    assert type(out) is StructD
+    assert not hasattr(out, "_f_rd0")
+
+    assert out.rd0 == 0x3
+    assert out == StructD(rd0=0x3) and hash(out) == hash(StructD(0x3))
+    assert repr(out) == "StructD(rd0=3)"
+    with pytest.raises(AttributeError):
+        out.rd0 = 0x4
+
+    # patterns which may return early compute their members in decode
+    out = test_namespace["decode"](0xEF, test_namespace["Context"]())
+    assert hasattr(out, "_f_rc0")
+    assert out == test_namespace["StructC"](rc0=1, rc1=2)
+
+
+def test_uc_generate_code_lazy_structs_calls_which_may_raise_run_in_decode():
+    test_format = """
+struct_def:
+  StructA: {members: [a]}
+deffun:
+  check: {op: assert, expr: {op: is_equal, left: "instr & 0x1", right: "0x1"}}
+  set_a: {op: assign, target: a, expr: "instr >> 4"}
+patterns:
+  'xxxxxxxx': {name: instr_A, to: StructA, call: [check(), set_a()]}
+"""
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    options = GeneratorOptions(lazy_structs=True)
+    uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+    test_namespace = {}
+    exec(extract_generated_code(printer_mock), test_namespace)
+    decode = test_namespace["decode"]
+
+    assert decode(0x31, test_namespace["Context"]()) == test_namespace["StructA"](a=3)
+    with pytest.raises(AssertionError):
+        decode(0x30, test_namespace["Context"]())
+
+
+def test_uc_generate_code_lazy_structs_unassigned_member_raises_in_decode():
+    test_format = """
+struct_def:
+  StructA: {members: [a, b]}
+deffun:
+  set_a: {op: assign, target: a, expr: "instr >> 4"}
+patterns:
+  'xxxxxxxx': {name: instr_A, to: StructA, call: [set_a()]}
+"""
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    options = GeneratorOptions(lazy_structs=True)
+    uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+    test_namespace = {}
+    exec(extract_generated_code(printer_mock), test_namespace)
+
+    with pytest.raises(NameError):
+        test_namespace["decode"](0x31, test_namespace["Context"]())
+
+
+@pytest.mark.parametrize("struct_style", ["dataclass_slots", "namedtuple", "slots"])
+def test_uc_generate_code_struct_style_instances_have_no_dict(struct_style):
+    printer_mock = Mock(spec=IPrinter)
+    tengine = TemplateEngine()
+
+    # method under test
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    options = GeneratorOptions(struct_style=struct_style)
+    uc_generate_code(printer_mock, tengine, test_format, 8, options)
+
+    test_namespace = {}
+    exec(extract_generated_code(printer_mock), test_namespace)
+
+    out = test_namespace["decode"](0x1F, test_namespace["Context"]())
+    assert out == test_namespace["StructD"](rd0=0x3)
+    assert repr(out) == "StructD(rd0=3)"
+    assert not hasattr(out, "__dict__")
+
+
+def test_uc_generate_code_struct_style_unsupported_combination_raises_value_error():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+
+    for options in (
+        GeneratorOptions(struct_style="records"),
+        GeneratorOptions(struct_style="slots", memo_size=16),
+        GeneratorOptions(struct_style="namedtuple", lazy_structs=True),
+    ):
+        with pytest.raises(ValueError):
+            uc_generate_code(
+                Mock(spec=IPrinter), TemplateEngine(), test_format, 8, options
+            )
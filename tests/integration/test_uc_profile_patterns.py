@@ -0,0 +1,15 @@
+from decoder_forge.uc_profile_patterns import uc_profile_patterns
+from importlib.resources import files
+
+
+def test_uc_profile_patterns_test_format_counts_matching_words(tmp_path):
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+    bin_file = tmp_path / "image.bin"
+    bin_file.write_bytes(bytes([0x1F, 0x1F, 0xEF, 0xFF]))
+
+    # method under test
+    hits = uc_profile_patterns(test_format, 8, str(bin_file))
+
+    assert hits["00xxx111"] == 2
+    assert hits["111xxxxx"] == 2
+    assert hits["010xxxxx"] == 0
@@ -1,3 +1,4 @@
+import os
 import subprocess
 import pytest
 import pathlib
@@ -19,6 +20,31 @@ def project_path(request):
     return pathlib.Path(rootpath)
 
 
+def test_generate_code_without_cache_options_writes_no_cache(project_path, tmp_path):
+    # a regular file as cache home, the cache directory cannot be created in it
+    cache_home = tmp_path / "cache"
+    cache_home.write_text("")
+    format_file = project_path / "tests" / "data" / "formats" / "test-format.yaml"
+
+    result = subprocess.run(
+        [
+            "python",
+            "-m",
+            "decoder_forge.main",
+            "generate-code",
+            "--decoder_width",
+            "8",
+            format_file,
+        ],
+        check=True,
+        capture_output=True,
+        env=dict(os.environ, XDG_CACHE_HOME=str(cache_home)),
+    )
+
+    assert b"def decode(" in result.stdout
+    assert sorted(tmp_path.iterdir()) == [cache_home]
+
+
 def test_generate_code_armv7m(project_path):
     # Load and inspect output files from tmpdir
     print(f"Project path: {project_path}")
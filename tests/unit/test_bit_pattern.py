@@ -239,3 +239,26 @@ def test_extract_from_msb_3_out_8():
     assert pat_b.bit_length == 3
     assert pat_b.fixedmask == 0x5
     assert pat_b.fixedbits == 0x5
+
+
+def test_parse_pattern_with_invalid_character_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = BitPattern.parse_pattern("10_1")
+
+
+def test_parse_pattern_with_undef_bits_initializes_fixedmask_correctly():
+    pattern = BitPattern.parse_pattern("1o.X0")
+    assert pattern.fixedmask == 0x11
+    assert pattern.fixedbits == 0x10
+
+
+def test_str_with_70_bit_pattern_returns_correct_string():
+    pattern = BitPattern(
+        fixedmask=(1 << 69) | 0x3, fixedbits=(1 << 69) | 0x1, bit_length=70
+    )
+    assert str(pattern) == "1" + "x" * 67 + "01"
+
+
+def test_trailing_wildcard_count_3_out_8():
+    pat_a = BitPattern(fixedmask=0xA8, fixedbits=0x08, bit_length=8)
+    assert pat_a.trailing_wildcard_count == 3
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from decoder_forge.associated_struct_repo import StructDef  # noqa: E402
+from decoder_forge.columnar import DecodedColumns  # noqa: E402
+from decoder_forge.columnar import decode_columns  # noqa: E402
+
+
+def test_decoded_columns_save_and_load_keep_columns_and_masks(tmp_path):
+    columns = DecodedColumns(
+        address=np.array([0, 2], dtype=np.uint64),
+        code=np.array([0x1234, 0x5678], dtype=np.uint64),
+        size=np.array([2, 2], dtype=np.uint8),
+        pattern=np.array([0, -1], dtype=np.int32),
+        structure=np.array([0, 1], dtype=np.int32),
+        members={
+            "rd": np.ma.MaskedArray(
+                np.array([3, 0], dtype=np.uint8), mask=[False, True]
+            ),
+        },
+        pattern_names=["mov"],
+        struct_names=["Mov", "Undef"],
+    )
+
+    # method under test
+    columns.save(tmp_path / "columns.npz")
+    loaded = DecodedColumns.load(tmp_path / "columns.npz")
+
+    assert len(loaded) == 2
+    assert loaded.code.tolist() == [0x1234, 0x5678]
+    assert loaded.pattern.tolist() == [0, -1]
+    assert loaded.pattern_names == ["mov"]
+    assert loaded.struct_names == ["Mov", "Undef"]
+    assert loaded.members["rd"].dtype == np.uint8
+    assert loaded.members["rd"].tolist() == [3, None]
+
+
+def test_decode_columns_without_batch_decoder_raises_value_error():
+    ns = {"decode": lambda instr, context: None}
+
+    with pytest.raises(ValueError):
+        # method under test
+        decode_columns(ns, [StructDef(name="Undef", members=["code"])], b"\x00")
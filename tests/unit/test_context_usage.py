@@ -0,0 +1,47 @@
+from decoder_forge.context_usage import analyse_context_usage
+from decoder_forge.context_usage import code_may_raise
+
+
+def test_analyse_context_usage_reads_and_writes_members():
+    code = "cond = context.istate >> 4\ncontext.apsr = cond\n"
+
+    usage = analyse_context_usage(code)
+
+    assert usage.reads == frozenset({"istate"})
+    assert usage.writes == frozenset({"apsr"})
+    assert not usage.opaque
+
+
+def test_analyse_context_usage_augmented_assignment_reads_and_writes_member():
+    usage = analyse_context_usage("context.istate <<= 1\n")
+
+    assert usage.reads == frozenset({"istate"})
+    assert usage.writes == frozenset({"istate"})
+
+
+def test_analyse_context_usage_context_passed_to_function_is_opaque():
+    usage = analyse_context_usage("cond = in_it_block(context)\n")
+
+    assert usage.reads == frozenset()
+    assert usage.opaque
+
+
+def test_code_may_raise_safe_assignments_and_branches_returns_false():
+    code = (
+        "_n = (instr >> 4) % 3\n"
+        "if context.mode == 1:\n"
+        "    a = _n << 2\n"
+        "else:\n"
+        "    a = 0\n"
+        "b = a | -instr\n"
+    )
+
+    assert not code_may_raise(code, ["mode"])
+
+
+def test_code_may_raise_asserts_calls_and_unassigned_locals_returns_true():
+    assert code_may_raise("assert(instr == 1)")
+    assert code_may_raise("a = check(instr)")
+    assert code_may_raise("a = instr >> instr")
+    assert code_may_raise("a = context.mode")
+    assert code_may_raise("if instr & 1:\n    a = 1\nb = a")
@@ -0,0 +1,41 @@
+from decoder_forge.external.decoder_cache import DecoderCache
+import marshal
+import os
+
+
+def test_decoder_cache_store_then_load_returns_source_and_code(tmp_path):
+    cache = DecoderCache(tmp_path)
+    source = "x = 0x2A\n"
+
+    cache.store("KEYA", source, compile(source, "", "exec"))
+    loaded_source, loaded_code = cache.load("KEYA")
+
+    ns = {}
+    exec(loaded_code, ns)
+    assert loaded_source == source
+    assert ns["x"] == 0x2A
+
+
+def test_decoder_cache_load_unknown_key_returns_none(tmp_path):
+    cache = DecoderCache(tmp_path)
+
+    assert cache.load("KEYA") is None
+
+
+def test_decoder_cache_store_above_limit_evicts_least_recently_used(tmp_path):
+    source = "x = 0x2A\n"
+    code = compile(source, "", "exec")
+    entry_bytes = len(source) + len(marshal.dumps(code))
+    cache = DecoderCache(tmp_path, max_bytes=2 * entry_bytes)
+
+    cache.store("KEYA", source, code)
+    cache.store("KEYB", source, code)
+    for key, mtime in (("KEYA", 1000), ("KEYB", 2000)):
+        os.utime(tmp_path / f"{key}.py", (mtime, mtime))
+        os.utime(tmp_path / f"{key}.marshal", (mtime, mtime))
+
+    cache.store("KEYC", source, code)
+
+    assert cache.load("KEYA") is None
+    assert cache.load("KEYB") is not None
+    assert cache.load("KEYC") is not None
@@ -0,0 +1,138 @@
+from decoder_forge.dispatch_table import (
+    build_dispatch_table,
+    specialise_decode_tree,
+)
+from decoder_forge.pattern_algorithms import (
+    build_decode_tree_by_fixed_bits,
+    DecodeTree,
+    DecodeLeaf,
+)
+from decoder_forge.bit_pattern import BitPattern
+import pytest
+
+
+def test_specialise_decode_tree_drops_incompatible_children():
+    # pat_a = "0x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    # pat_b = "11"
+    pat_b = BitPattern(fixedmask=0x3, fixedbits=0x3, bit_length=2)
+
+    tree = build_decode_tree_by_fixed_bits(
+        [(pat_a, "UIDA"), (pat_b, "UIDB")], decoder_width=2
+    )
+
+    bucket = specialise_decode_tree(tree, known_mask=0x2, known_bits=0x2)
+
+    assert bucket == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(
+                pat=BitPattern(fixedmask=0x1, fixedbits=0x1, bit_length=2),  # "x1"
+                uid="UIDB",
+            )
+        ],
+    )
+
+
+def test_specialise_decode_tree_fulfilled_check_drops_following_siblings():
+    # pat_a = "11"
+    pat_a = BitPattern(fixedmask=0x3, fixedbits=0x3, bit_length=2)
+
+    # pat_b = "1x"
+    pat_b = BitPattern(fixedmask=0x2, fixedbits=0x2, bit_length=2)
+
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(pat=pat_b, uid="UIDB"),
+            DecodeLeaf(pat=pat_a, uid="UIDA"),
+        ],
+    )
+
+    bucket = specialise_decode_tree(tree, known_mask=0x2, known_bits=0x2)
+
+    assert bucket == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(
+                pat=BitPattern(fixedmask=0x0, fixedbits=0x0, bit_length=2),  # "xx"
+                uid="UIDB",
+            )
+        ],
+    )
+
+
+def test_specialise_decode_tree_fulfilled_first_subtree_replaces_level():
+    # pat_a = "11xxxxx0"
+    pat_a = BitPattern(fixedmask=0xC1, fixedbits=0xC0, bit_length=8)
+
+    # pat_b = "11xxxx01"
+    pat_b = BitPattern(fixedmask=0xC3, fixedbits=0xC1, bit_length=8)
+
+    tree = build_decode_tree_by_fixed_bits(
+        [(pat_a, "UIDA"), (pat_b, "UIDB")], decoder_width=8
+    )
+
+    bucket = specialise_decode_tree(tree, known_mask=0xC1, known_bits=0xC1)
+
+    assert bucket == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(
+                pat=BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=8),
+                uid="UIDB",
+            )
+        ],
+    )
+
+
+def test_build_dispatch_table_with_given_bits_covers_whole_index_range():
+    # pat_a = "0x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    # pat_b = "11"
+    pat_b = BitPattern(fixedmask=0x3, fixedbits=0x3, bit_length=2)
+
+    tree = build_decode_tree_by_fixed_bits(
+        [(pat_a, "UIDA"), (pat_b, "UIDB")], decoder_width=2
+    )
+
+    table = build_dispatch_table(tree, decoder_width=2, bits=2)
+
+    assert table.bits == 2
+    assert table.shift == 0
+    assert sum(count for count, _ in table.runs) == 4
+
+
+def test_build_dispatch_table_with_given_bits_merges_equal_buckets():
+    # pat_a = "0x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    # pat_b = "11"
+    pat_b = BitPattern(fixedmask=0x3, fixedbits=0x3, bit_length=2)
+
+    tree = build_decode_tree_by_fixed_bits(
+        [(pat_a, "UIDA"), (pat_b, "UIDB")], decoder_width=2
+    )
+
+    table = build_dispatch_table(tree, decoder_width=2, bits=2)
+
+    # "00" and "01" -> UIDA, "10" -> no match, "11" -> UIDB
+    assert len(table.buckets) == 3
+    assert [bucket_idx for _, bucket_idx in table.runs] == [0, 1, 2]
+    assert [count for count, _ in table.runs] == [2, 1, 1]
+
+
+def test_build_dispatch_table_with_too_many_bits_raises_value_error():
+    # pat_a = "0x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    tree = build_decode_tree_by_fixed_bits([(pat_a, "UIDA")], decoder_width=2)
+
+    with pytest.raises(ValueError):
+        _ = build_dispatch_table(tree, decoder_width=2, bits=3)
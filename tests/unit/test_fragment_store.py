@@ -0,0 +1,27 @@
+from decoder_forge.external.fragment_store import FragmentStore
+
+
+def test_fragment_store_flush_then_reopen_returns_fragment(tmp_path):
+    store = FragmentStore(tmp_path / "store.marshal")
+    store.put("KEYA", "flags = 0x0")
+    store.flush()
+
+    store = FragmentStore(tmp_path / "store.marshal")
+
+    assert store.get("KEYA") == "flags = 0x0"
+    assert store.get("KEYB") is None
+
+
+def test_fragment_store_flush_drops_fragments_not_used(tmp_path):
+    store = FragmentStore(tmp_path / "store.marshal")
+    store.put("KEYA", "a = 0x0")
+    store.put("KEYB", "b = 0x0")
+    store.flush()
+
+    store = FragmentStore(tmp_path / "store.marshal")
+    _ = store.get("KEYA")
+    store.flush()
+
+    store = FragmentStore(tmp_path / "store.marshal")
+    assert store.get("KEYA") == "a = 0x0"
+    assert store.get("KEYB") is None
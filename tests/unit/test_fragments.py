@@ -0,0 +1,33 @@
+from decoder_forge.fragments import call_references
+from decoder_forge.fragments import deffun_closure
+from decoder_forge.fragments import fragment_key
+
+DEFFUN = {
+    "set_flag": {"op": "assign", "target": "flags", "expr": "0x1"},
+    "flag_set": {"op": "eval", "expr": "1 << 0"},
+    "append_bitmask": {"op": "assign", "target": "$val", "expr": "$bm"},
+    "append_flag_set": {"op": "call", "expr": "append_bitmask(val=a, bm=&flag_set)"},
+    "unused": {"op": "assign", "target": "b", "expr": "0x2"},
+}
+
+
+def test_call_references_function_arguments_are_references():
+    refs = call_references("append_bitmask(val=flags, bm=&flag_set)")
+
+    assert refs == ["append_bitmask", "flag_set"]
+
+
+def test_deffun_closure_follows_nested_calls_and_references():
+    closure = deffun_closure("append_flag_set()", DEFFUN)
+
+    assert closure == ["append_bitmask", "append_flag_set", "flag_set"]
+
+
+def test_fragment_key_changes_only_with_dependencies():
+    changed_unused = dict(DEFFUN, unused={"op": "assign", "target": "b", "expr": "0"})
+    changed_used = dict(DEFFUN, flag_set={"op": "eval", "expr": "1 << 1"})
+
+    key = fragment_key("append_flag_set()", DEFFUN)
+
+    assert fragment_key("append_flag_set()", changed_unused) == key
+    assert fragment_key("append_flag_set()", changed_used) != key
@@ -0,0 +1,97 @@
+from decoder_forge.generate_code import DataIndex
+from decoder_forge.generate_code import minimalize_tree_with_data
+from decoder_forge.generate_code import pattern_is_lazy
+from decoder_forge.pattern_algorithms import DecodeLeaf
+from decoder_forge.pattern_algorithms import DecodeTree
+from decoder_forge.bit_pattern import BitPattern
+
+
+def test_data_index_equal_data_returns_same_duid():
+    index = DataIndex({"UIDA": 16, "UIDB": 16, "UIDC": 32}.get)
+
+    duids = [index.duid(i) for i in ("UIDA", "UIDB", "UIDC")]
+
+    assert duids[0] == duids[1]
+    assert duids[0] != duids[2]
+    assert index.duid_to_data == {duids[0]: 16, duids[2]: 32}
+
+
+def test_minimalize_tree_with_data_subtree_with_equal_data_becomes_leaf():
+    # pat_a = "1x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x2, bit_length=2)
+
+    # pat_b = "0x"
+    pat_b = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeTree(
+                pat=pat_a,
+                uid="",
+                children=[
+                    DecodeLeaf(
+                        pat=BitPattern(fixedmask=0x1, fixedbits=0x1, bit_length=2),
+                        uid="UIDA",
+                    ),
+                    DecodeLeaf(
+                        pat=BitPattern(fixedmask=0x1, fixedbits=0x0, bit_length=2),
+                        uid="UIDB",
+                    ),
+                ],
+            ),
+            DecodeLeaf(pat=pat_b, uid="UIDC"),
+        ],
+    )
+    sizes = {"UIDA": 16, "UIDB": 16, "UIDC": 32}
+
+    data_tree, duid_to_data = minimalize_tree_with_data(tree, sizes.get)
+
+    assert data_tree is not None
+    assert [(i.pat, duid_to_data[i.uid]) for i in data_tree.children] == [
+        (pat_a, 16),
+        (pat_b, 32),
+    ]
+
+
+def test_minimalize_tree_with_data_equal_data_everywhere_returns_none():
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(
+                pat=BitPattern(fixedmask=0x2, fixedbits=0x2, bit_length=2), uid="UIDA"
+            ),
+            DecodeLeaf(
+                pat=BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2), uid="UIDB"
+            ),
+        ],
+    )
+
+    data_tree, duid_to_data = minimalize_tree_with_data(tree, lambda _: 16)
+
+    assert data_tree is None
+    assert list(duid_to_data.values()) == [16]
+
+
+def test_pattern_is_lazy_calls_depending_on_instr_only_returns_true():
+    assert pattern_is_lazy("d = (instr >> 8) & 0x7\nimm32 = instr & 0xff")
+
+
+def test_pattern_is_lazy_calls_reading_context_or_returning_returns_false():
+    assert not pattern_is_lazy("cond = context.istate >> 4")
+    assert not pattern_is_lazy("if d == 15:\n    return Unpredictable(instr)")
+    assert not pattern_is_lazy("")
+
+
+def test_pattern_is_lazy_members_not_assigned_for_sure_returns_false():
+    assert not pattern_is_lazy("b = instr >> 4", ["a", "b"])
+    assert not pattern_is_lazy("if instr & 1:\n    a = 1", ["a"])
+    assert pattern_is_lazy("if instr & 1:\n    a = 1\nelse:\n    a = 2", ["a"])
+
+
+def test_pattern_is_lazy_calls_which_may_raise_returns_false():
+    assert not pattern_is_lazy("assert((instr & 0x1) == 0x1)\na = instr >> 4")
+    assert not pattern_is_lazy("a = instr // 0")
+    assert not pattern_is_lazy("if instr & 1:\n    a = 1\nb = a")
@@ -0,0 +1,91 @@
+from decoder_forge.bit_pattern import BitPattern
+from decoder_forge.hoisting import drop_statements
+from decoder_forge.hoisting import hoist_leading_statements
+from decoder_forge.hoisting import statement_chunks
+
+PAT = BitPattern.parse_pattern("x")
+
+
+def flat_tree(depths: list[int]) -> list:
+    return [(PAT, f"uid{idx}", depth, True, True) for idx, depth in enumerate(depths)]
+
+
+def test_statement_chunks_keep_comments_and_nested_lines():
+    code = "a = 1 # first\nif a == 1:\n    b = 2\n\nc = 3"
+
+    chunks = statement_chunks(code)
+
+    assert [i[0] for i in chunks] == ["a = 1 # first", "if a == 1:\n    b = 2", "c = 3"]
+
+
+def test_drop_statements_removes_given_statements():
+    code = "a = 1 # first\nif a == 1:\n    b = 2\n\nc = 3"
+
+    assert drop_statements(code, [0, 2]) == "if a == 1:\n    b = 2\n"
+    assert drop_statements(code, []) == code
+
+
+def test_hoist_leading_statements_common_statements_moved_to_node():
+    codes = [
+        None,
+        "n = (instr >> 16) & 0xf\nd = (instr >> 8) & 0xf\nx = n + d",
+        "d = (instr >> 8) & 0xf\nn = (instr >> 16) & 0xf",
+        "d = (instr >> 8) & 0xf\nn = d\nn = (instr >> 16) & 0xf",
+        "e = instr",
+    ]
+
+    # method under test
+    hoisted = hoist_leading_statements(flat_tree([0, 1, 1, 1, 0]), codes)
+
+    # n cannot be moved in front of the other assignment of n
+    assert hoisted.node_lines[0] == ["d = (instr >> 8) & 0xf"]
+    assert hoisted.root == []
+    assert hoisted.removed == [frozenset(), {1}, {0}, {0}, frozenset()]
+    assert hoisted.statements == 1
+
+
+def test_hoist_leading_statements_hoisted_at_all_levels():
+    codes = [None, None, "a = instr\nb = a", "a = instr\nb = a", "a = instr"]
+
+    # method under test
+    hoisted = hoist_leading_statements(flat_tree([0, 1, 2, 2, 1]), codes)
+
+    assert hoisted.root == ["a = instr"]
+    assert hoisted.node_lines[:2] == [[], ["b = a"]]
+    assert hoisted.removed[2:] == [{0, 1}, {0, 1}, {0}]
+
+
+def test_hoist_leading_statements_statements_which_may_raise_not_hoisted():
+    codes = [
+        None,
+        "a = instr >> s\nb = instr // 0\nc = f(instr)\nd = context.nomember",
+        "a = instr >> s\nb = instr // 0\nc = f(instr)\nd = context.nomember",
+    ]
+
+    # method under test
+    hoisted = hoist_leading_statements(flat_tree([0, 1, 1]), codes, ["member"])
+
+    assert hoisted.statements == 0
+
+
+def test_hoist_leading_statements_context_read_not_moved_before_write():
+    codes = [
+        None,
+        "context.mode = 1\na = context.mode",
+        "a = context.mode",
+        "a = context.mode",
+    ]
+
+    # method under test
+    hoisted = hoist_leading_statements(flat_tree([0, 1, 1, 1]), codes, ["mode"])
+
+    assert hoisted.statements == 0
+
+
+def test_hoist_leading_statements_single_pattern_not_hoisted():
+    codes = [None, "a = instr & 0x3"]
+
+    hoisted = hoist_leading_statements(flat_tree([0, 1]), codes)
+
+    assert hoisted.node_lines == [[], []]
+    assert hoisted.removed == [frozenset(), frozenset()]
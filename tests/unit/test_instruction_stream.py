@@ -0,0 +1,51 @@
+from decoder_forge.instruction_stream import iter_instructions
+
+
+def test_iter_instructions_mixed_sizes_assembles_little_endian_halfwords():
+    # 0x4770 is 16 bit, 0xF000 0xF800 form one 32 bit instruction
+    data = bytes([0x70, 0x47, 0x00, 0xF0, 0x00, 0xF8])
+
+    def decode_size(halfword):
+        return 32 if halfword >> 11 == 0x1E else 16
+
+    instrs = list(iter_instructions(data, decode_size, size_bytes=2, decoder_bytes=4))
+
+    assert instrs == [(0, 2, 0x47700000), (2, 4, 0xF000F800)]
+
+
+def test_iter_instructions_truncated_last_instruction_is_dropped():
+    data = bytes([0x00, 0xF0, 0x00])
+
+    instrs = list(iter_instructions(data, lambda _: 32, size_bytes=2, decoder_bytes=4))
+
+    assert instrs == []
+
+
+def test_iter_instructions_unknown_size_advances_by_size_bytes():
+    data = bytes([0x01, 0x00, 0x02, 0x00])
+
+    instrs = list(iter_instructions(data, lambda _: 0, size_bytes=2, decoder_bytes=4))
+
+    assert instrs == [(0, 2, 0x00010000), (2, 2, 0x00020000)]
+
+
+def test_iter_instructions_start_and_end_limit_decoded_range():
+    data = bytes([0x01, 0x00, 0x02, 0x00, 0x03, 0x00, 0x04, 0x00])
+
+    instrs = list(
+        iter_instructions(
+            data, lambda _: 16, size_bytes=2, decoder_bytes=2, start=2, end=6
+        )
+    )
+
+    assert instrs == [(2, 2, 0x0002), (4, 2, 0x0003)]
+
+
+def test_iter_instructions_unaligned_start_reads_little_endian_units():
+    data = bytes([0xFF, 0x01, 0x02, 0x03, 0x04])
+
+    instrs = list(
+        iter_instructions(data, lambda _: 16, size_bytes=2, decoder_bytes=2, start=1)
+    )
+
+    assert instrs == [(1, 2, 0x0201), (3, 2, 0x0403)]
@@ -0,0 +1,52 @@
+from decoder_forge.associated_struct_repo import StructDef
+from decoder_forge.output_formats import RowFormatter
+from decoder_forge.output_formats import read_binary_header
+import pytest
+
+STRUCTS = [
+    StructDef(name="Mov", members=["rd", "imm"]),
+    StructDef(name="Undef", members=["code"]),
+]
+
+
+def test_row_formatter_csv_leaves_missing_members_empty():
+    formatter = RowFormatter("csv", STRUCTS)
+
+    # method under test
+    out = formatter.header() + formatter.format(
+        [(0, 2, 0x2001, 0, (0, 1)), (2, 2, 0xFFFF, 1, (0xFFFF,))]
+    )
+
+    assert out.splitlines() == [
+        "address,code,size,struct,rd,imm,member_code",
+        "0,8193,2,Mov,0,1,",
+        "2,65535,2,Undef,,,65535",
+    ]
+
+
+def test_row_formatter_text_formats_like_decode_command():
+    formatter = RowFormatter("text", STRUCTS)
+
+    # method under test
+    out = formatter.format([(0x10, 2, 0x2001, 0, (0, 1))])
+
+    assert out == "0x10     0x2001     Mov(rd=0, imm=1)\n"
+
+
+def test_row_formatter_binary_header_describes_structs():
+    formatter = RowFormatter("binary", STRUCTS)
+
+    # method under test
+    header = formatter.header()
+
+    header_bytes, record_bytes, fields, structs = read_binary_header(header)
+    assert header_bytes == len(header)
+    assert header_bytes % 8 == 0
+    assert (record_bytes, fields, structs) == (40, 2, STRUCTS)
+    assert len(formatter.format([(0, 2, 0x2001, 0, (0, 1))])) == record_bytes
+
+
+def test_row_formatter_unknown_format_raises_value_error():
+    with pytest.raises(ValueError):
+        # method under test
+        RowFormatter("xml", STRUCTS)
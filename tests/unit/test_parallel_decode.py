@@ -0,0 +1,34 @@
+from decoder_forge.parallel_decode import _resync_chunk
+from decoder_forge.parallel_decode import decoder_writes_context
+
+
+def test_decoder_writes_context_assignment_to_member_returns_true():
+    code = "def decode(instr, context):\n    context.istate = 0x0\n"
+
+    assert decoder_writes_context(code)
+
+
+def test_decoder_writes_context_only_reads_returns_false():
+    code = "def decode(instr, context):\n    flags = context.apsr >> 29\n"
+
+    assert not decoder_writes_context(code)
+
+
+def test_resync_chunk_entry_in_chunk_drops_leading_instructions():
+    chunk = [(0x10, 2, "a"), (0x12, 4, "b"), (0x16, 2, "c")]
+
+    lines = _resync_chunk(0x12, chunk, 0x18, redecode=None)
+
+    assert lines == [(0x12, 4, "b"), (0x16, 2, "c")]
+
+
+def test_resync_chunk_entry_between_instructions_redecodes_until_common_address():
+    # the worker started within the instruction at 0x0e, the real stream is at 0x12
+    chunk = [(0x10, 4, "wrong"), (0x14, 2, "c"), (0x16, 2, "d")]
+
+    def redecode(entry):
+        yield from [(0x12, 2, "b"), (0x14, 2, "c"), (0x16, 2, "d")]
+
+    lines = _resync_chunk(0x12, chunk, 0x18, redecode)
+
+    assert lines == [(0x12, 2, "b"), (0x14, 2, "c"), (0x16, 2, "d")]
@@ -2,6 +2,9 @@ from decoder_forge.pattern_algorithms import (
     compute_common_fixedmask,
     build_groups_by_fixed_bits,
     build_decode_tree_by_fixed_bits,
+    build_decode_tree_by_information_gain,
+    match_decode_tree,
+    reorder_decode_tree_by_hits,
     DecodeTree,
     DecodeLeaf,
 )
@@ -266,3 +269,303 @@ def test_build_decode_tree_by_fixed_bits_three_patterns_two_with_exclusive_bits_
             ),
         ],
     )
+
+
+def test_build_decode_tree_by_fixed_bits_equally_specific_patterns_keep_input_order():
+    # pat_a = "x1x1", pat_b = "1xx0", pat_c = "11xx", pat_d = "0110"
+    pat_a = BitPattern(fixedmask=0x5, fixedbits=0x5, bit_length=4)
+    pat_b = BitPattern(fixedmask=0x9, fixedbits=0x8, bit_length=4)
+    pat_c = BitPattern(fixedmask=0xC, fixedbits=0xC, bit_length=4)
+    pat_d = BitPattern(fixedmask=0xF, fixedbits=0x6, bit_length=4)
+
+    tree = build_decode_tree_by_fixed_bits(
+        [(pat_a, "UIDA"), (pat_b, "UIDB"), (pat_c, "UIDC"), (pat_d, "UIDD")],
+        decoder_width=4,
+    )
+
+    assert [i.uid for i in tree.children] == ["UIDD", "UIDA", "UIDB", "UIDC"]
+
+
+def test_build_decode_tree_by_fixed_bits_equal_patterns_keep_their_uids():
+    # pat_a = "10xx", pat_b = "10xx", pat_c = "11xx"
+    pat_a = BitPattern(fixedmask=0xC, fixedbits=0x8, bit_length=4)
+    pat_b = BitPattern(fixedmask=0xC, fixedbits=0x8, bit_length=4)
+    pat_c = BitPattern(fixedmask=0xC, fixedbits=0xC, bit_length=4)
+
+    tree = build_decode_tree_by_fixed_bits(
+        [(pat_a, "UIDA"), (pat_b, "UIDB"), (pat_c, "UIDC")], decoder_width=4
+    )
+
+    assert tree == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeTree(
+                pat=BitPattern(fixedmask=0xC, fixedbits=0x8, bit_length=4),
+                uid="",
+                children=[
+                    DecodeLeaf(pat=BitPattern(0x0, 0x0, 4), uid="UIDA"),
+                    DecodeLeaf(pat=BitPattern(0x0, 0x0, 4), uid="UIDB"),
+                ],
+            ),
+            DecodeLeaf(pat=pat_c, uid="UIDC"),
+        ],
+    )
+
+
+def test_build_decode_tree_by_information_gain_no_patterns_returns_empty_tree():
+    tree = build_decode_tree_by_information_gain([], decoder_width=8)
+
+    assert tree == DecodeTree(pat=None, uid="", children=[])
+
+
+def test_build_decode_tree_by_information_gain_few_patterns_returns_linear_tree():
+    # pat_a = "0x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    # pat_b = "11"
+    pat_b = BitPattern(fixedmask=0x3, fixedbits=0x3, bit_length=2)
+
+    tree = build_decode_tree_by_information_gain(
+        [(pat_a, "UIDA"), (pat_b, "UIDB")], decoder_width=2
+    )
+
+    assert tree == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(
+                pat=BitPattern(
+                    fixedmask=0x3, fixedbits=0x3, bit_length=2
+                ),  # pat = "11" - most specific pattern first
+                uid="UIDB",
+            ),
+            DecodeLeaf(
+                pat=BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2),  # "0x"
+                uid="UIDA",
+            ),
+        ],
+    )
+
+
+def test_build_decode_tree_by_information_gain_splits_on_discriminating_bit():
+    # pat_a = "00xxxxxx"
+    pat_a = BitPattern(fixedmask=0xC0, fixedbits=0x00, bit_length=8)
+
+    # pat_b = "01xxxxxx"
+    pat_b = BitPattern(fixedmask=0xC0, fixedbits=0x40, bit_length=8)
+
+    # pat_c = "10xxxxxx"
+    pat_c = BitPattern(fixedmask=0xC0, fixedbits=0x80, bit_length=8)
+
+    tree = build_decode_tree_by_information_gain(
+        [(pat_a, "UIDA"), (pat_b, "UIDB"), (pat_c, "UIDC")],
+        decoder_width=8,
+        max_linear=1,
+        max_split_bits=1,
+    )
+
+    assert tree == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeTree(
+                uid="",
+                pat=BitPattern(
+                    fixedmask=0x80, fixedbits=0x00, bit_length=8
+                ),  # pat: "0xxxxxxx"
+                children=[
+                    DecodeLeaf(
+                        pat=BitPattern(
+                            fixedmask=0x40, fixedbits=0x00, bit_length=8
+                        ),  # pat: "x0xxxxxx"
+                        uid="UIDA",
+                    ),
+                    DecodeLeaf(
+                        pat=BitPattern(
+                            fixedmask=0x40, fixedbits=0x40, bit_length=8
+                        ),  # pat: "x1xxxxxx"
+                        uid="UIDB",
+                    ),
+                ],
+            ),
+            DecodeLeaf(
+                pat=BitPattern(
+                    fixedmask=0xC0, fixedbits=0x80, bit_length=8
+                ),  # pat: "10xxxxxx" - group check merged into its only pattern
+                uid="UIDC",
+            ),
+        ],
+    )
+
+
+def test_build_decode_tree_by_information_gain_groups_by_most_informative_bit():
+    # pat_a = "00xxxxxx"
+    pat_a = BitPattern(fixedmask=0xC0, fixedbits=0x00, bit_length=8)
+
+    # pat_b = "10xxxxxx"
+    pat_b = BitPattern(fixedmask=0xC0, fixedbits=0x80, bit_length=8)
+
+    # pat_c = "x1xxxxxx"
+    pat_c = BitPattern(fixedmask=0x40, fixedbits=0x40, bit_length=8)
+
+    tree = build_decode_tree_by_information_gain(
+        [(pat_a, "UIDA"), (pat_b, "UIDB"), (pat_c, "UIDC")],
+        decoder_width=8,
+        max_linear=1,
+        max_split_bits=1,
+    )
+
+    assert tree == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeTree(
+                uid="",
+                pat=BitPattern(
+                    fixedmask=0x40, fixedbits=0x00, bit_length=8
+                ),  # pat: "x0xxxxxx"
+                children=[
+                    DecodeLeaf(
+                        pat=BitPattern(
+                            fixedmask=0x80, fixedbits=0x00, bit_length=8
+                        ),  # pat: "0xxxxxxx"
+                        uid="UIDA",
+                    ),
+                    DecodeLeaf(
+                        pat=BitPattern(
+                            fixedmask=0x80, fixedbits=0x80, bit_length=8
+                        ),  # pat: "1xxxxxxx"
+                        uid="UIDB",
+                    ),
+                ],
+            ),
+            DecodeLeaf(
+                pat=BitPattern(
+                    fixedmask=0x40, fixedbits=0x40, bit_length=8
+                ),  # pat: "x1xxxxxx"
+                uid="UIDC",
+            ),
+        ],
+    )
+
+
+def test_build_decode_tree_by_information_gain_overlap_prefers_first_pattern():
+    # pat_a = "0x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    # pat_b = "x1"
+    pat_b = BitPattern(fixedmask=0x1, fixedbits=0x1, bit_length=2)
+
+    tree = build_decode_tree_by_information_gain(
+        [(pat_a, "UIDA"), (pat_b, "UIDB")],
+        decoder_width=2,
+        max_linear=1,
+        max_split_bits=1,
+    )
+
+    assert tree == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(
+                pat=BitPattern(
+                    fixedmask=0x2, fixedbits=0x0, bit_length=2
+                ),  # pat: "0x" - also matches "01"
+                uid="UIDA",
+            ),
+            DecodeLeaf(
+                pat=BitPattern(fixedmask=0x3, fixedbits=0x3, bit_length=2),  # "11"
+                uid="UIDB",
+            ),
+        ],
+    )
+
+
+def test_match_decode_tree_matching_subtree_without_matching_child_returns_none():
+    # pat_a = "1x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x2, bit_length=2)
+
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeTree(
+                pat=pat_a,
+                uid="",
+                children=[
+                    DecodeLeaf(
+                        pat=BitPattern(fixedmask=0x1, fixedbits=0x1, bit_length=2),
+                        uid="UIDA",
+                    )
+                ],
+            ),
+            DecodeLeaf(pat=pat_a, uid="UIDB"),
+        ],
+    )
+
+    assert match_decode_tree(tree, 0x3) == "UIDA"
+    assert match_decode_tree(tree, 0x2) is None
+    assert match_decode_tree(tree, 0x1) is None
+
+
+def test_reorder_decode_tree_by_hits_moves_frequent_disjoint_pattern_first():
+    # pat_a = "0x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x0, bit_length=2)
+
+    # pat_b = "11"
+    pat_b = BitPattern(fixedmask=0x3, fixedbits=0x3, bit_length=2)
+
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(pat=pat_a, uid="UIDA"),
+            DecodeLeaf(pat=pat_b, uid="UIDB"),
+        ],
+    )
+
+    reordered = reorder_decode_tree_by_hits(tree, {"UIDA": 1, "UIDB": 10})
+
+    assert reordered == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(pat=pat_b, uid="UIDB"),
+            DecodeLeaf(pat=pat_a, uid="UIDA"),
+        ],
+    )
+
+
+def test_reorder_decode_tree_by_hits_keeps_order_of_overlapping_patterns():
+    # pat_a = "1x"
+    pat_a = BitPattern(fixedmask=0x2, fixedbits=0x2, bit_length=2)
+
+    # pat_b = "x1"
+    pat_b = BitPattern(fixedmask=0x1, fixedbits=0x1, bit_length=2)
+
+    # pat_c = "00"
+    pat_c = BitPattern(fixedmask=0x3, fixedbits=0x0, bit_length=2)
+
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(pat=pat_a, uid="UIDA"),
+            DecodeLeaf(pat=pat_b, uid="UIDB"),
+            DecodeLeaf(pat=pat_c, uid="UIDC"),
+        ],
+    )
+
+    reordered = reorder_decode_tree_by_hits(tree, {"UIDB": 10, "UIDC": 20})
+
+    # "x1" overlaps "1x" and stays behind it, "00" passes both
+    assert reordered == DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(pat=pat_c, uid="UIDC"),
+            DecodeLeaf(pat=pat_a, uid="UIDA"),
+            DecodeLeaf(pat=pat_b, uid="UIDB"),
+        ],
+    )
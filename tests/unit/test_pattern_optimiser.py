@@ -0,0 +1,141 @@
+import ast
+
+from decoder_forge.pattern_optimiser import count_operations
+from decoder_forge.pattern_optimiser import optimise_pattern
+from decoder_forge.pattern_optimiser import unparse_pattern
+
+
+def optimise(code: str, live_out: list[str]) -> str:
+    return unparse_pattern(optimise_pattern(ast.parse(code), live_out).tree)
+
+
+def run(code: str, instr: int) -> dict:
+    ns: dict = {"instr": instr}
+    exec(code, ns)
+    return ns
+
+
+def test_count_operations_counts_operators_and_assignments():
+    tree = ast.parse("a = (x >> 4) & 0xf\nif a == 1 or a == 2:\n    b = -a\n")
+
+    assert count_operations(tree) == 8
+
+
+def test_optimise_pattern_flags_ored_into_one_constant():
+    code = "flags = 0x0\nflags = flags | (1 << 0)\nflags = flags | (1 << 2)\n"
+
+    # method under test
+    optimised = optimise_pattern(ast.parse(code), ["flags"])
+
+    assert unparse_pattern(optimised.tree) == "flags = 0x5"
+    assert optimised.operations_before == 7
+    assert optimised.eliminated == 6
+
+
+def test_optimise_pattern_constant_condition_keeps_branch_run():
+    code = "_mode = 2\nif _mode == 2:\n    a = instr >> 0\nelse:\n    a = 0\n"
+
+    assert optimise(code, ["a"]) == "a = instr"
+
+
+def test_optimise_pattern_dead_assignments_removed():
+    code = "_t = instr & 0xff\na = instr >> 8\n_carry = (a >> 31) & 0x1\n"
+
+    assert optimise(code, ["a"]) == "a = instr >> 8"
+
+
+def test_optimise_pattern_extractions_fused():
+    code = (
+        "_imm3 = (instr >> 12) & 0x7\n"
+        "_imm8 = (instr >> 0) & 0xff\n"
+        "_imm4 = (instr >> 16) & 0xf\n"
+        "imm = (_imm4 << 12) | (_imm3 << 8) | (_imm8 << 0)\n"
+    )
+
+    # method under test
+    optimised = optimise(code, ["imm"])
+
+    assert optimised == "imm = instr >> 4 & 0xf700 | instr & 0xff"
+    for instr in (0, 0x12345678, 0xFFFFFFFF, 0xA5A5A5A5):
+        assert run(optimised, instr)["imm"] == run(code, instr)["imm"]
+
+
+def test_optimise_pattern_right_shift_of_left_shift_not_fused():
+    code = "a = (instr << 4) >> 8\nb = (instr >> 4) << 8\n"
+
+    # method under test
+    optimised = optimise(code, ["a", "b"])
+
+    assert optimised == "a = instr >> 4\nb = instr >> 4 << 8"
+
+
+def test_optimise_pattern_calls_and_context_writes_kept():
+    code = "_t = check(instr)\ncontext.mode = 0x1 | 0x2\nreturn Undef(instr)\n_u = 1"
+
+    assert (
+        optimise(code, [])
+        == "_t = check(instr)\ncontext.mode = 0x3\nreturn Undef(instr)"
+    )
+
+
+def test_optimise_pattern_values_of_branches_propagated_if_equal():
+    code = "if instr & 1:\n    _s = 4\nelse:\n    _s = 4\na = (instr >> _s) & 0xf\n"
+
+    assert optimise(code, ["a"]) == "a = instr >> 4 & 0xf"
+
+
+def test_optimise_pattern_comprehension_not_optimised():
+    code = "_k = 3\na = [_k for _k in range(instr)]\n"
+    tree = ast.parse(code)
+
+    # method under test
+    optimised = optimise_pattern(tree, ["a"])
+
+    assert optimised.tree is tree
+    assert optimised.eliminated == 0
+
+
+def test_optimise_pattern_input_not_modified():
+    tree = ast.parse("_a = (instr >> 2) & 0x3\nb = _a << 2\n")
+    dump = ast.dump(tree)
+
+    # method under test
+    optimise_pattern(tree, ["b"])
+
+    assert ast.dump(tree) == dump
+
+
+def test_optimise_pattern_comparison_ored_into_flags_stays_int():
+    code = "flags = 0x0\nflags = flags | (((instr & 0x1)) == 0x1)\n"
+
+    # method under test
+    optimised = optimise(code, ["flags"])
+
+    for instr in (0, 1):
+        assert type(run(optimised, instr)["flags"]) is int
+        assert run(optimised, instr)["flags"] == run(code, instr)["flags"]
+
+
+def test_optimise_pattern_neutral_operand_of_bool_local_kept():
+    code = "_c = instr == 1\na = _c | 0\nb = _c + 0\n"
+
+    # method under test
+    optimised = optimise(code, ["a", "b"])
+
+    for name in ("a", "b"):
+        assert type(run(optimised, 1)[name]) is int
+
+
+def test_optimise_pattern_assignments_which_may_raise_kept():
+    code = "_x = instr // 0\n_t = undefined_name\na = 1"
+
+    assert optimise(code, ["a"]) == code
+
+
+def test_optimise_pattern_value_which_may_raise_not_moved():
+    code = "_t = instr % _d\nif instr & 0x1:\n    return Undef(instr)\na = _t"
+
+    assert optimise(code, ["a"]) == code
+    assert optimise(code.replace("_d", "3"), ["a"]) == (
+        "if instr & 0x1:\n    return Undef(instr)\na = instr % 3"
+    )
@@ -0,0 +1,19 @@
+from decoder_forge.pattern_profile import dump_pattern_hits
+from decoder_forge.pattern_profile import load_pattern_hits
+import pytest
+
+
+def test_dump_pattern_hits_roundtrip_keeps_hits():
+    hits = {"0101xxxx": 3, "1xxxxxxx": 10}
+
+    assert load_pattern_hits(dump_pattern_hits(hits)) == hits
+
+
+def test_load_pattern_hits_negative_count_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = load_pattern_hits("'0101xxxx': -1")
+
+
+def test_load_pattern_hits_no_mapping_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = load_pattern_hits("[1, 2]")
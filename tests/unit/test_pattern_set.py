@@ -0,0 +1,51 @@
+from decoder_forge.bit_pattern import BitPattern
+from decoder_forge.pattern_set import PatternSet
+import pytest
+
+
+def make_set(*pat_strs: str) -> PatternSet:
+    return PatternSet.from_patterns(BitPattern.parse_pattern(i) for i in pat_strs)
+
+
+def test_from_patterns_returns_patterns_in_order():
+    pset = make_set("10x1", "x1x0")
+    assert [str(i) for i in pset] == ["10x1", "x1x0"]
+    assert len(pset) == 2
+    assert pset[1] == BitPattern.parse_pattern("x1x0")
+
+
+def test_init_with_lists_of_different_length_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = PatternSet([0x1], [0x1, 0x0], [4])
+
+
+def test_common_fixedmask_returns_bits_fixed_in_all_patterns():
+    pset = make_set("11x00x11", "1xx00x10", "11x0xx01")
+    assert pset.common_fixedmask() == 0x93
+
+
+def test_common_fixedmask_of_empty_set_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = PatternSet().common_fixedmask()
+
+
+def test_group_by_fixed_bits_returns_indices_in_order():
+    pset = make_set("10x1", "11x0", "10xx", "11x1")
+    assert pset.group_by_fixed_bits(0xC) == {0x8: [0, 2], 0xC: [1, 3]}
+
+
+def test_take_and_without_mask_split_like_split_by_mask():
+    pset = make_set("10x1", "11x0", "10xx")
+    inner = pset.take([2, 0]).without_mask(0xC)
+
+    assert list(inner) == [pset[2].split_by_mask(0xC)[1], pset[0].split_by_mask(0xC)[1]]
+
+
+def test_extend_and_shift_to_msb_extends_all_patterns():
+    pset = make_set("10x1", "1x")
+    assert [str(i) for i in pset.extend_and_shift_to_msb(6)] == ["10x1xx", "1xxxxx"]
+
+
+def test_extend_and_shift_to_msb_with_shorter_length_raises_value_error():
+    with pytest.raises(ValueError):
+        _ = make_set("10x1").extend_and_shift_to_msb(3)
@@ -0,0 +1,58 @@
+from decoder_forge.size_table import build_size_table
+from decoder_forge.pattern_algorithms import DecodeTree, DecodeLeaf
+from decoder_forge.bit_pattern import BitPattern
+import pytest
+
+
+def test_build_size_table_first_matching_child_decides_size():
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeLeaf(pat=BitPattern.parse_pattern("11xx"), uid="UIDA"),
+            DecodeLeaf(pat=BitPattern.parse_pattern("1xxx"), uid="UIDB"),
+        ],
+    )
+
+    table = build_size_table(
+        tree, {"UIDA": 32, "UIDB": 16}, default_size=0, decoder_width=4, bits=4
+    )
+
+    assert table.bits == 4
+    assert table.runs == [(8, 0), (4, 16), (4, 32)]
+    assert table.max_size() == 32
+
+
+def test_build_size_table_subtree_without_matching_child_returns_default():
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[
+            DecodeTree(
+                pat=BitPattern.parse_pattern("1xxxxxxx"),
+                uid="UIDT",
+                children=[
+                    DecodeLeaf(pat=BitPattern.parse_pattern("x1xxxxxx"), uid="UIDA")
+                ],
+            ),
+            DecodeLeaf(pat=BitPattern.parse_pattern("xxxxxxxx"), uid="UIDB"),
+        ],
+    )
+
+    # the index holds the 2 most significant bits of the 8 bit patterns
+    table = build_size_table(
+        tree, {"UIDA": 16, "UIDB": 8}, default_size=0, decoder_width=8, bits=2
+    )
+
+    assert table.runs == [(2, 8), (1, 0), (1, 16)]
+
+
+def test_build_size_table_too_many_bits_raises_value_error():
+    tree = DecodeTree(
+        pat=None,
+        uid="",
+        children=[DecodeLeaf(pat=BitPattern.parse_pattern("1x"), uid="UIDA")],
+    )
+
+    with pytest.raises(ValueError):
+        build_size_table(tree, {"UIDA": 8}, 0, decoder_width=32, bits=24)
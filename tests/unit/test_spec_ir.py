@@ -0,0 +1,58 @@
+from decoder_forge.spec_ir import compile_spec
+from decoder_forge.spec_ir import is_spec_ir
+from decoder_forge.spec_ir import load_spec
+from decoder_forge.spec_ir import pattern_list
+from decoder_forge.bit_pattern import BitPattern
+from importlib.resources import files
+import pytest
+
+
+def test_compile_spec_test_format_loads_like_yaml():
+    test_format = files("tests.data.formats").joinpath("test-format.yaml").read_text()
+
+    # method under test
+    spec = compile_spec(test_format)
+
+    assert is_spec_ir(spec)
+    ins_yaml = load_spec(test_format)
+    ins_spec = load_spec(spec)
+    for section in ("context", "patterns", "struct_def", "deffun"):
+        assert ins_spec[section] == ins_yaml[section]
+    assert pattern_list(ins_spec) == pattern_list(ins_yaml)
+
+
+def test_pattern_list_compiled_spec_keeps_masks():
+    spec = compile_spec("patterns:\n  '10x1': {name: A}\n  '0xxx': {name: B}\n")
+
+    # method under test
+    pats = pattern_list(load_spec(spec))
+
+    assert pats == [
+        ("10x1", BitPattern.parse_pattern("10x1")),
+        ("0xxx", BitPattern.parse_pattern("0xxx")),
+    ]
+
+
+@pytest.mark.parametrize(
+    "input_yaml",
+    [
+        "patterns:\n  '10y1': {name: A}\n",
+        "patterns:\n  '10x1': {name: A, to: Missing}\n",
+        "patterns:\n  '10x1': {name: A, call: fa()}\n",
+        "struct_def:\n  Undef: {members: [a]}\n",
+        "deffun:\n  fa: {type: binary}\n",
+        "patterns: [a, b]\n",
+    ],
+)
+def test_compile_spec_invalid_format_raises_value_error(input_yaml):
+    with pytest.raises(ValueError):
+        # method under test
+        compile_spec(input_yaml)
+
+
+def test_load_spec_damaged_spec_raises_value_error():
+    spec = compile_spec("patterns:\n  '10x1': {name: A}\n")
+
+    with pytest.raises(ValueError):
+        # method under test
+        load_spec(spec[:-8])